@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Calendar Web App - ASGI Entry Point
+
+Serves the month views (GET /api/events and GET /api/month/<year>/<month>)
+natively on the event loop with non-blocking database reads. Every other
+route is handed to the Flask app in web_app.py, which runs in a thread
+pool, so both share one set of managers and caches.
+
+Run with an ASGI server, e.g.:
+    python run_asgi_app.py
+    uvicorn asgi_app:app --host 0.0.0.0 --port 8000
+"""
+
+import asyncio
+import re
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+from werkzeug.http import parse_accept_header
+
+import web_app
+from database.async_db_manager import AsyncDatabaseManager
+
+# Threads running Flask routes; each one blocks on its database call
+WSGI_WORKERS = 32
+
+web_app.create_app(prewarm_holidays=True)
+async_db_manager = AsyncDatabaseManager.from_manager(web_app.db_manager)
+web_app.metrics.instrument_engine(async_db_manager.engine.sync_engine)
+flask_app = WSGIMiddleware(web_app.app, workers=WSGI_WORKERS)
+
+
+def _query_int(query, name):
+    """Get an integer query parameter, or None if missing or malformed."""
+    try:
+        return int(query[name][0])
+    except (KeyError, ValueError):
+        return None
+
+
+def _json(status, payload, gzipped=False):
+    """Serialize a payload the way the Flask routes do; returns (status, body, gzipped)."""
+    return status, web_app._json_body(payload, gzipped), gzipped
+
+
+async def _events_in_range(start_date, end_date):
+    """Get (event, start, end) occurrences overlapping [start_date, end_date)."""
+    events, recurring_events = await asyncio.gather(
+        async_db_manager.get_events(start_date, end_date),
+        async_db_manager.get_recurring_events(end_date)
+    )
+    return web_app._combine_occurrences(events, recurring_events, start_date, end_date)
+
+
+async def _cached_month_value(key, build):
+    """Get a month view value from the shared events cache; mirrors web_app._cached_month_value()."""
+    version, _ = await async_db_manager.get_events_version()
+    if version is None:
+        return await build()
+    value = web_app.events_cache.get(key, version)
+    if value is None:
+        value = await build()
+        web_app.events_cache.set(key, value, version)
+    return value
+
+
+async def _resolve_timezone(requested):
+    """Get the display timezone; mirrors web_app._resolve_timezone().
+
+    Without ?tz= the timezone setting is read through the synchronous
+    settings manager, which queries the database, so that runs in a
+    worker thread instead of on the event loop.
+    """
+    if requested:
+        return web_app._resolve_timezone(requested)
+    return await asyncio.to_thread(web_app._resolve_timezone, None)
+
+
+async def get_events(query, gzipped):
+    """Get events for a specific month; mirrors web_app.get_events()."""
+    year = _query_int(query, 'year')
+    month = _query_int(query, 'month')
+    
+    if not year or not month:
+        return _json(400, {'error': 'Year and month required'})
+    if not 1 <= month <= 12:
+        return _json(400, {'error': 'Invalid month'})
+    try:
+        web_app.check_year(year)
+        timezone_name = await _resolve_timezone(query.get('tz', [None])[0])
+        events_format = web_app._resolve_events_format(query.get('format', [None])[0])
+    except ValueError as e:
+        return _json(400, {'error': str(e)})
+    
+    async def build():
+        start_date, end_date = web_app._month_bounds(year, month, timezone_name)
+        occurrences = await _events_in_range(start_date, end_date)
+        _, body, _ = _json(200, web_app._events_payload(occurrences, timezone_name, events_format), gzipped)
+        return body
+    
+    body = await _cached_month_value(
+        (year, month, f"{events_format}:{timezone_name}:{'gzip' if gzipped else 'identity'}"), build
+    )
+    return 200, body, gzipped
+
+
+async def get_month(query, gzipped, year, month):
+    """Get events, note counts and holidays for a month grid; mirrors web_app.get_month()."""
+    year, month = int(year), int(month)
+    if not 1 <= month <= 12:
+        return _json(400, {'error': 'Invalid month'})
+    try:
+        web_app.check_year(year)
+        timezone_name = await _resolve_timezone(query.get('tz', [None])[0])
+        events_format = web_app._resolve_events_format(query.get('format', [None])[0])
+    except ValueError as e:
+        return _json(400, {'error': str(e)})
+    
+    countries = query.get('countries') or ['US', 'DE']
+    grid_start, grid_end = web_app._visible_grid(year, month)
+    start_date, end_date = web_app._local_day_bounds(grid_start, grid_end, timezone_name)
+    
+    async def build():
+        occurrences = await _events_in_range(start_date, end_date)
+        return web_app._events_payload(occurrences, timezone_name, events_format)
+    
+    # Holidays may be computed or read through the synchronous store on a cache miss
+    events, note_counts, holidays = await asyncio.gather(
+        _cached_month_value((year, month, f"grid:{events_format}:{timezone_name}"), build),
+        async_db_manager.get_note_counts(*web_app._grid_note_bounds(grid_start, grid_end)),
+        asyncio.to_thread(web_app.holiday_manager.get_holidays_for_range, grid_start, grid_end, countries)
+    )
+    return _json(200, web_app._month_view(grid_start, grid_end, events, note_counts, holidays), gzipped)
+
+
+# (compiled path pattern, route name for metrics, handler) for the GET routes served on the event loop
+ASYNC_ROUTES = [
+    (re.compile(r'/api/events'), '/api/events', get_events),
+    (re.compile(r'/api/month/(\d+)/(\d+)'), '/api/month/<int:year>/<int:month>', get_month),
+]
+
+
+async def _lifespan(receive, send):
+    """Answer the server's startup and shutdown messages."""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await async_db_manager.dispose()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI application."""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    
+    if scope['type'] == 'http' and scope['method'] == 'GET':
+        for pattern, route, handler in ASYNC_ROUTES:
+            match = pattern.fullmatch(scope['path'])
+            if match:
+                query = parse_qs(scope['query_string'].decode('utf-8', 'replace'))
+                request_headers = dict(scope['headers'])
+                accept_encoding = parse_accept_header(request_headers.get(b'accept-encoding', b'').decode('latin-1'))
+                request_stats = web_app.metrics.start_request(profile=request_headers.get(b'x-profile') == b'1')
+                try:
+                    status, body, gzipped = await handler(query, 'gzip' in accept_encoding, *match.groups())
+                except Exception as e:
+                    print(f"Error serving {scope['path']}: {e}")
+                    status, body, gzipped = _json(500, {'error': 'Internal server error'})
+                headers = [
+                    (b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode('ascii')),
+                    (b'vary', b'Accept-Encoding'),
+                    (b'server-timing', request_stats.server_timing().encode('ascii')),
+                ]
+                if gzipped:
+                    headers.append((b'content-encoding', b'gzip'))
+                profile_id = web_app.metrics.finish_request(request_stats, 'GET', route, status)
+                if profile_id is not None:
+                    headers.append((b'x-profile-id', str(profile_id).encode('ascii')))
+                await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+                await send({'type': 'http.response.body', 'body': body})
+                return
+    
+    await flask_app(scope, receive, send)
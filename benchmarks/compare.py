@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark result files.
+
+Prints the median latency of every case present in both files and flags
+cases whose median grew by more than --threshold percent. Exits with
+status 1 when any case regressed, so it can gate a change.
+
+Usage:
+    python benchmarks/compare.py before.json after.json
+    python benchmarks/compare.py before.json after.json --threshold 5
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path):
+    """Load a result file written by results.write_results."""
+    with open(path, encoding='utf-8') as stream:
+        return json.load(stream)
+
+
+def compare(baseline, candidate, threshold):
+    """Get (case, baseline ms, candidate ms, change %, regressed) rows for shared cases."""
+    rows = []
+    for name, before in baseline['results'].items():
+        after = candidate['results'].get(name)
+        if after is None or 'median_ms' not in before or 'median_ms' not in after:
+            continue
+        change = (after['median_ms'] - before['median_ms']) / before['median_ms'] * 100 if before['median_ms'] else 0.0
+        rows.append((name, before['median_ms'], after['median_ms'], change, change > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Percent growth of the median reported as a regression.')
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    if baseline['benchmark'] != candidate['benchmark']:
+        sys.exit(f"Cannot compare {baseline['benchmark']} results with {candidate['benchmark']} results")
+    if baseline['parameters'] != candidate['parameters']:
+        print(f"Warning: parameters differ: {baseline['parameters']} vs {candidate['parameters']}")
+    for label, document in (('baseline', baseline), ('candidate', candidate)):
+        environment = document['environment']
+        print(f"{label:<9} {str(environment['git_commit'])[:12]} python {environment['python']} "
+              f"sqlite {environment['sqlite']} on {environment['platform']}")
+
+    rows = compare(baseline, candidate, args.threshold)
+    width = max([len(row[0]) for row in rows] + [4])
+    print(f"\n{'case':<{width}} {'before ms':>10} {'after ms':>10} {'change':>8}")
+    for name, before, after, change, regressed in rows:
+        print(f"{name:<{width}} {before:>10.3f} {after:>10.3f} {change:>+7.1f}%" + ('  REGRESSION' if regressed else ''))
+
+    regressions = sum(1 for row in rows if row[4])
+    print(f"\n{regressions} of {len(rows)} cases regressed by more than {args.threshold:g}%")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for the DatabaseManager engine profiles.
+
+Runs a mixed read/write workload from several threads against a fresh
+database for each engine profile and reports throughput and failed
+operations ("database is locked" and friends).
+
+Usage:
+    python benchmarks/concurrency.py
+    python benchmarks/concurrency.py --threads 16 --duration 10 --write-ratio 0.3
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from database.db_manager import DatabaseManager, ENGINE_PROFILES
+from database.models import Event
+
+SEED_EVENTS = 5000
+
+
+def read_events(db_manager, start_date, end_date):
+    """Run the query of DatabaseManager.get_events(), letting errors through.
+
+    get_events() reports a failed read as an empty list, which cannot be
+    told apart from an empty month.
+    """
+    session = db_manager.SessionLocal()
+    try:
+        return session.query(Event).filter(
+            *db_manager._overlap_filters(start_date, end_date)
+        ).order_by(Event.start_time).all()
+    finally:
+        session.close()
+
+
+def worker(db_manager, stop, write_ratio, seed, counters, lock):
+    """Issue reads and writes until `stop` is set."""
+    rng = random.Random(seed)
+    reads = writes = failures = 0
+    while not stop.is_set():
+        start = datetime(2025, 1, 1) + timedelta(days=rng.randrange(365))
+        if rng.random() < write_ratio:
+            ok = db_manager.create_event(f'Event {seed}', start, end_time=start + timedelta(hours=1))
+            writes += 1
+        else:
+            try:
+                read_events(db_manager, start, start + timedelta(days=31))
+                ok = True
+            except SQLAlchemyError:
+                ok = False
+            reads += 1
+        if not ok:
+            failures += 1
+    with lock:
+        counters['reads'] += reads
+        counters['writes'] += writes
+        counters['failures'] += failures
+
+
+def run(profile, threads, duration, write_ratio):
+    """Run the workload against one profile and return its results."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, 'bench.db'), profile=profile)
+        db_manager.initialize_database()
+        for i in range(SEED_EVENTS):
+            start = datetime(2025, 1, 1) + timedelta(hours=i * 2)
+            db_manager.create_event(f'Seed {i}', start, end_time=start + timedelta(hours=1))
+
+        counters = {'reads': 0, 'writes': 0, 'failures': 0}
+        lock = threading.Lock()
+        stop = threading.Event()
+        pool = [
+            threading.Thread(target=worker, args=(db_manager, stop, write_ratio, i, counters, lock))
+            for i in range(threads)
+        ]
+        # DatabaseManager reports failures with print(); keep them off the table
+        with contextlib.redirect_stdout(io.StringIO()):
+            for thread in pool:
+                thread.start()
+            time.sleep(duration)
+            stop.set()
+            for thread in pool:
+                thread.join()
+        db_manager.engine.dispose()
+
+    total = counters['reads'] + counters['writes']
+    return dict(counters, profile=profile, ops_per_sec=total / duration)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', nargs='+', default=list(ENGINE_PROFILES))
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per profile.')
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{'profile':>12} {'ops/s':>10} {'reads':>8} {'writes':>8} {'failures':>9}")
+    for profile in args.profiles:
+        result = run(profile, args.threads, args.duration, args.write_ratio)
+        print(f"{result['profile']:>12} {result['ops_per_sec']:>10.1f} {result['reads']:>8} "
+              f"{result['writes']:>8} {result['failures']:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+HTTP load test: threaded Werkzeug server vs. the ASGI app.
+
+Seeds a temporary database, starts each server on it in a subprocess and
+drives it with a fixed number of concurrent keep-alive connections that
+request month views of random months. Reports throughput, latency
+percentiles and failed requests for each server and connection count.
+
+Requires the ASGI extras from requirements.txt (uvicorn, aiosqlite, a2wsgi).
+
+Usage:
+    python benchmarks/http_load.py
+    python benchmarks/http_load.py --connections 16 128 512 --duration 10
+    python benchmarks/http_load.py --servers asgi --path '/api/events?year={year}&month={month}'
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add project root to Python path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database.db_manager import DatabaseManager
+
+SEED_EVENTS = 2000
+SEED_YEARS = (2024, 2025)
+
+SERVERS = {
+    # The dev server run_web_app.py uses, with a thread per connection
+    'threaded': [sys.executable, '-c',
+                 'import sys, web_app; web_app.app.run(host="127.0.0.1", port=int(sys.argv[1]), threaded=True)'],
+    'asgi': [sys.executable, '-m', 'uvicorn', 'asgi_app:app', '--host', '127.0.0.1',
+             '--log-level', 'warning', '--no-access-log', '--backlog', '4096', '--port'],
+}
+
+
+def seed(db_path, count):
+    """Create a database with `count` one-hour events spread over SEED_YEARS."""
+    db_manager = DatabaseManager(db_path)
+    db_manager.initialize_database()
+    rng = random.Random(0)
+    first = datetime(SEED_YEARS[0], 1, 1)
+    span_hours = (datetime(SEED_YEARS[-1] + 1, 1, 1) - first) // timedelta(hours=1)
+    rows = []
+    for i in range(count):
+        start = first + timedelta(hours=rng.randrange(span_hours))
+        rows.append({'title': f'Event {i}', 'description': '', 'start_time': start,
+                     'end_time': start + timedelta(hours=1), 'category': 'General', 'timezone': 'UTC'})
+    for chunk_start in range(0, len(rows), 5000):
+        db_manager.bulk_insert_events(rows[chunk_start:chunk_start + 5000])
+    db_manager.engine.dispose()
+
+
+def free_port():
+    """Get a free TCP port on localhost."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(name, workdir, port):
+    """Start a server on the database in workdir and wait until it accepts requests."""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    process = subprocess.Popen(SERVERS[name] + [str(port)], cwd=workdir, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return process
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError(f"{name} server exited with code {process.returncode}")
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{name} server did not start")
+
+
+async def _read_response(reader):
+    """Read one HTTP/1.x response; returns (status, keep_alive)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed")
+    version, status = status_line.split(b' ', 2)[:2]
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip().lower()
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+        keep_alive = version == b'HTTP/1.1' and headers.get('connection') != 'close'
+    else:
+        await reader.read()  # Body runs until the server closes the connection
+        keep_alive = False
+    return int(status), keep_alive
+
+
+async def client(port, path_template, stop_at, seed_value, latencies, counters):
+    """Send requests on one keep-alive connection, reconnecting when the server closes it."""
+    rng = random.Random(seed_value)
+    reader = writer = None
+    while time.monotonic() < stop_at:
+        path = path_template.format(year=rng.choice(SEED_YEARS), month=rng.randint(1, 12))
+        request = f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n'.encode('ascii')
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(request)
+            status, keep_alive = await _read_response(reader)
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+            counters['errors'] += 1
+            status, keep_alive = None, False
+        else:
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                counters['errors'] += 1
+        if not keep_alive and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def drive(port, path_template, connections, duration):
+    """Run `connections` concurrent clients for `duration` seconds."""
+    latencies = []
+    counters = {'errors': 0}
+    stop_at = time.monotonic() + duration
+    await asyncio.gather(*(
+        client(port, path_template, stop_at, i, latencies, counters)
+        for i in range(connections)
+    ))
+    return latencies, counters['errors']
+
+
+def percentile(sorted_values, fraction):
+    """Get a percentile of already sorted values."""
+    if not sorted_values:
+        return float('nan')
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--servers', nargs='+', choices=list(SERVERS), default=list(SERVERS))
+    parser.add_argument('--connections', nargs='+', type=int, default=[8, 64, 256])
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per run.')
+    parser.add_argument('--events', type=int, default=SEED_EVENTS)
+    parser.add_argument('--path', default='/api/month/{year}/{month}',
+                        help='Request path; {year} and {month} are filled in at random.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # web_app opens calendar_app.db in its working directory
+        seed(os.path.join(workdir, 'calendar_app.db'), args.events)
+
+        print(f"{'server':>9} {'conns':>6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+        for name in args.servers:
+            port = free_port()
+            process = start_server(name, workdir, port)
+            try:
+                # Warm caches and connection pools before measuring
+                asyncio.run(drive(port, args.path, 4, 1.0))
+                for connections in args.connections:
+                    latencies, errors = asyncio.run(drive(port, args.path, connections, args.duration))
+                    latencies.sort()
+                    print(f"{name:>9} {connections:>6} {len(latencies) / args.duration:>9.1f} "
+                          f"{statistics.median(latencies) * 1000 if latencies else float('nan'):>8.1f} "
+                          f"{percentile(latencies, 0.95) * 1000:>8.1f} {percentile(latencies, 0.99) * 1000:>8.1f} "
+                          f"{(latencies[-1] if latencies else float('nan')) * 1000:>8.1f} {errors:>7}")
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for DatabaseManager and HolidayManager.
+
+Seeds a temporary database (see seed.py) and times every DatabaseManager
+method plus HolidayManager.get_holidays_for_month, cold and warm, with
+random arguments from a fixed seed. Writes take their targets from an
+untimed setup step, so each iteration deletes or updates a real row.
+
+Usage:
+    python benchmarks/micro.py
+    python benchmarks/micro.py --events 100000 --iterations 500 --output micro.json
+    python benchmarks/micro.py --cases note holidays
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from itertools import islice
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.holiday_manager import HolidayManager
+
+from results import print_table, summarize, write_results
+from seed import DEFAULT_COUNTS, DEFAULT_START, DEFAULT_YEARS, create_seeded_database, generate_events, generate_notes
+
+WARMUP = 5
+
+
+def build_cases(db_manager, holiday_manager, rng, seeded_events, start, years):
+    """Get the (name, operation, setup, iteration share) of every benchmark case.
+
+    setup() runs untimed before each operation and returns its arguments.
+    Slow whole-table cases run a share of the iterations.
+    """
+    span_days = 365 * years
+    # The database was seeded fresh, so the seeded events have ids 1..seeded_events
+    event_ids = range(1, max(seeded_events, 1) + 1)
+
+    def day():
+        return start + timedelta(days=rng.randrange(span_days))
+
+    def window(days):
+        first = day()
+        return first, first + timedelta(days=days)
+
+    def month():
+        first = day().replace(day=1)
+        return first, (first + timedelta(days=32)).replace(day=1)
+
+    def new_event():
+        start_time = day() + timedelta(hours=rng.randrange(24))
+        return db_manager.create_event('Benchmark event', start_time, end_time=start_time + timedelta(hours=1)).id
+
+    def new_note():
+        return db_manager.create_new_note(day().date(), 'Benchmark note').id
+
+    def holidays():
+        year = rng.choice([2024, 2025])
+        return {date(year, 1, 1): "New Year's Day", date(year, 12, 25): 'Christmas Day'}
+
+    def clear_holiday_cache():
+        holiday_manager.cache.clear()
+        return ()
+
+    return [
+        # Events
+        ('get_event', lambda: db_manager.get_event(rng.choice(event_ids)), None, 1),
+        ('get_events month', lambda: db_manager.get_events(*month()), None, 1),
+        ('get_events day', lambda: db_manager.get_events(*window(1)), None, 1),
+        ('get_recurring_events', lambda: db_manager.get_recurring_events(day()), None, 1),
+        ('get_events_version', db_manager.get_events_version, None, 1),
+        ('get_occupancy month', lambda: db_manager.get_occupancy(*(bound.date() for bound in month())), None, 1),
+        ('list_events page', lambda: db_manager.list_events(limit=50, start_date=day()), None, 1),
+        ('create_event', lambda: db_manager.create_event(
+            'Benchmark event', day(), end_time=None, category='Work'), None, 1),
+        ('update_event', lambda: db_manager.update_event(rng.choice(event_ids), title='Renamed event'), None, 1),
+        ('delete_event', db_manager.delete_event, lambda: (new_event(),), 1),
+        ('bulk_insert_events 100', db_manager.bulk_insert_events,
+         lambda: (list(generate_events(100, start, years, seed=rng.random())),), 0.25),
+        ('iter_events 1000 rows', lambda: sum(1 for _ in islice(db_manager.iter_events(), 1000)), None, 0.25),
+        ('rebuild_occupancy', db_manager.rebuild_occupancy, None, 0.05),
+        # Notes
+        ('get_note', lambda: db_manager.get_note(day().date()), None, 1),
+        ('get_notes_for_date', lambda: db_manager.get_notes_for_date(day().date()), None, 1),
+        ('get_note_counts 6 weeks', lambda: db_manager.get_note_counts(*window(42)), None, 1),
+        ('list_notes page', lambda: db_manager.list_notes(limit=50, start_date=day()), None, 1),
+        ('create_or_update_note', lambda: db_manager.create_or_update_note(day().date(), 'Updated note'), None, 1),
+        ('create_new_note', lambda: db_manager.create_new_note(day().date(), 'Benchmark note'), None, 1),
+        ('update_note_by_id', db_manager.update_note_by_id, lambda: (new_note(), 'Edited note'), 1),
+        ('delete_note_by_id', db_manager.delete_note_by_id, lambda: (new_note(),), 1),
+        ('delete_note', db_manager.delete_note, lambda: (db_manager.create_new_note(day().date(), 'x').date,), 1),
+        ('bulk_insert_notes 100', db_manager.bulk_insert_notes,
+         lambda: (list(generate_notes(100, start, years, seed=rng.random())),), 0.25),
+        ('iter_notes 1000 rows', lambda: sum(1 for _ in islice(db_manager.iter_notes(), 1000)), None, 0.25),
+        # Search
+        ('search', lambda: db_manager.search(rng.choice(['meeting', 'dent', 'budget review'])), None, 1),
+        ('search month', lambda: db_manager.search('planning', *month()), None, 1),
+        ('optimize_search_index', db_manager.optimize_search_index, None, 0.05),
+        # Settings
+        ('get_setting', lambda: db_manager.get_setting('timezone'), None, 1),
+        ('get_all_settings', db_manager.get_all_settings, None, 1),
+        ('set_setting', lambda: db_manager.set_setting('theme', rng.choice(['light', 'dark'])), None, 1),
+        ('set_settings', lambda: db_manager.set_settings({'theme': 'light', 'week_start': 'monday'}), None, 1),
+        # Holidays
+        ('store_holidays', lambda: db_manager.store_holidays('US', None, 2024, holidays()), None, 1),
+        ('get_stored_holidays', lambda: db_manager.get_stored_holidays('DE', 'BW', rng.choice([2024, 2025])), None, 1),
+        ('holidays.get_holidays_for_month warm', lambda: holiday_manager.get_holidays_for_month(
+            rng.choice([2024, 2025]), rng.randint(1, 12), ['US', 'DE']), None, 1),
+        ('holidays.get_holidays_for_month cold', lambda: holiday_manager.get_holidays_for_month(
+            rng.choice([2024, 2025]), rng.randint(1, 12), ['US', 'DE']), clear_holiday_cache, 0.25),
+    ]
+
+
+def measure(operation, setup, iterations):
+    """Time `iterations` calls of operation after WARMUP untimed ones."""
+    timings = []
+    for index in range(WARMUP + iterations):
+        arguments = setup() if setup else ()
+        started = time.perf_counter()
+        operation(*arguments)
+        elapsed = time.perf_counter() - started
+        if index >= WARMUP:
+            timings.append(elapsed)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=DEFAULT_COUNTS['events'])
+    parser.add_argument('--recurring', type=int, default=DEFAULT_COUNTS['recurring'])
+    parser.add_argument('--notes', type=int, default=DEFAULT_COUNTS['notes'])
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--cases', nargs='+', help='Only run cases whose name contains one of these.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write JSON results to this file ('-' for stdout).")
+    args = parser.parse_args()
+
+    counts = {'events': args.events, 'recurring': args.recurring, 'notes': args.notes}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_seeded_database(os.path.join(tmp, 'bench.db'), seed=args.seed, **counts)
+        holiday_manager = HolidayManager(store=db_manager)
+        rng = random.Random(args.seed)
+        cases = build_cases(db_manager, holiday_manager, rng, args.events + args.recurring,
+                            DEFAULT_START, DEFAULT_YEARS)
+        for name, operation, setup, share in cases:
+            if args.cases and not any(pattern in name for pattern in args.cases):
+                continue
+            timings = measure(operation, setup, max(int(args.iterations * share), 1))
+            results[name] = summarize(timings)
+        db_manager.engine.dispose()
+
+    print_table(results)
+    if args.output:
+        write_results(args.output, 'micro', dict(counts, iterations=args.iterations, seed=args.seed), results)
+
+
+if __name__ == '__main__':
+    main()
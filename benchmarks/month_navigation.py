@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+HTTP load scenario replaying the month navigation of static/calendar.js.
+
+Seeds a temporary database, imports web_app against it and runs simulated
+sessions through the Flask test client. Each session loads the page and
+its month, then takes random steps the way the UI issues requests:
+
+- next/previous month, month or year selector: GET /api/month/<y>/<m>
+  (loadMonthData)
+- clicking a day: GET /api/notes?date= twice (loadNote and
+  updateEventDetailsAndNotesDisplay)
+
+Reports latency per endpoint and per UI step.
+
+Usage:
+    python benchmarks/month_navigation.py
+    python benchmarks/month_navigation.py --sessions 50 --steps 40 --output navigation.json
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+# Add project root to Python path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from results import print_table, summarize, write_results
+from seed import DEFAULT_COUNTS, DEFAULT_START, DEFAULT_YEARS, create_seeded_database
+
+# UI step -> relative frequency in a session
+STEP_WEIGHTS = {
+    'next_month': 45,
+    'previous_month': 25,
+    'select_month': 10,
+    'select_year': 5,
+    'select_day': 15,
+}
+MONTH_QUERY = '?countries=US&countries=DE&format=columnar'  # As sent by loadMonthData()
+
+
+class Session:
+    """One simulated browser session; records request and step timings."""
+
+    def __init__(self, client, rng, year, month, timings):
+        """Start a session showing a month; `month` is 0-based like calendar.js."""
+        self.client = client
+        self.rng = rng
+        self.year = year
+        self.month = month
+        self.timings = timings
+
+    def _get(self, endpoint, url):
+        """Issue one request and record its latency under endpoint."""
+        started = time.perf_counter()
+        response = self.client.get(url)
+        self.timings[endpoint].append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code}")
+        return response
+
+    def load_month(self):
+        """loadMonthData(): one request for the visible grid."""
+        self._get('GET /api/month/<year>/<month>', f'/api/month/{self.year}/{self.month + 1}{MONTH_QUERY}')
+
+    def open_page(self):
+        """Page load: the HTML, then the current month."""
+        self._get('GET /', '/')
+        self.load_month()
+
+    def step(self, name):
+        """Perform one UI step, recording its total time."""
+        started = time.perf_counter()
+        if name == 'next_month':
+            self.year, self.month = (self.year + 1, 0) if self.month == 11 else (self.year, self.month + 1)
+            self.load_month()
+        elif name == 'previous_month':
+            self.year, self.month = (self.year - 1, 11) if self.month == 0 else (self.year, self.month - 1)
+            self.load_month()
+        elif name == 'select_month':
+            self.month = self.rng.randrange(12)
+            self.load_month()
+        elif name == 'select_year':
+            self.year = self.rng.choice(range(DEFAULT_START.year, DEFAULT_START.year + DEFAULT_YEARS))
+            self.load_month()
+        else:
+            day = f'{self.year}-{self.month + 1:02d}-{self.rng.randint(1, 28):02d}'
+            self._get('GET /api/notes', f'/api/notes?date={day}')
+            self._get('GET /api/notes', f'/api/notes?date={day}')
+        self.timings[f'step {name}'].append(time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=DEFAULT_COUNTS['events'])
+    parser.add_argument('--recurring', type=int, default=DEFAULT_COUNTS['recurring'])
+    parser.add_argument('--notes', type=int, default=DEFAULT_COUNTS['notes'])
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--steps', type=int, default=30, help='UI steps per session.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write JSON results to this file ('-' for stdout).")
+    args = parser.parse_args()
+
+    counts = {'events': args.events, 'recurring': args.recurring, 'notes': args.notes}
+    timings = defaultdict(list)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'calendar_app.db')
+        create_seeded_database(db_path, seed=args.seed, **counts).engine.dispose()
+        import web_app
+        client = web_app.create_app(db_path).test_client()
+        rng = random.Random(args.seed)
+        steps, weights = list(STEP_WEIGHTS), list(STEP_WEIGHTS.values())
+        started = time.perf_counter()
+        for _ in range(args.sessions):
+            session = Session(client, rng, rng.choice(range(DEFAULT_START.year, DEFAULT_START.year + DEFAULT_YEARS)),
+                              rng.randrange(12), timings)
+            session.open_page()
+            for name in rng.choices(steps, weights, k=args.steps):
+                session.step(name)
+        elapsed = time.perf_counter() - started
+        web_app.db_manager.engine.dispose()
+
+    results = {name: summarize(values) for name, values in sorted(timings.items())}
+    requests = sum(len(values) for name, values in timings.items() if name.startswith('GET '))
+    print_table(results)
+    print(f"{requests} requests in {elapsed:.2f}s ({requests / elapsed:.1f} req/s)")
+    if args.output:
+        write_results(args.output, 'month_navigation',
+                      dict(counts, sessions=args.sessions, steps=args.steps, seed=args.seed),
+                      dict(results, total={'requests': requests, 'seconds': elapsed, 'requests_per_sec': requests / elapsed}))
+
+
+if __name__ == '__main__':
+    main()
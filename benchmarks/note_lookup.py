@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Note lookup benchmark.
+
+Seeds temporary databases with an increasing number of notes and times
+DatabaseManager.get_notes_for_date against each. With the index on
+Note.date and range predicates the latency should stay roughly flat as
+the table grows. The seeded date span grows with the table so every day
+holds about NOTES_PER_DAY notes and each lookup returns a similar result.
+
+Usage:
+    python benchmarks/note_lookup.py
+    python benchmarks/note_lookup.py --sizes 1000 10000 --lookups 500
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+from database.models import Note
+
+NOTES_PER_DAY = 3
+CHUNK_SIZE = 50000
+
+
+def seed_notes(db_manager, count, start, span_days):
+    """Insert `count` notes spread over `span_days` days."""
+    rng = random.Random(count)
+    table = Note.__table__
+    now = datetime.utcnow()
+    with db_manager.engine.begin() as conn:
+        for offset in range(0, count, CHUNK_SIZE):
+            rows = [
+                {
+                    'date': start + timedelta(days=rng.randrange(span_days)),
+                    'content': f'note {offset + i}',
+                    'created_at': now,
+                    'updated_at': now,
+                    'last_modified': now,
+                }
+                for i in range(min(CHUNK_SIZE, count - offset))
+            ]
+            conn.execute(table.insert(), rows)
+
+
+def run(size, lookups):
+    """Time `lookups` random single-day lookups against `size` notes."""
+    start = datetime(2015, 1, 1)
+    span_days = max(size // NOTES_PER_DAY, 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, 'bench.db'))
+        db_manager.initialize_database()
+        seed_notes(db_manager, size, start, span_days)
+
+        rng = random.Random(0)
+        days = [(start + timedelta(days=rng.randrange(span_days))).date() for _ in range(lookups)]
+        timings = []
+        for day in days:
+            t0 = time.perf_counter()
+            db_manager.get_notes_for_date(day)
+            timings.append((time.perf_counter() - t0) * 1000)
+        db_manager.engine.dispose()
+
+    timings.sort()
+    return {
+        'size': size,
+        'median_ms': statistics.median(timings),
+        'p95_ms': timings[int(len(timings) * 0.95) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--lookups', type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'notes':>10} {'median ms':>10} {'p95 ms':>10}")
+    for size in args.sizes:
+        result = run(size, args.lookups)
+        print(f"{result['size']:>10} {result['median_ms']:>10.3f} {result['p95_ms']:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
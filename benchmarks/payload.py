@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Payload benchmark for the /api/events formats.
+
+Seeds one dense month and compares the JSON and columnar formats of
+/api/events: response size with and without gzip, server time with the
+response cache cleared, and the time a client takes to parse the body.
+Parsing is timed with JSON.parse in Node.js when `node` is installed, as
+the browser would, and with Python's json.loads otherwise.
+
+Usage:
+    python benchmarks/payload.py
+    python benchmarks/payload.py --events 10000 --output payload.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add project root to Python path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from results import print_table, summarize, write_results
+from seed import create_seeded_database
+
+FORMATS = ('json', 'columnar')
+
+# Times JSON.parse of a file; prints one duration in seconds per line
+NODE_PARSE = '''
+const body = require('fs').readFileSync(process.argv[1], 'utf8');
+for (let i = 0; i < Number(process.argv[2]); i++) {
+    const started = process.hrtime.bigint();
+    JSON.parse(body);
+    console.log(Number(process.hrtime.bigint() - started) / 1e9);
+}
+'''
+
+
+def time_parse(body, iterations):
+    """Time parsing a JSON body; returns (timings, parser name)."""
+    node = shutil.which('node')
+    if node:
+        with tempfile.NamedTemporaryFile('wb', suffix='.json', delete=False) as stream:
+            stream.write(body)
+        try:
+            output = subprocess.run([node, '-e', NODE_PARSE, stream.name, str(iterations)],
+                                    capture_output=True, text=True, check=True).stdout
+        finally:
+            os.unlink(stream.name)
+        return [float(line) for line in output.split()], 'node JSON.parse'
+
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        json.loads(body)
+        timings.append(time.perf_counter() - started)
+    return timings, 'python json.loads'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=5000, help='Events in the benchmarked month.')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--tz', default='Europe/Berlin', help='Display timezone of the responses.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write JSON results to this file ('-' for stdout).")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'calendar_app.db')
+        # One month of data, so every event lands in the benchmarked month
+        create_seeded_database(db_path, seed=args.seed, events=args.events, recurring=0, notes=0,
+                               years=1 / 12).engine.dispose()
+        import web_app
+        client = web_app.create_app(db_path).test_client()
+        url = f'/api/events?year=2024&month=1&tz={args.tz}'
+
+        for events_format in FORMATS:
+            server_timings = []
+            for _ in range(args.iterations):
+                web_app.events_cache.clear()
+                started = time.perf_counter()
+                response = client.get(f'{url}&format={events_format}')
+                server_timings.append(time.perf_counter() - started)
+            body = response.data
+            gzipped = client.get(f'{url}&format={events_format}', headers={'Accept-Encoding': 'gzip'}).data
+            parse_timings, parser_name = time_parse(body, args.iterations)
+
+            results[f'{events_format} server'] = dict(summarize(server_timings), bytes=len(body), gzip_bytes=len(gzipped))
+            results[f'{events_format} parse'] = dict(summarize(parse_timings), parser=parser_name)
+        web_app.db_manager.engine.dispose()
+
+    print_table(results)
+    for events_format in FORMATS:
+        server = results[f'{events_format} server']
+        print(f"{events_format:<9} {server['bytes']:>10,} bytes, {server['gzip_bytes']:>9,} gzipped")
+    if args.output:
+        write_results(args.output, 'payload', {'events': args.events, 'iterations': args.iterations,
+                                               'tz': args.tz, 'seed': args.seed}, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Timing summaries and JSON result files shared by the benchmarks.
+
+A result file holds the benchmark name, its parameters, the environment
+it ran in (git commit, Python and SQLite versions, platform) and one
+summary per measured case, so files from different versions can be
+compared with benchmarks/compare.py.
+"""
+
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def summarize(timings):
+    """Summarize per-operation timings in seconds into milliseconds."""
+    ordered = sorted(timings)
+    count = len(ordered)
+    return {
+        'iterations': count,
+        'mean_ms': statistics.fmean(ordered) * 1000,
+        'median_ms': statistics.median(ordered) * 1000,
+        'p95_ms': ordered[min(int(count * 0.95), count - 1)] * 1000,
+        'max_ms': ordered[-1] * 1000,
+        'ops_per_sec': count / sum(ordered) if sum(ordered) else float('inf'),
+    }
+
+
+def _git_commit():
+    """Get the current commit of the repository, or None outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10, check=True).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment():
+    """Describe the code and machine a benchmark ran on."""
+    return {
+        'git_commit': _git_commit(),
+        'python': sys.version.split()[0],
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def write_results(path, benchmark, parameters, results):
+    """Write a benchmark's results as JSON to path ('-' for stdout)."""
+    document = {
+        'benchmark': benchmark,
+        'created_at': datetime.utcnow().isoformat() + 'Z',
+        'environment': environment(),
+        'parameters': parameters,
+        'results': results,
+    }
+    text = json.dumps(document, indent=2, sort_keys=True, default=str)
+    if path == '-':
+        print(text)
+    else:
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.write(text + '\n')
+
+
+def print_table(results):
+    """Print {case: summary} results as an aligned table."""
+    width = max([len(name) for name in results] + [4])
+    print(f"{'case':<{width}} {'iters':>6} {'median ms':>10} {'p95 ms':>9} {'max ms':>9} {'ops/s':>10}")
+    for name, summary in results.items():
+        print(f"{name:<{width}} {summary['iterations']:>6} {summary['median_ms']:>10.3f} "
+              f"{summary['p95_ms']:>9.3f} {summary['max_ms']:>9.3f} {summary['ops_per_sec']:>10.1f}")
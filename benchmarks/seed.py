@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Data generators for the benchmarks.
+
+Seeds a calendar database with one-off events, recurring events and notes
+spread over a span of years. Generation is deterministic for a given
+--seed, so runs against different versions of the app see the same data.
+Rows go through DatabaseManager's bulk inserts, which keep the search,
+interval and occupancy indexes in sync.
+
+Usage:
+    python benchmarks/seed.py
+    python benchmarks/seed.py --db calendar_app.db --events 50000 --recurring 500 --notes 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+from utils.recurrence import RECURRENCE_FREQUENCIES
+
+CHUNK_SIZE = 5000
+CATEGORIES = ['General', 'Work', 'Personal', 'Health', 'Travel']
+WORDS = ['meeting', 'review', 'dentist', 'lunch', 'standup', 'planning', 'gym', 'flight',
+         'call', 'report', 'birthday', 'budget', 'design', 'interview', 'workshop', 'cafe']
+TIMEZONES = ['UTC', 'Europe/Berlin', 'America/New_York', 'Asia/Tokyo']
+
+# Defaults shared by the benchmark scripts
+DEFAULT_COUNTS = {'events': 20000, 'recurring': 200, 'notes': 10000}
+DEFAULT_START = datetime(2024, 1, 1)
+DEFAULT_YEARS = 2
+
+
+def _text(rng, words):
+    """Get a few random words."""
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def generate_events(count, start=DEFAULT_START, years=DEFAULT_YEARS, recurring=False, seed=0):
+    """Yield event rows with starts spread uniformly over `years` years from start."""
+    rng = random.Random(f'events-{recurring}-{seed}')
+    span_minutes = int(timedelta(days=365 * years).total_seconds() // 60)
+    frequencies = list(RECURRENCE_FREQUENCIES)
+    now = datetime.utcnow()
+    for i in range(count):
+        # Quarter-hour aligned starts lasting 15 minutes to 3 hours
+        start_time = start + timedelta(minutes=rng.randrange(span_minutes) // 15 * 15)
+        yield {
+            'title': f'{_text(rng, 2).capitalize()} {i}',
+            'description': _text(rng, 8),
+            'start_time': start_time,
+            'end_time': start_time + timedelta(minutes=15 * rng.randint(1, 12)),
+            'category': rng.choice(CATEGORIES),
+            'recurrence': rng.choice(frequencies) if recurring else None,
+            'timezone': rng.choice(TIMEZONES),
+            'created_at': now,
+            'updated_at': now,
+            'last_modified': now,
+        }
+
+
+def generate_notes(count, start=DEFAULT_START, years=DEFAULT_YEARS, seed=0):
+    """Yield note rows on days spread uniformly over `years` years from start."""
+    rng = random.Random(f'notes-{seed}')
+    span_days = 365 * years
+    now = datetime.utcnow()
+    for _ in range(count):
+        yield {
+            'date': start + timedelta(days=rng.randrange(span_days)),
+            'content': _text(rng, 12),
+            'created_at': now,
+            'updated_at': now,
+            'last_modified': now,
+        }
+
+
+def _insert_chunks(insert, rows):
+    """Insert rows in CHUNK_SIZE batches; returns the number inserted."""
+    inserted = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            inserted += insert(chunk) or 0
+            chunk = []
+    return inserted + (insert(chunk) or 0)
+
+
+def seed_database(db_manager, events=DEFAULT_COUNTS['events'], recurring=DEFAULT_COUNTS['recurring'],
+                  notes=DEFAULT_COUNTS['notes'], start=DEFAULT_START, years=DEFAULT_YEARS, seed=0):
+    """Add generated events, recurring events and notes to an initialized database.
+
+    Returns the number of rows inserted per kind.
+    """
+    return {
+        'events': _insert_chunks(db_manager.bulk_insert_events, generate_events(events, start, years, seed=seed)),
+        'recurring': _insert_chunks(db_manager.bulk_insert_events,
+                                    generate_events(recurring, start, years, recurring=True, seed=seed)),
+        'notes': _insert_chunks(db_manager.bulk_insert_notes, generate_notes(notes, start, years, seed=seed)),
+    }
+
+
+def create_seeded_database(db_path, seed=0, **counts):
+    """Create (or extend) the database at db_path and seed it; returns the DatabaseManager."""
+    db_manager = DatabaseManager(db_path)
+    db_manager.initialize_database()
+    seed_database(db_manager, seed=seed, **counts)
+    return db_manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='calendar_app.db', help='Database file; rows are added to existing data.')
+    parser.add_argument('--events', type=int, default=DEFAULT_COUNTS['events'])
+    parser.add_argument('--recurring', type=int, default=DEFAULT_COUNTS['recurring'])
+    parser.add_argument('--notes', type=int, default=DEFAULT_COUNTS['notes'])
+    parser.add_argument('--start', type=lambda value: datetime.strptime(value, '%Y-%m-%d'),
+                        default=DEFAULT_START, help='First day of the seeded span (YYYY-MM-DD).')
+    parser.add_argument('--years', type=int, default=DEFAULT_YEARS)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.db)
+    db_manager.initialize_database()
+    inserted = seed_database(db_manager, args.events, args.recurring, args.notes,
+                             args.start, args.years, args.seed)
+    db_manager.engine.dispose()
+    print(f"Seeded {args.db}: " + ', '.join(f"{count} {kind}" for kind, count in inserted.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: time from importing web_app to its first response.
+
+Each run starts a fresh interpreter, as a newly forked worker would, that
+imports web_app, creates the app against a seeded database and serves one
+request through the Flask test client. The database is reused across
+runs, so only the first run pays for creating the schema. Holidays are
+precomputed into it for the seeded years, as `flask precompute-holidays`
+does in a deployment, unless --no-precompute is given.
+
+With --fork, workers are instead forked from a process that has already
+imported web_app (like gunicorn --preload), so each run times only
+create_app() and the first request.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --fork
+    python benchmarks/startup.py --runs 30 --path /api/events?year=2024&month=6 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+
+# Add project root to Python path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.holiday_manager import HolidayManager
+
+from results import print_table, summarize, write_results
+from seed import DEFAULT_START, DEFAULT_YEARS, create_seeded_database
+
+# Runs in the child interpreter; prints its phase timings as JSON
+WORKER = '''
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import web_app
+imported = time.perf_counter()
+if hasattr(web_app, 'create_app'):
+    app = web_app.create_app(sys.argv[2])
+else:
+    app = web_app.app  # Versions without the factory open calendar_app.db in the working directory
+created = time.perf_counter()
+response = app.test_client().get(sys.argv[3])
+responded = time.perf_counter()
+if response.status_code != 200:
+    sys.exit(f"GET {sys.argv[3]} returned {response.status_code}")
+print(json.dumps({'import': imported - started, 'create_app': created - imported,
+                  'first_request': responded - created, 'import_to_first_response': responded - started}))
+'''
+
+
+def run_worker(db_path, path):
+    """Start one worker process; returns its phase timings and the process wall time."""
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-c', WORKER, ROOT, db_path, path],
+                               cwd=os.path.dirname(db_path), capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"Worker failed:\n{completed.stderr}")
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    timings['process'] = elapsed
+    return timings
+
+
+def fork_worker(db_path, path):
+    """Fork a worker from this process, which has imported web_app; returns its timings."""
+    import web_app
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_end)
+            started = time.perf_counter()
+            app = web_app.create_app(db_path)
+            created = time.perf_counter()
+            status = app.test_client().get(path).status_code
+            responded = time.perf_counter()
+            if status == 200:
+                os.write(write_end, json.dumps({'create_app': created - started,
+                                                'first_request': responded - created,
+                                                'fork_to_first_response': responded - started}).encode())
+        except Exception:
+            traceback.print_exc()
+        finally:
+            os._exit(0)
+    os.close(write_end)
+    with os.fdopen(read_end) as stream:
+        output = stream.read()
+    os.waitpid(pid, 0)
+    if not output:
+        raise RuntimeError(f"GET {path} failed in a forked worker")
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--path', default='/api/month/2024/6', help='Path of the first request.')
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fork', action='store_true', help='Fork workers from a process that imported web_app.')
+    parser.add_argument('--no-precompute', action='store_true', help='Leave holidays to be computed on request.')
+    parser.add_argument('--output', help="Write JSON results to this file ('-' for stdout).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'calendar_app.db')
+        db_manager = create_seeded_database(db_path, seed=args.seed, events=args.events, recurring=20, notes=1000)
+        if not args.no_precompute:
+            holiday_manager = HolidayManager(store=db_manager)
+            holiday_manager.precompute(holiday_manager.get_supported_countries(),
+                                       range(DEFAULT_START.year, DEFAULT_START.year + DEFAULT_YEARS))
+        db_manager.engine.dispose()
+        first = run_worker(db_path, args.path)  # Brings the seeded schema up to date; not counted
+        worker = fork_worker if args.fork else run_worker
+        timings = {}
+        for _ in range(args.runs):
+            for phase, value in worker(db_path, args.path).items():
+                timings.setdefault(phase, []).append(value)
+
+    results = {phase: summarize(values) for phase, values in timings.items()}
+    print_table(results)
+    print(f"First run against the new database: {first['import_to_first_response'] * 1000:.1f} ms")
+    if args.output:
+        write_results(args.output, 'startup', {'runs': args.runs, 'path': args.path, 'events': args.events,
+                                               'seed': args.seed, 'precompute': not args.no_precompute,
+                                               'fork': args.fork}, results)
+
+
+if __name__ == '__main__':
+    main()
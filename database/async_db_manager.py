@@ -0,0 +1,147 @@
+"""
+Async database access for the Calendar App's ASGI mode.
+
+Requires SQLAlchemy's asyncio extension and the aiosqlite driver
+(see requirements.txt). Only the read queries behind the month views
+have async versions; writes keep going through DatabaseManager and its
+per-request unit of work.
+"""
+
+from datetime import datetime
+from sqlalchemy import event as sa_event, func, select, text, column, DateTime
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .db_manager import ENGINE_PROFILES, _day_bounds, overlap_filters
+from .models import Event, Note
+
+
+class AsyncDatabaseManager:
+    """Non-blocking read access to the calendar database.
+
+    Shares the file, engine profile and schema of a DatabaseManager, which
+    must have initialized the database first. Queries return read-only
+    Core rows carrying the model's column attributes, skipping the ORM
+    identity map that a per-request read has no use for.
+    """
+    
+    def __init__(self, db_path="calendar_app.db", profile="performance", has_interval_index=False):
+        """Initialize the async database manager.
+
+        No connection is opened until the first query.
+        """
+        if profile not in ENGINE_PROFILES:
+            raise ValueError(f"Unknown engine profile: {profile}")
+        self.db_path = db_path
+        self.profile = profile
+        self.has_interval_index = has_interval_index
+        self.engine = self._create_engine()
+        self.SessionLocal = async_sessionmaker(self.engine, expire_on_commit=False)
+    
+    @classmethod
+    def from_manager(cls, db_manager):
+        """Create an async manager for the database of an initialized DatabaseManager."""
+        return cls(db_manager.db_path, profile=db_manager.profile,
+                   has_interval_index=db_manager.has_interval_index)
+    
+    def _create_engine(self):
+        """Create the async engine for the configured profile."""
+        profile = ENGINE_PROFILES[self.profile]
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{self.db_path}",
+            echo=False,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=profile['pool_size'],
+            max_overflow=profile['max_overflow'],
+            pool_timeout=profile['pool_timeout'],
+        )
+        
+        pragmas = profile['pragmas']
+        if pragmas:
+            @sa_event.listens_for(engine.sync_engine, 'connect')
+            def _apply_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+                cursor.close()
+        
+        return engine
+    
+    async def dispose(self):
+        """Close every pooled connection."""
+        await self.engine.dispose()
+    
+    async def get_events(self, start_date=None, end_date=None):
+        """Get events overlapping the half-open range [start_date, end_date).
+
+        Events without an end_time are treated as instants at start_time.
+        """
+        try:
+            async with self.SessionLocal() as session:
+                result = await session.execute(
+                    select(Event.__table__)
+                    .where(*overlap_filters(start_date, end_date, self.has_interval_index))
+                    .order_by(Event.start_time)
+                )
+                return result.all()
+        except SQLAlchemyError as e:
+            print(f"Error getting events: {e}")
+            return []
+    
+    async def get_events_version(self):
+        """Get (change counter, time of the last change) for the events table."""
+        try:
+            async with self.SessionLocal() as session:
+                result = await session.execute(text(
+                    "SELECT version, changed_at FROM table_versions WHERE name = 'events'"
+                ).columns(column('version'), column('changed_at', DateTime)))
+                row = result.first()
+                return (row.version, row.changed_at) if row else (0, None)
+        except SQLAlchemyError as e:
+            print(f"Error getting events version: {e}")
+            return None, None
+    
+    async def get_recurring_events(self, end_date):
+        """Get recurring events whose series starts before end_date."""
+        try:
+            async with self.SessionLocal() as session:
+                result = await session.execute(
+                    select(Event.__table__)
+                    .where(Event.recurrence.isnot(None), Event.start_time < end_date)
+                    .order_by(Event.start_time)
+                )
+                return result.all()
+        except SQLAlchemyError as e:
+            print(f"Error getting recurring events: {e}")
+            return []
+    
+    async def get_notes_for_date(self, date):
+        """Get all notes for a specific date."""
+        try:
+            day_start, day_end = _day_bounds(date)
+            async with self.SessionLocal() as session:
+                result = await session.execute(
+                    select(Note.__table__)
+                    .where(Note.date >= day_start, Note.date < day_end)
+                    .order_by(Note.created_at.desc())
+                )
+                return result.all()
+        except SQLAlchemyError as e:
+            print(f"Error getting notes for date: {e}")
+            return []
+    
+    async def get_note_counts(self, start_date: datetime, end_date: datetime):
+        """Get the number of notes per day within a date range."""
+        try:
+            day = func.date(Note.date)
+            async with self.SessionLocal() as session:
+                result = await session.execute(
+                    select(day, func.count(Note.id))
+                    .where(Note.date >= start_date, Note.date < end_date)
+                    .group_by(day)
+                )
+                return {note_day: count for note_day, count in result.all()}
+        except SQLAlchemyError as e:
+            print(f"Error getting note counts: {e}")
+            return {}
@@ -3,42 +3,254 @@ Database manager for the Calendar App.
 """
 
 import os
-from datetime import datetime
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import re
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, date, timedelta
+from sqlalchemy import create_engine, event as sa_event, func, insert, or_, and_, select, text, column, bindparam, DateTime
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.exc import SQLAlchemyError
 
-from .models import Base, Event, Note, Setting
+from .models import Base, Event, EventDay, Note, Setting, Holiday, HolidayYear
+from .occupancy import add_occupancy
+from .schema import (
+    SCHEMA_VERSION, INTERVAL_MIN_MINUTE, INTERVAL_MAX_MINUTE,
+    migrate_schema, get_schema_version, set_schema_version,
+    has_event_interval_index, has_search_index
+)
+
+
+# Engine profiles: connect-time PRAGMAs plus pool settings.
+# 'default' keeps SQLite's stock behaviour; 'performance' enables WAL so
+# readers no longer block behind writers and waits on locks instead of
+# failing with "database is locked".
+ENGINE_PROFILES = {
+    'default': {
+        'pragmas': {},
+        'pool_size': 5,
+        'max_overflow': 10,
+        'pool_timeout': 30,
+    },
+    'performance': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',  # Durable across app crashes in WAL mode
+            'busy_timeout': 5000,  # Milliseconds to wait on a locked database
+            'cache_size': -65536,  # Negative means KiB, i.e. 64 MiB per connection
+            'mmap_size': 268435456,  # 256 MiB of memory-mapped reads
+            'temp_store': 'MEMORY',
+        },
+        'pool_size': 8,
+        'max_overflow': 16,
+        'pool_timeout': 30,
+    },
+}
+
+
+def _day_bounds(day):
+    """Get the half-open [start, end) datetime range covering a day.
+
+    Range predicates on the raw column let SQLite use the index, unlike
+    wrapping the column in func.date().
+    """
+    if isinstance(day, str):
+        day = datetime.strptime(day, '%Y-%m-%d').date()
+    elif isinstance(day, datetime):
+        day = day.date()
+    start = datetime.combine(day, datetime.min.time())
+    return start, start + timedelta(days=1)
+
+
+def _search_query(terms):
+    """Turn free text into an FTS5 query matching every word as a prefix.
+
+    Each word is quoted, so FTS5 operators and column filters typed by
+    the user are matched literally instead of being interpreted.
+    """
+    words = re.findall(r"\w+", terms or '')
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def _epoch_minutes(value):
+    """Get the epoch minute of a naive datetime, rounded down."""
+    return (value - datetime(1970, 1, 1)) // timedelta(minutes=1)
+
+
+def _interval_minute(value):
+    """Clamp an epoch minute to the interval index's range, as its triggers do."""
+    return min(max(value, INTERVAL_MIN_MINUTE), INTERVAL_MAX_MINUTE)
+
+
+def overlap_filters(start_date=None, end_date=None, use_interval_index=False):
+    """Get filters selecting events that overlap [start_date, end_date)."""
+    filters = []
+    if start_date and end_date and use_interval_index:
+        # Narrow to candidates through the R*Tree before the exact filter
+        candidates = text(
+            "SELECT id FROM event_intervals "
+            "WHERE start_min <= :window_end AND end_min >= :window_start"
+        ).bindparams(
+            window_start=_interval_minute(_epoch_minutes(start_date)),
+            window_end=_interval_minute(_epoch_minutes(end_date) + 1)
+        ).columns(column('id'))
+        filters.append(Event.id.in_(candidates))
+    if start_date:
+        filters.append(or_(
+            Event.start_time >= start_date,
+            Event.end_time > start_date
+        ))
+    if end_date:
+        filters.append(Event.start_time < end_date)
+    return filters
+
+
+class UnitOfWorkSession(Session):
+    """Session shared by every DatabaseManager call inside a unit of work.
+
+    Manager methods keep their own commit/close calls. Here commit only
+    flushes and close does nothing, so the unit of work owns one
+    connection and one transaction, and ORM objects stay attached until
+    it ends.
+    """
+    
+    pending_commit = False
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Callbacks to run once the unit of work has committed
+        self.commit_callbacks = []
+    
+    def commit(self):
+        """Flush changes; the unit of work commits them once at the end."""
+        self.flush()
+        self.pending_commit = True
+    
+    def close(self):
+        """Keep the session open until the unit of work ends."""
+    
+    def rollback(self):
+        """Roll back the whole unit of work."""
+        super().rollback()
+        self.pending_commit = False
+        self.commit_callbacks = []
+    
+    def commit_unit_of_work(self):
+        """Commit the unit of work's transaction, then run its commit callbacks."""
+        super().commit()
+        self.pending_commit = False
+        callbacks, self.commit_callbacks = self.commit_callbacks, []
+        for callback in callbacks:
+            callback()
+    
+    def close_unit_of_work(self):
+        """Release the unit of work's connection."""
+        super().close()
+
+
+def _drop_inherited_connections(engine_ref):
+    """Empty a forked child's copy of an engine's pool.
+
+    The connections stay open, as they still belong to the parent.
+    """
+    engine = engine_ref()
+    if engine is not None:
+        engine.dispose(close=False)
 
 
 class DatabaseManager:
     """Manages database operations for the calendar app."""
     
-    def __init__(self, db_path="calendar_app.db"):
-        """Initialize database manager."""
+    def __init__(self, db_path="calendar_app.db", profile="performance"):
+        """Initialize database manager.
+
+        `profile` selects an entry of ENGINE_PROFILES.
+        """
+        if profile not in ENGINE_PROFILES:
+            raise ValueError(f"Unknown engine profile: {profile}")
         self.db_path = db_path
+        self.profile = profile
         self.engine = None
         self.SessionLocal = None
-        
+        self.UnitOfWorkLocal = None
+        self.has_interval_index = False
+        self.has_search_index = False
+        self._unit_of_work = ContextVar(f"unit_of_work_{id(self)}", default=None)
+    
     def initialize_database(self):
         """Initialize database connection and create tables."""
         try:
             # Create database engine
-            self.engine = create_engine(f"sqlite:///{self.db_path}", echo=False)
-            
-            # Create all tables
-            Base.metadata.create_all(bind=self.engine)
+            self.engine = self._create_engine()
             
-            # Create session factory
-            self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
-            
-            # Initialize default settings
-            self._initialize_default_settings()
+            # Create session factories; returned objects stay readable after commit
+            self.SessionLocal = sessionmaker(
+                autocommit=False, autoflush=False, expire_on_commit=False, bind=self.engine
+            )
+            self.UnitOfWorkLocal = sessionmaker(
+                class_=UnitOfWorkSession, autocommit=False, autoflush=False,
+                expire_on_commit=False, bind=self.engine
+            )
             
+            # A database stamped with the current schema version needs no DDL
+            if get_schema_version(self.engine) != SCHEMA_VERSION:
+                self._create_schema()
+            self.has_interval_index = has_event_interval_index(self.engine)
+            self.has_search_index = has_search_index(self.engine)
+        
         except SQLAlchemyError as e:
             print(f"Database initialization error: {e}")
             raise
     
+    def _create_schema(self):
+        """Create missing tables, upgrade older ones and stamp the schema version."""
+        # Create all tables
+        Base.metadata.create_all(bind=self.engine)
+        
+        # Upgrade tables created by older versions
+        migrate_schema(self.engine)
+        if self._occupancy_needs_rebuild() and not self.rebuild_occupancy():
+            return  # Left unstamped, so the next start retries
+        
+        # Initialize default settings
+        self._initialize_default_settings()
+        set_schema_version(self.engine)
+    
+    def _create_engine(self):
+        """Create the engine for the configured profile."""
+        profile = ENGINE_PROFILES[self.profile]
+        engine = create_engine(
+            f"sqlite:///{self.db_path}",
+            echo=False,
+            # Pooled connections are handed between request threads
+            connect_args={'check_same_thread': False},
+            poolclass=QueuePool,
+            pool_size=profile['pool_size'],
+            max_overflow=profile['max_overflow'],
+            pool_timeout=profile['pool_timeout'],
+        )
+        
+        pragmas = profile['pragmas']
+        if pragmas:
+            @sa_event.listens_for(engine, 'connect')
+            def _apply_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+                cursor.close()
+        
+        # A process forked after this (e.g. a `gunicorn --preload` worker)
+        # must open its own connections rather than share the parent's
+        if hasattr(os, 'register_at_fork'):
+            engine_ref = weakref.ref(engine)
+            os.register_at_fork(after_in_child=lambda: _drop_inherited_connections(engine_ref))
+        
+        return engine
+    
     def _initialize_default_settings(self):
         """Initialize default application settings."""
         session = self.SessionLocal()
@@ -63,13 +275,72 @@ class DatabaseManager:
             session.close()
     
     def get_session(self):
-        """Get a database session."""
+        """Get a database session, joining the current unit of work if there is one."""
+        session = self._unit_of_work.get()
+        if session is not None:
+            return session
         return self.SessionLocal()
     
+    # Unit of work
+    def begin_unit_of_work(self):
+        """Start a unit of work that subsequent calls in this context join."""
+        session = self.UnitOfWorkLocal()
+        session.context_token = self._unit_of_work.set(session)
+        return session
+    
+    def commit_unit_of_work(self):
+        """Commit the current unit of work if any call wrote to it."""
+        session = self._unit_of_work.get()
+        if session is None or not session.pending_commit:
+            return True
+        try:
+            session.commit_unit_of_work()
+            return True
+        except SQLAlchemyError as e:
+            session.rollback()
+            print(f"Error committing unit of work: {e}")
+            return False
+    
+    def has_pending_writes(self):
+        """Check whether the current unit of work holds uncommitted writes."""
+        session = self._unit_of_work.get()
+        return session is not None and session.pending_commit
+    
+    def on_commit(self, callback):
+        """Run a callback once the current unit of work commits, or now if there is none."""
+        session = self._unit_of_work.get()
+        if session is None:
+            callback()
+        else:
+            session.commit_callbacks.append(callback)
+    
+    def end_unit_of_work(self):
+        """End the current unit of work, discarding anything left uncommitted."""
+        session = self._unit_of_work.get()
+        if session is None:
+            return
+        try:
+            if session.pending_commit:
+                session.rollback()
+            session.close_unit_of_work()
+        finally:
+            self._unit_of_work.reset(session.context_token)
+    
+    @contextmanager
+    def unit_of_work(self):
+        """Run a block of manager calls in one transaction, committed on success."""
+        session = self.begin_unit_of_work()
+        try:
+            yield session
+            if not self.commit_unit_of_work():
+                raise SQLAlchemyError("Unit of work failed to commit")
+        finally:
+            self.end_unit_of_work()
+    
     # Event operations
     def create_event(self, title, start_time, description="", end_time=None, 
-                    category="General", recurrence=None):
-        """Create a new event."""
+                    category="General", recurrence=None, timezone="UTC"):
+        """Create a new event. start_time and end_time are naive UTC."""
         session = self.get_session()
         try:
             event = Event(
@@ -78,9 +349,12 @@ class DatabaseManager:
                 start_time=start_time,
                 end_time=end_time,
                 category=category,
-                recurrence=recurrence
+                recurrence=recurrence,
+                timezone=timezone
             )
             session.add(event)
+            if not recurrence:
+                self._add_occupancy(session, [(start_time, end_time)])
             session.commit()
             return event
         except SQLAlchemyError as e:
@@ -90,15 +364,25 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def get_event(self, event_id):
+        """Get an event by its ID."""
+        session = self.get_session()
+        try:
+            return session.query(Event).filter(Event.id == event_id).first()
+        except SQLAlchemyError as e:
+            print(f"Error getting event: {e}")
+            return None
+        finally:
+            session.close()
+    
     def get_events(self, start_date=None, end_date=None):
-        """Get events within date range."""
+        """Get events overlapping the half-open range [start_date, end_date).
+
+        Events without an end_time are treated as instants at start_time.
+        """
         session = self.get_session()
         try:
-            query = session.query(Event)
-            if start_date:
-                query = query.filter(Event.start_time >= start_date)
-            if end_date:
-                query = query.filter(Event.start_time <= end_date)
+            query = session.query(Event).filter(*self._overlap_filters(start_date, end_date))
             return query.order_by(Event.start_time).all()
         except SQLAlchemyError as e:
             print(f"Error getting events: {e}")
@@ -106,16 +390,61 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def _overlap_filters(self, start_date=None, end_date=None):
+        """Get filters selecting events that overlap [start_date, end_date)."""
+        return overlap_filters(start_date, end_date, self.has_interval_index)
+    
+    def get_recurring_events(self, end_date):
+        """Get recurring events whose series starts before end_date."""
+        session = self.get_session()
+        try:
+            return session.query(Event).filter(
+                Event.recurrence.isnot(None),
+                Event.start_time < end_date
+            ).order_by(Event.start_time).all()
+        except SQLAlchemyError as e:
+            print(f"Error getting recurring events: {e}")
+            return []
+        finally:
+            session.close()
+    
+    def get_events_version(self):
+        """Get (change counter, time of the last change) for the events table."""
+        return self.get_table_version('events')
+    
+    def get_table_version(self, table):
+        """Get (change counter, time of the last change) for a table in VERSIONED_TABLES.
+
+        Both are bumped by triggers on every insert, update and delete, so
+        callers in any process can validate caches without reading the
+        table's rows. The time is naive UTC, or None before the first
+        write. Returns (None, None) if the lookup fails.
+        """
+        session = self.get_session()
+        try:
+            row = session.execute(text(
+                "SELECT version, changed_at FROM table_versions WHERE name = :name"
+            ).columns(column('version'), column('changed_at', DateTime)), {'name': table}).first()
+            return (row.version, row.changed_at) if row else (0, None)
+        except SQLAlchemyError as e:
+            print(f"Error getting {table} version: {e}")
+            return None, None
+        finally:
+            session.close()
+    
     def update_event(self, event_id, **kwargs):
         """Update an event."""
         session = self.get_session()
         try:
             event = session.query(Event).filter(Event.id == event_id).first()
             if event:
+                old_span = (event.start_time, event.end_time, event.recurrence)
                 for key, value in kwargs.items():
                     if hasattr(event, key):
                         setattr(event, key, value)
                 event.updated_at = datetime.utcnow()
+                session.flush()
+                self._refresh_occupancy(session, old_span, (event.start_time, event.end_time, event.recurrence))
                 session.commit()
                 return event
             return None
@@ -133,6 +462,8 @@ class DatabaseManager:
             event = session.query(Event).filter(Event.id == event_id).first()
             if event:
                 session.delete(event)
+                session.flush()
+                self._refresh_occupancy(session, (event.start_time, event.end_time, event.recurrence))
                 session.commit()
                 return True
             return False
@@ -143,14 +474,134 @@ class DatabaseManager:
         finally:
             session.close()
     
+    # Event occupancy
+    def get_occupancy(self, start_day, end_day):
+        """Get {day: occupancy} of one-off events for days in [start_day, end_day).
+
+        A single primary-key range read; recurring series are not included.
+        """
+        session = self.get_session()
+        try:
+            rows = session.query(EventDay).filter(
+                EventDay.day >= start_day,
+                EventDay.day < end_day
+            ).order_by(EventDay.day).all()
+            return {row.day: {
+                'event_count': row.event_count,
+                'first_start': row.first_start,
+                'last_end': row.last_end,
+                'busy_minutes': row.busy_minutes,
+            } for row in rows}
+        except SQLAlchemyError as e:
+            print(f"Error getting occupancy: {e}")
+            return {}
+        finally:
+            session.close()
+    
+    def rebuild_occupancy(self):
+        """Recompute the whole occupancy table from the events table."""
+        days = {}
+        statement = select(Event.start_time, Event.end_time).where(Event.recurrence.is_(None))
+        try:
+            with self.engine.begin() as conn:
+                for start_time, end_time in conn.execute(statement):
+                    add_occupancy(days, start_time, end_time)
+                conn.execute(EventDay.__table__.delete())
+                if days:
+                    conn.execute(insert(EventDay.__table__), [
+                        dict(entry, day=day) for day, entry in days.items()
+                    ])
+            return True
+        except SQLAlchemyError as e:
+            print(f"Error rebuilding occupancy: {e}")
+            return False
+    
+    def _occupancy_needs_rebuild(self):
+        """Check for one-off events that the occupancy table has never seen.
+
+        Every one-off event adds at least one day, so an empty table next to
+        such events means it was just created or never filled.
+        """
+        with self.engine.connect() as conn:
+            return conn.execute(select(
+                ~select(EventDay.day).exists(),
+                select(Event.id).where(Event.recurrence.is_(None)).exists()
+            )).one() == (True, True)
+    
+    def _add_occupancy(self, connection, spans):
+        """Add (start_time, end_time) spans of new one-off events to the occupancy table.
+
+        Counts and minutes are summed into existing days and the first/last
+        times widened, so inserts never re-read events.
+        """
+        days = {}
+        for start_time, end_time in spans:
+            add_occupancy(days, start_time, end_time)
+        if not days:
+            return
+        statement = sqlite_insert(EventDay.__table__)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[EventDay.day],
+            set_={
+                'event_count': EventDay.event_count + statement.excluded.event_count,
+                'first_start': func.min(EventDay.first_start, statement.excluded.first_start),
+                'last_end': func.max(EventDay.last_end, statement.excluded.last_end),
+                'busy_minutes': EventDay.busy_minutes + statement.excluded.busy_minutes,
+            }
+        ), [dict(entry, day=day) for day, entry in days.items()])
+    
+    def _refresh_occupancy(self, connection, *spans):
+        """Recompute the occupancy of the days covered by changed events.
+
+        spans are (start_time, end_time, recurrence) before and after the
+        change; recurring ones never contribute. Each span's days are
+        re-read on their own (overlapping ones together), so moving an
+        event across years costs work proportional to its own days rather
+        than every day in between.
+        """
+        day_ranges = sorted(
+            (start_time.date(), max(end_time or start_time, start_time).date() + timedelta(days=1))
+            for start_time, end_time, recurrence in spans if not recurrence
+        )
+        merged = []
+        for first_day, end_day in day_ranges:
+            if merged and first_day <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end_day))
+            else:
+                merged.append((first_day, end_day))
+        for first_day, end_day in merged:
+            self._rebuild_occupancy_days(connection, first_day, end_day)
+    
+    def _rebuild_occupancy_days(self, connection, first_day, end_day):
+        """Recompute the occupancy of days [first_day, end_day) from the events table."""
+        window_start, window_end = _day_bounds(first_day)[0], _day_bounds(end_day)[0]
+        days = {}
+        rows = connection.execute(select(Event.start_time, Event.end_time).where(
+            Event.recurrence.is_(None),
+            *self._overlap_filters(window_start, window_end)
+        ))
+        for start_time, end_time in rows:
+            add_occupancy(days, start_time, end_time, first_day, end_day)
+        
+        connection.execute(EventDay.__table__.delete().where(
+            EventDay.day >= first_day,
+            EventDay.day < end_day
+        ))
+        if days:
+            connection.execute(insert(EventDay.__table__), [
+                dict(entry, day=day) for day, entry in days.items()
+            ])
+    
     # Note operations
     def create_or_update_note(self, date, content):
         """Create or update a note for a specific date."""
         session = self.get_session()
         try:
             # Find existing note for the date
+            day_start, day_end = _day_bounds(date)
             note = session.query(Note).filter(
-                Note.date == date
+                Note.date >= day_start,
+                Note.date < day_end
             ).first()
             
             if note:
@@ -194,15 +645,11 @@ class DatabaseManager:
         """Delete a note for a specific date."""
         session = self.get_session()
         try:
-            # Convert date to datetime for comparison
-            from datetime import datetime
-            if isinstance(date, str):
-                date = datetime.strptime(date, '%Y-%m-%d').date()
-            
-            # Query notes where the date part matches
-            from sqlalchemy import func
+            # Query notes stored within the day
+            day_start, day_end = _day_bounds(date)
             note = session.query(Note).filter(
-                func.date(Note.date) == date
+                Note.date >= day_start,
+                Note.date < day_end
             ).first()
             
             if note:
@@ -221,15 +668,11 @@ class DatabaseManager:
         """Get note for a specific date."""
         session = self.get_session()
         try:
-            # Convert date to datetime for comparison
-            from datetime import datetime
-            if isinstance(date, str):
-                date = datetime.strptime(date, '%Y-%m-%d').date()
-            
-            # Query notes where the date part matches, get the most recent one
-            from sqlalchemy import func
+            # Query notes stored within the day, get the most recent one
+            day_start, day_end = _day_bounds(date)
             note = session.query(Note).filter(
-                func.date(Note.date) == date
+                Note.date >= day_start,
+                Note.date < day_end
             ).order_by(Note.updated_at.desc()).first()
             return note
         except SQLAlchemyError as e:
@@ -242,15 +685,11 @@ class DatabaseManager:
         """Get all notes for a specific date."""
         session = self.get_session()
         try:
-            # Convert date to datetime for comparison
-            from datetime import datetime
-            if isinstance(date, str):
-                date = datetime.strptime(date, '%Y-%m-%d').date()
-            
-            # Query all notes where the date part matches
-            from sqlalchemy import func
+            # Query all notes stored within the day
+            day_start, day_end = _day_bounds(date)
             notes = session.query(Note).filter(
-                func.date(Note.date) == date
+                Note.date >= day_start,
+                Note.date < day_end
             ).order_by(Note.created_at.desc()).all()
             return notes
         except SQLAlchemyError as e:
@@ -259,6 +698,22 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def get_note_counts(self, start_date, end_date):
+        """Get the number of notes per day within a date range."""
+        session = self.get_session()
+        try:
+            day = func.date(Note.date)
+            rows = session.query(day, func.count(Note.id)).filter(
+                Note.date >= start_date,
+                Note.date < end_date
+            ).group_by(day).all()
+            return {note_day: count for note_day, count in rows}
+        except SQLAlchemyError as e:
+            print(f"Error getting note counts: {e}")
+            return {}
+        finally:
+            session.close()
+    
     def update_note_by_id(self, note_id, content):
         """Update a note by its ID."""
         session = self.get_session()
@@ -276,7 +731,7 @@ class DatabaseManager:
             return None
         finally:
             session.close()
-
+    
     def delete_note_by_id(self, note_id):
         """Delete a note by its ID."""
         session = self.get_session()
@@ -294,6 +749,58 @@ class DatabaseManager:
         finally:
             session.close()
     
+    # Paginated listing
+    def list_events(self, after=None, limit=50, start_date=None, end_date=None):
+        """Get one page of events ordered by (start_time, id).
+
+        after is the (start_time, id) key of the last row on the previous
+        page. Returns lightweight row tuples rather than Event objects.
+        """
+        columns = (
+            Event.id, Event.title, Event.description, Event.start_time,
+            Event.end_time, Event.category, Event.recurrence, Event.timezone
+        )
+        filters = []
+        if start_date:
+            filters.append(Event.start_time >= start_date)
+        if end_date:
+            filters.append(Event.start_time < end_date)
+        return self._keyset_page(columns, Event.start_time, Event.id, after, limit, filters)
+    
+    def list_notes(self, after=None, limit=50, start_date=None, end_date=None):
+        """Get one page of notes ordered by (date, id) as row tuples."""
+        columns = (Note.id, Note.date, Note.content, Note.created_at, Note.updated_at)
+        filters = []
+        if start_date:
+            filters.append(Note.date >= start_date)
+        if end_date:
+            filters.append(Note.date < end_date)
+        return self._keyset_page(columns, Note.date, Note.id, after, limit, filters)
+    
+    def _keyset_page(self, columns, sort_column, id_column, after, limit, filters):
+        """Get the rows following the key `after` in (sort_column, id) order.
+
+        The seek is an index range scan whatever the page depth, unlike
+        OFFSET, which reads and discards every skipped row.
+        """
+        session = self.get_session()
+        try:
+            statement = select(*columns).where(*filters)
+            if after is not None:
+                sort_value, last_id = after
+                # The >= bound gives SQLite an index seek; the OR breaks ties on id
+                statement = statement.where(
+                    sort_column >= sort_value,
+                    or_(sort_column > sort_value, id_column > last_id)
+                )
+            statement = statement.order_by(sort_column, id_column).limit(limit)
+            return session.execute(statement).all()
+        except SQLAlchemyError as e:
+            print(f"Error listing rows: {e}")
+            return None
+        finally:
+            session.close()
+    
     # Settings operations
     def get_setting(self, key, default=None):
         """Get a setting value."""
@@ -307,6 +814,42 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def get_all_settings(self):
+        """Get every stored setting as a dictionary in one query."""
+        session = self.get_session()
+        try:
+            return dict(session.query(Setting.key, Setting.value).all())
+        except SQLAlchemyError as e:
+            print(f"Error getting settings: {e}")
+            return {}
+        finally:
+            session.close()
+    
+    def set_settings(self, values):
+        """Set several settings in one transaction with a batched upsert."""
+        if not values:
+            return True
+        session = self.get_session()
+        try:
+            now = datetime.utcnow()
+            statement = sqlite_insert(Setting)
+            statement = statement.on_conflict_do_update(
+                index_elements=[Setting.key],
+                set_={'value': statement.excluded.value, 'updated_at': statement.excluded.updated_at}
+            )
+            session.execute(statement, [
+                {'key': key, 'value': value, 'created_at': now, 'updated_at': now}
+                for key, value in values.items()
+            ])
+            session.commit()
+            return True
+        except SQLAlchemyError as e:
+            session.rollback()
+            print(f"Error setting settings: {e}")
+            return False
+        finally:
+            session.close()
+    
     def set_setting(self, key, value):
         """Set a setting value."""
         session = self.get_session()
@@ -326,4 +869,232 @@ class DatabaseManager:
             return False
         finally:
             session.close()
+    
+    
+    # Bulk operations
+    def bulk_insert_events(self, rows):
+        """Insert a chunk of event rows in one transaction with a batched executemany.
+
+        Runs on its own connection, outside any unit of work, so every chunk
+        commits on its own. Returns the number of rows inserted, or None.
+        """
+        return self._bulk_insert(Event, rows, on_insert=lambda conn: self._add_occupancy(conn, [
+            (row['start_time'], row.get('end_time')) for row in rows if not row.get('recurrence')
+        ]))
+    
+    def bulk_insert_notes(self, rows):
+        """Insert a chunk of note rows in one transaction with a batched executemany."""
+        return self._bulk_insert(Note, rows)
+    
+    def _bulk_insert(self, model, rows, on_insert=None):
+        """Insert rows into a model's table in a single transaction.
+
+        on_insert(conn) runs in the same transaction to update derived tables.
+        """
+        if not rows:
+            return 0
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(model.__table__), rows)
+                if on_insert is not None:
+                    on_insert(conn)
+            return len(rows)
+        except SQLAlchemyError as e:
+            print(f"Error bulk inserting into {model.__tablename__}: {e}")
+            return None
+    
+    def iter_events(self, batch_size=1000):
+        """Stream all events as lightweight rows ordered by start time.
+
+        Rows are fetched lazily in batches on a dedicated connection, which
+        stays open until the generator is exhausted or closed.
+        """
+        table = Event.__table__
+        yield from self._iter_rows(select(table).order_by(table.c.start_time, table.c.id), batch_size)
+    
+    def iter_notes(self, batch_size=1000):
+        """Stream all notes as lightweight rows ordered by date."""
+        table = Note.__table__
+        yield from self._iter_rows(select(table).order_by(table.c.date, table.c.id), batch_size)
+    
+    def get_event_timezone_spans(self):
+        """Get {timezone: (first start, last end, has recurring events)} over all events.
+
+        Times are naive UTC; an iCalendar export uses these to define each
+        zone before streaming the events.
+        """
+        session = self.get_session()
+        try:
+            rows = session.query(
+                Event.timezone,
+                func.min(Event.start_time),
+                func.max(func.coalesce(Event.end_time, Event.start_time)),
+                func.max(Event.recurrence.isnot(None))
+            ).group_by(Event.timezone).all()
+            return {
+                timezone_name: (first_start, last_end, bool(recurring))
+                for timezone_name, first_start, last_end, recurring in rows
+            }
+        except SQLAlchemyError as e:
+            print(f"Error getting event timezones: {e}")
+            return {}
+        finally:
+            session.close()
+    
+    def _iter_rows(self, statement, batch_size):
+        """Stream the rows of a Core statement without buffering the result."""
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(statement)
+            yield from result
+    
+    # Holiday operations
+    def store_holidays(self, country, subdivision, year, holidays):
+        """Replace the stored holidays of a country/subdivision for one year."""
+        session = self.get_session()
+        subdivision = subdivision or ''
+        try:
+            session.query(Holiday).filter(
+                Holiday.country == country,
+                Holiday.subdivision == subdivision,
+                Holiday.date >= date(year, 1, 1),
+                Holiday.date < date(year + 1, 1, 1)
+            ).delete(synchronize_session=False)
+            session.query(HolidayYear).filter(
+                HolidayYear.country == country,
+                HolidayYear.subdivision == subdivision,
+                HolidayYear.year == year
+            ).delete(synchronize_session=False)
+            
+            session.add(HolidayYear(country=country, subdivision=subdivision, year=year))
+            session.add_all([
+                Holiday(country=country, subdivision=subdivision, date=holiday_date, name=name)
+                for holiday_date, name in holidays.items()
+            ])
+            session.commit()
+            return True
+        except SQLAlchemyError as e:
+            session.rollback()
+            print(f"Error storing holidays: {e}")
+            return False
+        finally:
+            session.close()
+    
+    def get_stored_holidays(self, country, subdivision, year):
+        """Get stored holidays of a country/subdivision for one year.
 
+        Returns None when the year has not been precomputed, so callers can
+        tell it apart from a year without holidays.
+        """
+        session = self.get_session()
+        subdivision = subdivision or ''
+        try:
+            # One indexed read: the coverage row joined to that year's holidays
+            rows = session.query(HolidayYear.id, Holiday.date, Holiday.name).outerjoin(
+                Holiday, and_(
+                    Holiday.country == HolidayYear.country,
+                    Holiday.subdivision == HolidayYear.subdivision,
+                    Holiday.date >= date(year, 1, 1),
+                    Holiday.date < date(year + 1, 1, 1)
+                )
+            ).filter(
+                HolidayYear.country == country,
+                HolidayYear.subdivision == subdivision,
+                HolidayYear.year == year
+            ).order_by(Holiday.date).all()
+            if not rows:
+                return None
+            return {holiday_date: name for _, holiday_date, name in rows if holiday_date is not None}
+        except SQLAlchemyError as e:
+            print(f"Error getting stored holidays: {e}")
+            return None
+        finally:
+            session.close()
+    
+    # Search operations
+    def search(self, terms, start_date=None, end_date=None, kinds=('event', 'note'), limit=20, offset=0):
+        """Full-text search over event titles/descriptions and note content.
+
+        Returns result dicts ranked by BM25, best first, with event title
+        matches weighted above description matches. Events are filtered
+        to those overlapping [start_date, end_date), notes to those dated
+        within it. Returns None if the search index is unavailable.
+        """
+        query = _search_query(terms)
+        if query is None:
+            return []
+        if not self.has_search_index:
+            return None
+        
+        selects = []
+        if 'event' in kinds:
+            conditions = ["events_fts MATCH :query"]
+            if start_date:
+                conditions.append("(e.start_time >= :start_date OR e.end_time > :start_date)")
+            if end_date:
+                conditions.append("e.start_time < :end_date")
+            selects.append(
+                "SELECT 'event' AS type, e.id AS id, e.title AS title, "
+                "snippet(events_fts, -1, '', '', '...', 16) AS snippet, "
+                "e.start_time AS start_time, e.end_time AS end_time, "
+                "bm25(events_fts, 10.0, 1.0) AS score "
+                "FROM events_fts JOIN events e ON e.id = events_fts.rowid "
+                f"WHERE {' AND '.join(conditions)}"
+            )
+        if 'note' in kinds:
+            conditions = ["notes_fts MATCH :query"]
+            if start_date:
+                conditions.append("n.date >= :start_date")
+            if end_date:
+                conditions.append("n.date < :end_date")
+            selects.append(
+                "SELECT 'note' AS type, n.id AS id, NULL AS title, "
+                "snippet(notes_fts, 0, '', '', '...', 16) AS snippet, "
+                "n.date AS start_time, NULL AS end_time, "
+                "bm25(notes_fts) AS score "
+                "FROM notes_fts JOIN notes n ON n.id = notes_fts.rowid "
+                f"WHERE {' AND '.join(conditions)}"
+            )
+        if not selects:
+            return []
+        
+        # Bind the date bounds as DateTime so they compare like stored values
+        bounds = [
+            bindparam(name, value, type_=DateTime)
+            for name, value in (('start_date', start_date), ('end_date', end_date)) if value
+        ]
+        statement = text(
+            ' UNION ALL '.join(selects) + " ORDER BY score, start_time, id LIMIT :limit OFFSET :offset"
+        ).bindparams(*bounds).columns(
+            column('type'), column('id'), column('title'), column('snippet'),
+            column('start_time', DateTime), column('end_time', DateTime), column('score')
+        )
+        params = {'query': query, 'limit': limit, 'offset': offset}
+        
+        session = self.get_session()
+        try:
+            return [dict(row._mapping) for row in session.execute(statement, params)]
+        except SQLAlchemyError as e:
+            print(f"Error searching: {e}")
+            return None
+        finally:
+            session.close()
+    
+    def optimize_search_index(self, full=False):
+        """Merge the search index's b-tree segments, or rebuild it from scratch.
+
+        The incremental merge does a bounded amount of work per call, so it
+        can run while the app is serving requests.
+        """
+        if not self.has_search_index:
+            return False
+        try:
+            with self.engine.begin() as conn:
+                for fts_table in ('events_fts', 'notes_fts'):
+                    if full:
+                        conn.execute(text(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')"))
+                    else:
+                        conn.execute(text(f"INSERT INTO {fts_table} ({fts_table}, rank) VALUES ('merge', 500)"))
+            return True
+        except SQLAlchemyError as e:
+            print(f"Error optimizing search index: {e}")
+            return False
@@ -3,7 +3,7 @@ Database models for the Calendar App.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Boolean, ForeignKey, Index, UniqueConstraint, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -17,16 +17,24 @@ class Event(Base):
     id = Column(Integer, primary_key=True)
     title = Column(String(200), nullable=False)
     description = Column(Text)
-    start_time = Column(DateTime, nullable=False)
+    start_time = Column(DateTime, nullable=False, index=True)
     end_time = Column(DateTime)
     category = Column(String(50), default='General')
     recurrence = Column(String(50))  # 'daily', 'weekly', 'monthly', 'yearly', None
+    # start_time/end_time are naive UTC; this is the IANA zone the event was
+    # scheduled in, which recurrences follow across DST changes
+    timezone = Column(String(64), nullable=False, default='UTC', server_default='UTC')
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # For future cloud sync
     sync_status = Column(String(20), default='local')
-    last_modified = Column(DateTime, default=datetime.utcnow)
+    last_modified = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    
+    __table_args__ = (
+        # Finds recurring series without scanning one-off events
+        Index('ix_events_recurring_start', 'start_time', sqlite_where=text('recurrence IS NOT NULL')),
+    )
 
 
 class Note(Base):
@@ -34,7 +42,7 @@ class Note(Base):
     __tablename__ = 'notes'
     
     id = Column(Integer, primary_key=True)
-    date = Column(DateTime, nullable=False)
+    date = Column(DateTime, nullable=False, index=True)
     content = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -54,3 +62,44 @@ class Setting(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+
+
+class EventDay(Base):
+    """Per-day occupancy of one-off events, maintained on event writes."""
+    __tablename__ = 'event_days'
+    
+    day = Column(Date, primary_key=True)
+    event_count = Column(Integer, nullable=False, default=0)
+    first_start = Column(DateTime, nullable=False)
+    last_end = Column(DateTime, nullable=False)
+    busy_minutes = Column(Integer, nullable=False, default=0)
+
+
+class Holiday(Base):
+    """Precomputed holiday for a country (and optional subdivision)."""
+    __tablename__ = 'holidays'
+    
+    id = Column(Integer, primary_key=True)
+    country = Column(String(10), nullable=False)
+    subdivision = Column(String(10), nullable=False, default='')
+    date = Column(Date, nullable=False)
+    name = Column(String(200), nullable=False)
+    
+    __table_args__ = (
+        Index('ix_holidays_country_date', 'country', 'subdivision', 'date'),
+    )
+
+
+class HolidayYear(Base):
+    """Country/year combinations materialized into the holidays table."""
+    __tablename__ = 'holiday_years'
+    
+    id = Column(Integer, primary_key=True)
+    country = Column(String(10), nullable=False)
+    subdivision = Column(String(10), nullable=False, default='')
+    year = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('country', 'subdivision', 'year'),
+    )
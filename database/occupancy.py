@@ -0,0 +1,53 @@
+"""
+Per-day occupancy of events for the Calendar App.
+"""
+
+from datetime import datetime, time, timedelta
+
+
+def day_segments(start_time, end_time=None, first_day=None, end_day=None):
+    """Yield (day, segment_start, segment_end) for each day an event covers.
+
+    Events without an end, or ending at their start, are instants on their
+    start day. The end is exclusive, so an event ending at midnight does
+    not touch the next day. Days are clipped to [first_day, end_day).
+    """
+    if end_time is None or end_time <= start_time:
+        day = start_time.date()
+        if (first_day is None or day >= first_day) and (end_day is None or day < end_day):
+            yield day, start_time, start_time
+        return
+
+    day = start_time.date()
+    if first_day is not None and day < first_day:
+        day = first_day
+    while end_day is None or day < end_day:
+        day_start = datetime.combine(day, time.min)
+        if day_start >= end_time:
+            break
+        yield day, max(start_time, day_start), min(end_time, day_start + timedelta(days=1))
+        day += timedelta(days=1)
+
+
+def add_occupancy(days, start_time, end_time=None, first_day=None, end_day=None):
+    """Add one event to a {day: occupancy} map, clipped to [first_day, end_day).
+
+    Each occupancy dict holds event_count, first_start, last_end and
+    busy_minutes, the booked minutes that day (overlapping events each count).
+    """
+    for day, segment_start, segment_end in day_segments(start_time, end_time, first_day, end_day):
+        minutes = int((segment_end - segment_start).total_seconds() // 60)
+        entry = days.get(day)
+        if entry is None:
+            days[day] = {
+                'event_count': 1,
+                'first_start': segment_start,
+                'last_end': segment_end,
+                'busy_minutes': minutes,
+            }
+        else:
+            entry['event_count'] += 1
+            entry['first_start'] = min(entry['first_start'], segment_start)
+            entry['last_end'] = max(entry['last_end'], segment_end)
+            entry['busy_minutes'] += minutes
+    return days
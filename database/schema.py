@@ -0,0 +1,258 @@
+"""
+Schema migrations for the Calendar App.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from .models import Base
+
+# Version of the schema migrate_schema() produces, stored in SQLite's
+# user_version header field. Bump it with every change to the models or to
+# migrate_schema(), so existing databases are upgraded on their next start.
+SCHEMA_VERSION = 4
+
+# Coordinate range of the rtree_i32 interval index. Epoch minutes leave it
+# after about year 6053; such times are clamped to the bounds, so their
+# rows stay candidates for every window that reaches past them.
+INTERVAL_MIN_MINUTE = -2 ** 31
+INTERVAL_MAX_MINUTE = 2 ** 31 - 1
+
+def _epoch_minutes(column):
+    """Get the SQL for the epoch minute of a stored DateTime."""
+    return f"CAST(strftime('%s', {column}) AS INTEGER) / 60"
+
+
+def _clamp_minutes(value):
+    """Get the SQL clamping an epoch minute to the interval index's range."""
+    return f"MIN(MAX({value}, {INTERVAL_MIN_MINUTE}), {INTERVAL_MAX_MINUTE})"
+
+
+def _interval_values(prefix):
+    """Get the (id, start_min, end_min) SQL values for an events row.
+
+    Bounds are widened by one minute on each side so truncation never
+    excludes a row; callers refine candidates with exact predicates.
+    """
+    start = _epoch_minutes(f"{prefix}start_time")
+    end = _epoch_minutes(f"COALESCE({prefix}end_time, {prefix}start_time)")
+    return f"{prefix}id, {_clamp_minutes(f'{start} - 1')}, {_clamp_minutes(f'MAX({start}, {end}) + 1')}"
+
+
+# Dropped first, replacing triggers by older versions that did not clamp
+EVENT_INTERVAL_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS events_interval_insert",
+    "DROP TRIGGER IF EXISTS events_interval_update",
+    "DROP TRIGGER IF EXISTS events_interval_delete",
+    f"""
+    CREATE TRIGGER events_interval_insert AFTER INSERT ON events
+    BEGIN
+        INSERT INTO event_intervals (id, start_min, end_min)
+        VALUES ({_interval_values('NEW.')});
+    END
+    """,
+    f"""
+    CREATE TRIGGER events_interval_update
+    AFTER UPDATE OF start_time, end_time ON events
+    BEGIN
+        DELETE FROM event_intervals WHERE id = OLD.id;
+        INSERT INTO event_intervals (id, start_min, end_min)
+        VALUES ({_interval_values('NEW.')});
+    END
+    """,
+    """
+    CREATE TRIGGER events_interval_delete AFTER DELETE ON events
+    BEGIN
+        DELETE FROM event_intervals WHERE id = OLD.id;
+    END
+    """,
+]
+
+
+# Change counters and times bumped by triggers on every write, so clients
+# can cheaply tell whether and when a table last changed (deletes included)
+# without reading its rows. changed_at is NULL until the first write.
+VERSIONED_TABLES = ('events', 'settings')
+
+TABLE_VERSION_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS table_versions (
+        name VARCHAR(50) PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0,
+        changed_at DATETIME
+    )
+    """,
+] + [
+    f"INSERT OR IGNORE INTO table_versions (name, version) VALUES ('{table}', 0)"
+    for table in VERSIONED_TABLES
+] + [
+    statement
+    for table in VERSIONED_TABLES
+    for operation in ('INSERT', 'UPDATE', 'DELETE')
+    for statement in (
+        # Replaces triggers created by older versions, which set no time
+        f"DROP TRIGGER IF EXISTS {table}_version_{operation.lower()}",
+        f"""
+        CREATE TRIGGER {table}_version_{operation.lower()} AFTER {operation} ON {table}
+        BEGIN
+            UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP
+            WHERE name = '{table}';
+        END
+        """,
+    )
+]
+
+
+# Full-text indexes over the events and notes tables. They are external
+# content tables, so the text lives only in the base tables, and
+# triggers apply every write to the index incrementally.
+SEARCH_INDEXES = {
+    'events_fts': ('events', ['title', 'description']),
+    'notes_fts': ('notes', ['content']),
+}
+
+
+def _search_triggers(fts_table, table, columns):
+    """Get the triggers that keep a full-text index in sync with its table."""
+    names = ', '.join(columns)
+    new_values = ', '.join(f"NEW.{name}" for name in columns)
+    old_values = ', '.join(f"OLD.{name}" for name in columns)
+    delete_old = (
+        f"INSERT INTO {fts_table} ({fts_table}, rowid, {names}) "
+        f"VALUES ('delete', OLD.id, {old_values});"
+    )
+    insert_new = f"INSERT INTO {fts_table} (rowid, {names}) VALUES (NEW.id, {new_values});"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_insert AFTER INSERT ON {table} "
+        f"BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_update AFTER UPDATE OF {names} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_delete AFTER DELETE ON {table} "
+        f"BEGIN {delete_old} END",
+    ]
+
+
+# Columns added to existing tables after their first release
+ADDED_COLUMNS = {
+    # Times stored before this column existed are taken as UTC
+    'events': {'timezone': "VARCHAR(64) NOT NULL DEFAULT 'UTC'"},
+    'table_versions': {'changed_at': "DATETIME"},
+}
+
+
+def _add_missing_columns(conn):
+    """Add columns that tables created by older versions lack."""
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+        if not existing:
+            continue  # Not created yet; it will be created with every column
+        for name, definition in columns.items():
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {definition}"))
+
+
+def migrate_schema(engine):
+    """Bring tables created by older versions up to date with the models.
+
+    create_all() only creates missing tables, so indexes added to a model
+    later are never created on an existing database. Every step here is
+    idempotent and safe to run on each start.
+    """
+    with engine.begin() as conn:
+        _add_missing_columns(conn)
+    
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    
+    with engine.begin() as conn:
+        _create_event_interval_index(conn)
+        for statement in TABLE_VERSION_DDL:
+            conn.execute(text(statement))
+        _create_search_indexes(conn)
+
+
+def get_schema_version(engine):
+    """Get the schema version stored in the database; 0 if never set."""
+    with engine.connect() as conn:
+        return conn.execute(text("PRAGMA user_version")).scalar()
+
+
+def set_schema_version(engine, version=SCHEMA_VERSION):
+    """Record that the database is up to date with a schema version."""
+    with engine.begin() as conn:
+        conn.execute(text(f"PRAGMA user_version = {int(version)}"))
+
+
+def _table_exists(conn, name):
+    """Check whether a table (including virtual tables) exists."""
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': name}
+    ).first() is not None
+
+
+def _create_event_interval_index(conn):
+    """Create the R*Tree over event time spans and its sync triggers.
+
+    The index stores each event as [start_min, end_min] in epoch minutes,
+    so overlap queries against a window become an R*Tree range search
+    instead of a scan over end_time. Triggers keep it in sync with every
+    write to the events table, including bulk inserts.
+    """
+    if _table_exists(conn, 'event_intervals'):
+        # Refilled, as older versions stored times past the index's range wrapped around
+        conn.execute(text("DELETE FROM event_intervals"))
+    else:
+        try:
+            conn.execute(text(
+                "CREATE VIRTUAL TABLE event_intervals "
+                "USING rtree_i32(id, start_min, end_min)"
+            ))
+        except OperationalError:
+            # SQLite built without the R*Tree module
+            return
+    conn.execute(text(
+        f"INSERT INTO event_intervals (id, start_min, end_min) "
+        f"SELECT {_interval_values('')} FROM events"
+    ))
+    
+    for trigger in EVENT_INTERVAL_TRIGGERS:
+        conn.execute(text(trigger))
+
+
+def _create_search_indexes(conn):
+    """Create the FTS5 search indexes and their sync triggers.
+
+    A new index is filled from its table once; afterwards the triggers
+    keep it current.
+    """
+    for fts_table, (table, columns) in SEARCH_INDEXES.items():
+        if not _table_exists(conn, fts_table):
+            try:
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE {fts_table} USING fts5("
+                    f"{', '.join(columns)}, content='{table}', content_rowid='id', "
+                    f"tokenize='unicode61 remove_diacritics 2', "
+                    # Short prefix queries read a prefix index instead of expanding every term
+                    f"prefix='2 3')"
+                ))
+            except OperationalError:
+                # SQLite built without FTS5
+                return
+            conn.execute(text(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')"))
+        
+        for trigger in _search_triggers(fts_table, table, columns):
+            conn.execute(text(trigger))
+
+
+def has_search_index(engine):
+    """Check whether the full-text search indexes are available."""
+    with engine.connect() as conn:
+        return all(_table_exists(conn, fts_table) for fts_table in SEARCH_INDEXES)
+
+
+def has_event_interval_index(engine):
+    """Check whether the event interval index is available."""
+    with engine.connect() as conn:
+        return _table_exists(conn, 'event_intervals')
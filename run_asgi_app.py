@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Calendar Web App ASGI Launcher
+Serves asgi_app.py with uvicorn; see README.md for how it compares
+with the threaded server
+
+Runs a single process; concurrency comes from the event loop and the
+Flask thread pool. The in-process caches are validated against change
+counters in the database, so several processes may also share one
+database.
+
+Usage:
+    python run_asgi_app.py
+    python run_asgi_app.py --host 127.0.0.1 --port 8000
+"""
+
+import argparse
+
+import uvicorn
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--backlog', type=int, default=2048, help='Pending connections the socket queues')
+    parser.add_argument('--log-level', default='warning')
+    args = parser.parse_args()
+    
+    uvicorn.run(
+        'asgi_app:app',
+        host=args.host,
+        port=args.port,
+        backlog=args.backlog,
+        lifespan='on',
+        access_log=False,
+        log_level=args.log_level,
+    )
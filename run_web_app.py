@@ -7,7 +7,7 @@ Starts the Flask web application
 import webbrowser
 import time
 import threading
-from web_app import app
+from web_app import create_app
 
 def open_browser():
     """Open browser after a short delay."""
@@ -30,4 +30,5 @@ if __name__ == '__main__':
     browser_thread.start()
     
     # Start Flask app
+    app = create_app(prewarm_holidays=True)
     app.run(debug=False, host='0.0.0.0', port=5000)
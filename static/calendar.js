@@ -11,6 +11,7 @@ let currentMonth = currentDate.getMonth();
 let currentYear = currentDate.getFullYear();
 let events = {};
 let holidays = {};
+let noteCounts = {};
 
 function showSuccessMessage(message) {
     const successMessage = document.getElementById('success-message');
@@ -45,8 +46,7 @@ document.addEventListener('DOMContentLoaded', function() {
     populateYearSelector();
     updateMonthYearSelectors();
     updateCalendar();
-    loadEvents();
-    loadHolidays();
+    loadMonthData();
     
     // Set today's date in forms
     const today = new Date().toISOString().split('T')[0];
@@ -121,6 +121,11 @@ function updateCalendar() {
 }
 
 function createDayElement(day, month, year, isOtherMonth) {
+    // Normalize adjacent-month cells (month -1 or 12) to a real year/month
+    const cellDate = new Date(year, month, day);
+    year = cellDate.getFullYear();
+    month = cellDate.getMonth();
+    
     const dayElement = document.createElement('div');
     dayElement.className = 'calendar-day';
     
@@ -173,8 +178,15 @@ function createDayElement(day, month, year, isOtherMonth) {
         });
     }
     
-    // Check for notes
-    checkAndDisplayNoteIndicator(dayElement, dateKey);
+    // Add note indicator from the month's note counts
+    if (noteCounts[dateKey]) {
+        dayElement.classList.add('has-note');
+        const noteIndicator = document.createElement('div');
+        noteIndicator.className = 'note-indicator';
+        noteIndicator.textContent = 'N';
+        noteIndicator.title = `Has ${noteCounts[dateKey]} note(s)`;
+        dayElement.appendChild(noteIndicator);
+    }
     
     // Add click event
     dayElement.addEventListener('click', function() {
@@ -184,22 +196,6 @@ function createDayElement(day, month, year, isOtherMonth) {
     return dayElement;
 }
 
-function checkAndDisplayNoteIndicator(dayElement, dateKey) {
-    fetch(`/api/notes?date=${dateKey}`)
-        .then(response => response.json())
-        .then(data => {
-            if (data.notes && data.notes.length > 0) {
-                dayElement.classList.add('has-note');
-                const noteIndicator = document.createElement('div');
-                noteIndicator.className = 'note-indicator';
-                noteIndicator.textContent = 'N';
-                noteIndicator.title = `Has ${data.notes.length} note(s)`;
-                dayElement.appendChild(noteIndicator);
-            }
-        })
-        .catch(error => console.error('Error checking note:', error));
-}
-
 function previousMonth() {
     currentMonth--;
     if (currentMonth < 0) {
@@ -207,8 +203,7 @@ function previousMonth() {
         currentYear--;
     }
     updateCalendar();
-    loadEvents();
-    loadHolidays();
+    loadMonthData();
     updateMonthYearSelectors();
 }
 
@@ -219,8 +214,7 @@ function nextMonth() {
         currentYear++;
     }
     updateCalendar();
-    loadEvents();
-    loadHolidays();
+    loadMonthData();
     updateMonthYearSelectors();
 }
 
@@ -228,16 +222,14 @@ function changeMonth() {
     const monthSelector = document.getElementById('month-selector');
     currentMonth = parseInt(monthSelector.value);
     updateCalendar();
-    loadEvents();
-    loadHolidays();
+    loadMonthData();
 }
 
 function changeYear() {
     const yearSelector = document.getElementById('year-selector');
     currentYear = parseInt(yearSelector.value);
     updateCalendar();
-    loadEvents();
-    loadHolidays();
+    loadMonthData();
 }
 
 function updateMonthYearSelectors() {
@@ -287,59 +279,111 @@ function selectDate(year, month, day) {
     updateEventDetailsAndNotesDisplay(dateStr);
 }
 
-function loadEvents() {
-    console.log('Loading events for:', currentYear, currentMonth + 1);
-    fetch(`/api/events?year=${currentYear}&month=${currentMonth + 1}`)
+function loadMonthData(selectedDate) {
+    // One request returns events, note counts and holidays for the whole visible grid
+    const year = currentYear;
+    const month = currentMonth;
+    console.log('Loading month data for:', year, month + 1);
+    fetch(`/api/month/${year}/${month + 1}?countries=US&countries=DE&format=columnar`)
         .then(response => response.json())
         .then(data => {
-            console.log('Events data received:', data);
-            events = {};
-            data.forEach(event => {
-                const dateKey = event.start_date.split('T')[0];
-                if (!events[dateKey]) {
-                    events[dateKey] = [];
-                }
-                events[dateKey].push(event);
-            });
-            console.log('Events processed:', events);
-            updateCalendar();
-        })
-        .catch(error => console.error('Error loading events:', error));
-}
-
-function loadEventsAndUpdate(eventDate) {
-    console.log('Loading events and updating for:', currentYear, currentMonth + 1);
-    fetch(`/api/events?year=${currentYear}&month=${currentMonth + 1}`)
-        .then(response => response.json())
-        .then(data => {
-            console.log('Events data received:', data);
-            events = {};
-            data.forEach(event => {
-                const dateKey = event.start_date.split('T')[0];
-                if (!events[dateKey]) {
-                    events[dateKey] = [];
-                }
-                events[dateKey].push(event);
-            });
-            console.log('Events processed:', events);
+            // Ignore responses for a month the user already navigated away from
+            if (year !== currentYear || month !== currentMonth) {
+                return;
+            }
+            events = bucketColumnarEvents(data.events, data.start, data.end);
+            holidays = data.holidays;
+            noteCounts = data.notes;
             // Update calendar first
             updateCalendar();
             // Then update the combined display if we have a specific date
-            if (eventDate) {
-                updateEventDetailsAndNotesDisplay(eventDate);
+            if (selectedDate) {
+                updateEventDetailsAndNotesDisplay(selectedDate);
             }
         })
-        .catch(error => console.error('Error loading events:', error));
+        .catch(error => console.error('Error loading month data:', error));
 }
 
-function loadHolidays() {
-    fetch(`/api/holidays?year=${currentYear}&month=${currentMonth + 1}&countries=US&countries=DE`)
-        .then(response => response.json())
-        .then(data => {
-            holidays = data;
-            updateCalendar();
-        })
-        .catch(error => console.error('Error loading holidays:', error));
+const MINUTES_PER_DAY = 1440;
+
+// Get the UTC offset in effect at an epoch minute from a columnar response's
+// [epoch minute, offset minutes] pairs
+function offsetAt(offsets, minutes) {
+    let offset = offsets.length ? offsets[0][1] : 0;
+    for (const [since, value] of offsets) {
+        if (since > minutes) {
+            break;
+        }
+        offset = value;
+    }
+    return offset;
+}
+
+// Format an epoch minute as local ISO time with its offset, as the JSON format does
+function formatEpochMinutes(minutes, offsets) {
+    const offset = offsetAt(offsets, minutes);
+    const local = new Date((minutes + offset) * 60000).toISOString().slice(0, 19);
+    const hours = String(Math.floor(Math.abs(offset) / 60)).padStart(2, '0');
+    const mins = String(Math.abs(offset) % 60).padStart(2, '0');
+    return `${local}${offset < 0 ? '-' : '+'}${hours}:${mins}`;
+}
+
+// Events decoded from ?format=columnar share these getters, so the ISO
+// strings are only built for the events a user opens
+const columnarEventPrototype = {
+    get start_date() {
+        return formatEpochMinutes(this.columns.start[this.index], this.columns.offsets);
+    },
+    get end_date() {
+        return formatEpochMinutes(this.columns.end[this.index], this.columns.offsets);
+    },
+    get series_start_date() {
+        const seriesStart = this.columns.series_start[this.index];
+        return seriesStart === null ? undefined : formatEpochMinutes(seriesStart, this.columns.offsets);
+    }
+};
+
+// Decode a columnar event list (see utils/columnar.py) into events keyed by
+// every grid day they cover (multi-day events span several cells)
+function bucketColumnarEvents(columns, gridStart, gridEnd) {
+    const firstGridDay = Date.parse(`${gridStart}T00:00:00Z`) / 60000 / MINUTES_PER_DAY;
+    const endGridDay = Date.parse(`${gridEnd}T00:00:00Z`) / 60000 / MINUTES_PER_DAY;
+    const dayKeys = [];
+    for (let day = firstGridDay; day < endGridDay; day++) {
+        dayKeys.push(new Date(day * MINUTES_PER_DAY * 60000).toISOString().split('T')[0]);
+    }
+    
+    const buckets = {};
+    for (let i = 0; i < columns.count; i++) {
+        const event = Object.create(columnarEventPrototype);
+        Object.assign(event, {
+            columns: columns,
+            index: i,
+            id: columns.id[i],
+            title: columns.title[i],
+            description: columns.description[i],
+            category: columns.categories[columns.category[i]],
+            recurrence: columns.recurrences[columns.recurrence[i]],
+            timezone: columns.timezones[columns.timezone[i]]
+        });
+        
+        const start = columns.start[i] + offsetAt(columns.offsets, columns.start[i]);
+        const end = columns.end[i] + offsetAt(columns.offsets, columns.end[i]);
+        const startDay = Math.floor(start / MINUTES_PER_DAY);
+        let lastDay = Math.floor(end / MINUTES_PER_DAY);
+        // An event ending exactly at midnight does not occupy that day
+        if (lastDay > startDay && end === lastDay * MINUTES_PER_DAY) {
+            lastDay--;
+        }
+        for (let day = Math.max(startDay, firstGridDay); day <= lastDay && day < endGridDay; day++) {
+            const dateKey = dayKeys[day - firstGridDay];
+            if (!buckets[dateKey]) {
+                buckets[dateKey] = [];
+            }
+            buckets[dateKey].push(event);
+        }
+    }
+    return buckets;
 }
 
 function saveEvent() {
@@ -370,7 +414,7 @@ function saveEvent() {
             // Set the date back after reset
             document.getElementById('event-date').value = eventDate;
             // Reload events first, then update everything
-            loadEventsAndUpdate(eventDate);
+            loadMonthData(eventDate);
         } else {
             showErrorMessage('Error saving event: ' + data.error);
         }
@@ -529,7 +573,7 @@ function saveNote() {
             // Update the combined display
             updateEventDetailsAndNotesDisplay(noteDate);
             // Also refresh the calendar to show any visual indicators
-            updateCalendar();
+            loadMonthData();
         } else {
             showErrorMessage('Error saving note: ' + data.error);
         }
@@ -585,7 +629,7 @@ function saveNewNote() {
             // Update the combined display
             updateEventDetailsAndNotesDisplay(noteDate);
             // Also refresh the calendar to show any visual indicators
-            updateCalendar();
+            loadMonthData();
         } else {
             showErrorMessage('Error creating new note: ' + data.error);
         }
@@ -844,6 +888,8 @@ function saveEditedEvent(eventId, dateStr) {
     
     const newTitle = titleInput.value;
     const newDescription = descriptionInput.value;
+    // Recurring occurrences carry their series start; keep the series where it is
+    const event = events[dateStr].find(e => e.id === eventId);
     
     // Update the event via API
     fetch(`/api/events/${eventId}`, {
@@ -854,7 +900,7 @@ function saveEditedEvent(eventId, dateStr) {
         body: JSON.stringify({ 
             title: newTitle,
             description: newDescription,
-            start_date: events[dateStr].find(e => e.id === eventId).start_date,
+            start_date: event.series_start_date || event.start_date,
             category: 'General'
         })
     })
@@ -951,7 +997,7 @@ function updateEvent(eventId) {
                 saveButton.setAttribute('onclick', 'saveEvent()');
             }
             // Reload events first, then update everything
-            loadEventsAndUpdate(eventDate);
+            loadMonthData(eventDate);
         } else {
             showErrorMessage('Error updating event: ' + data.error);
         }
@@ -974,7 +1020,7 @@ function deleteEvent(eventId) {
             // Get the event date before reloading
             const eventDate = document.getElementById('event-date').value;
             // Reload events and update everything
-            loadEventsAndUpdate(eventDate);
+            loadMonthData(eventDate);
         } else {
             showErrorMessage('Error deleting event: ' + data.error);
         }
@@ -996,7 +1042,7 @@ function deleteNoteById(noteId, dateStr) {
             // Update the combined display
             updateEventDetailsAndNotesDisplay(dateStr);
             // Update calendar
-            updateCalendar();
+            loadMonthData();
         } else {
             showErrorMessage('Error deleting note: ' + data.error);
         }
@@ -1025,7 +1071,7 @@ function deleteNote(dateStr) {
                 // Update the combined display
                 updateEventDetailsAndNotesDisplay(dateStr);
                 // Update calendar
-                updateCalendar();
+                loadMonthData();
             } else {
                 showErrorMessage('Error deleting note: ' + data.error);
             }
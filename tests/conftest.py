@@ -0,0 +1,49 @@
+"""
+Shared fixtures for the Calendar App tests.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """A DatabaseManager on a fresh database file."""
+    manager = DatabaseManager(str(tmp_path / 'calendar.db'))
+    manager.initialize_database()
+    yield manager
+    manager.engine.dispose()
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    """The Flask app, initialized once on a temporary database."""
+    import web_app
+    return web_app.create_app(str(tmp_path_factory.mktemp('app') / 'calendar.db'))
+
+
+@pytest.fixture
+def client(app):
+    """A test client on an emptied database with cold caches."""
+    import web_app
+    with web_app.db_manager.engine.begin() as conn:
+        for table in ('events', 'event_days', 'notes', 'settings'):
+            conn.exec_driver_sql(f"DELETE FROM {table}")
+    web_app.events_cache.clear()
+    web_app.recurrence_engine.cache.clear()
+    return app.test_client()
+
+
+@pytest.fixture
+def create_event(client):
+    """POST an event to the API through `client`; returns the response."""
+    def create(title, start='2024-06-03T09:00:00Z', end=None, **fields):
+        return client.post('/api/events', json=dict(fields, title=title, start_date=start, end_date=end))
+    return create
@@ -0,0 +1,142 @@
+"""
+Tests for bulk import and export.
+"""
+
+import io
+from datetime import datetime
+
+import pytest
+
+from utils import bulk_io
+from utils.ical import parse_rrule
+
+
+def _export(db_manager, fmt, kind='events'):
+    return ''.join(bulk_io.export_stream(db_manager, fmt, kind))
+
+
+def _import(db_manager, text, fmt, kind='events', chunk_size=bulk_io.DEFAULT_CHUNK_SIZE):
+    return bulk_io.import_stream(db_manager, io.StringIO(text, newline=''), fmt, kind, chunk_size)
+
+
+def _events(db_manager):
+    return [
+        (row.title, row.description, row.start_time, row.end_time, row.category, row.recurrence, row.timezone)
+        for row in db_manager.iter_events()
+    ]
+
+
+@pytest.fixture
+def seeded(db_manager):
+    db_manager.create_event('Standup', datetime(2024, 3, 4, 8), end_time=datetime(2024, 3, 4, 8, 15),
+                            description='Daily; short, "quick"\nsync', category='Work',
+                            recurrence='weekly', timezone='Europe/Berlin')
+    db_manager.create_event('Flight', datetime(2024, 6, 3, 22), end_time=datetime(2024, 6, 4, 6))
+    db_manager.create_event('Reminder', datetime(2024, 7, 1, 12))
+    return db_manager
+
+
+@pytest.mark.parametrize('fmt', bulk_io.FORMATS)
+def test_events_round_trip(seeded, tmp_path, fmt):
+    from database.db_manager import DatabaseManager
+    target = DatabaseManager(str(tmp_path / 'target.db'))
+    target.initialize_database()
+
+    imported, errors = _import(target, _export(seeded, fmt), fmt, chunk_size=2)
+
+    assert (imported, errors) == (3, [])
+    assert _events(target) == _events(seeded)
+    target.engine.dispose()
+
+
+@pytest.mark.parametrize('fmt', ['ndjson', 'csv'])
+def test_notes_round_trip(db_manager, tmp_path, fmt):
+    from database.db_manager import DatabaseManager
+    db_manager.create_new_note(datetime(2024, 6, 3), 'First, with "quotes"\nand lines')
+    db_manager.create_new_note(datetime(2024, 6, 4), 'Second')
+    target = DatabaseManager(str(tmp_path / 'target.db'))
+    target.initialize_database()
+
+    assert _import(target, _export(db_manager, fmt, 'notes'), fmt, 'notes') == (2, [])
+    assert [(row.date, row.content) for row in target.iter_notes()] == [
+        (row.date, row.content) for row in db_manager.iter_notes()
+    ]
+    target.engine.dispose()
+
+
+def test_invalid_records_are_skipped_and_reported(db_manager):
+    text = (
+        '{"title": "Good", "start_date": "2024-06-03T09:00:00Z"}\n'
+        '{"title": "No start"}\n'
+        '{"title": "Bad recurrence", "start_date": "2024-06-03", "recurrence": "hourly"}\n'
+    )
+
+    imported, errors = _import(db_manager, text, 'ndjson')
+
+    assert imported == 1
+    assert [error.split(':')[0] for error in errors] == ['Record 2', 'Record 3']
+
+
+def test_records_outside_the_supported_years_are_skipped(db_manager):
+    text = (
+        '{"title": "Too early", "start_date": "0001-01-01T00:00:00", "timezone": "Asia/Tokyo"}\n'
+        '{"title": "Too late", "start_date": "9999-12-31T09:00:00", "end_date": "9999-12-31T13:00:00"}\n'
+        '{"title": "Last", "start_date": "9000-12-31T09:00:00", "timezone": "Asia/Tokyo"}\n'
+    )
+
+    imported, errors = _import(db_manager, text, 'ndjson')
+
+    assert imported == 1
+    assert [error.split(':')[0] for error in errors] == ['Record 1', 'Record 2']
+    assert all('Year must be between' in error for error in errors)
+    assert _import(db_manager, '{"date": "9999-12-31", "content": "x"}\n', 'ndjson', 'notes')[0] == 0
+
+
+@pytest.mark.parametrize('rrule', [
+    'FREQ=WEEKLY;COUNT=3',
+    'FREQ=WEEKLY;INTERVAL=2;UNTIL=20240630T000000Z',
+    'FREQ=WEEKLY;BYDAY=MO,WE',
+    'FREQ=HOURLY',
+])
+def test_ics_import_rejects_rules_it_cannot_store(db_manager, rrule):
+    text = (
+        "BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nUID:1\r\nSUMMARY:Series\r\n"
+        f"DTSTART:20240603T090000Z\r\nRRULE:{rrule}\r\nEND:VEVENT\r\n"
+        "BEGIN:VEVENT\r\nUID:2\r\nSUMMARY:Plain\r\n"
+        "DTSTART:20240604T090000Z\r\nRRULE:FREQ=WEEKLY;INTERVAL=1\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n"
+    )
+
+    imported, errors = _import(db_manager, text, 'ics')
+
+    assert imported == 1
+    assert len(errors) == 1 and errors[0].startswith('Record 1')
+    assert [(row.title, row.recurrence) for row in db_manager.iter_events()] == [('Plain', 'weekly')]
+
+
+def test_parse_rrule():
+    assert parse_rrule('') is None
+    assert parse_rrule('FREQ=MONTHLY') == 'monthly'
+    assert parse_rrule('freq=daily;wkst=MO') == 'daily'
+    with pytest.raises(ValueError, match='COUNT'):
+        parse_rrule('FREQ=DAILY;COUNT=5')
+
+
+def test_ics_export_defines_every_tzid(seeded):
+    seeded.create_event('Tokyo', datetime(2024, 6, 4, 8), timezone='Asia/Tokyo')
+
+    text = _export(seeded, 'ics')
+
+    tzids = {line.split('TZID=')[1].split(':')[0] for line in text.splitlines() if ';TZID=' in line}
+    defined = [line[len('TZID:'):] for line in text.splitlines() if line.startswith('TZID:')]
+    assert tzids == {'Europe/Berlin', 'Asia/Tokyo'}
+    assert sorted(defined) == sorted(tzids)
+    assert text.index('BEGIN:VTIMEZONE') < text.index('BEGIN:VEVENT')
+    # The weekly Berlin series needs every later DST change
+    assert 'DTSTART:20240331T020000\r\nTZOFFSETFROM:+0100\r\nTZOFFSETTO:+0200\r\nTZNAME:CEST' in text
+
+
+def test_ics_export_defines_zones_missing_from_the_spans(seeded):
+    text = ''.join(bulk_io.write_records(seeded.iter_events(), 'ics', 'events'))
+
+    assert text.count('TZID:Europe/Berlin') == 1
+    assert text.index('END:VEVENT') < text.index('BEGIN:VTIMEZONE')
@@ -0,0 +1,90 @@
+"""
+Tests for business-day counting and offsets.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from utils.business_days import BusinessDayCalendar
+from utils.holiday_manager import HolidayManager
+
+
+@pytest.fixture(scope='module')
+def calendar():
+    return BusinessDayCalendar(HolidayManager())
+
+
+def _working_days(calendar, start, end, countries):
+    """Brute-force working days in [start, end)."""
+    holiday_manager = calendar.holiday_manager
+    return [
+        start + timedelta(days=i) for i in range((end - start).days)
+        if (start + timedelta(days=i)).weekday() < 5
+        and not any(holiday_manager.get_holiday_name(start + timedelta(days=i), c) for c in countries)
+    ]
+
+
+def test_counts_and_offsets_match_a_day_by_day_walk(calendar):
+    countries = ['US', 'DE']
+    start, end = date(2023, 11, 15), date(2025, 2, 10)
+    days = _working_days(calendar, start, end, countries)
+
+    assert calendar.count_working_days(start, end, countries) == len(days)
+    assert calendar.count_working_days(end, start, countries) == -len(days)
+    # days[0] is start itself, which is a working day and is not counted by add
+    assert days[0] == start
+    for n in (1, 30, 47, 200, len(days) - 1):
+        assert calendar.add_working_days(start, n, countries) == days[n]
+        assert calendar.add_working_days(days[n], -n, countries) == start
+
+
+def test_year_wrap_skips_new_year(calendar):
+    assert calendar.add_working_days(date(2024, 12, 31), 1, ['US']) == date(2025, 1, 2)
+    assert calendar.add_working_days(date(2025, 1, 2), -1, ['US']) == date(2024, 12, 31)
+    assert calendar.count_working_days(date(2024, 12, 30), date(2025, 1, 6), ['US']) == 4
+
+
+def test_zero_days_returns_the_start_even_off_work(calendar):
+    saturday = date(2024, 6, 8)
+    assert calendar.add_working_days(saturday, 0, ['US']) == saturday
+    assert calendar.add_working_days(saturday, 1, ['US']) == date(2024, 6, 10)
+    assert calendar.add_working_days(saturday, -1, ['US']) == date(2024, 6, 7)
+    assert calendar.count_working_days(saturday, saturday, ['US']) == 0
+
+
+@pytest.mark.parametrize('call', [
+    lambda calendar: calendar.add_working_days(date(2099, 12, 31), 1, ['US']),
+    lambda calendar: calendar.add_working_days(date(1901, 1, 2), -1, ['US']),
+    lambda calendar: calendar.count_working_days(date(1900, 12, 1), date(1901, 2, 1), ['US']),
+])
+def test_dates_outside_1901_to_2099_are_rejected(calendar, call):
+    with pytest.raises(ValueError, match='only available from 1901 to 2099'):
+        call(calendar)
+
+
+def test_unsupported_countries_are_rejected(calendar):
+    with pytest.raises(ValueError, match='Unsupported country: XX'):
+        calendar.count_working_days(date(2024, 1, 1), date(2024, 2, 1), ['US', 'XX'])
+
+
+def test_endpoints(client):
+    added = client.get('/api/business-days/add?date=2024-12-31&days=1&countries=us').get_json()
+    assert (added['result'], added['countries']) == ('2025-01-02', ['US'])
+    counted = client.get('/api/business-days/count?start=2024-12-30&end=2025-01-07&countries=US,DE').get_json()
+    # January 6th is a holiday in Baden-Württemberg
+    assert (counted['calendar_days'], counted['working_days']) == (8, 4)
+
+
+@pytest.mark.parametrize('url, error', [
+    ('/api/business-days/add?days=1', 'Missing parameter: date'),
+    ('/api/business-days/add?date=2024-06-03&days=two', None),
+    ('/api/business-days/add?date=2024-06-03&days=1&countries=XX', 'Unsupported country: XX'),
+    ('/api/business-days/count?start=2024-06-03', 'Missing parameter: end'),
+    ('/api/business-days/count?start=2200-01-01&end=2200-02-01&countries=US', None),
+])
+def test_endpoint_errors(client, url, error):
+    response = client.get(url)
+    assert response.status_code == 400
+    if error:
+        assert response.get_json()['error'] == error
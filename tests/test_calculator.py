@@ -0,0 +1,59 @@
+"""
+Tests for the bounded arithmetic evaluator.
+"""
+
+import pytest
+
+from utils.calculator import Calculator, CalculatorError, MAX_EXPRESSION_LENGTH
+
+
+@pytest.mark.parametrize('expression, result', [
+    ('1 + 2 * 3', 7),
+    ('(1 + 2) * 3', 9),
+    ('7 ÷ 2', 3.5),
+    ('6 × −2', -12),
+    ('2 ** -1', 0.5),
+    ('-(3 - 5) % 3', 2),
+    ('7 // 2', 3),
+    ('1.5e3', 1500.0),
+])
+def test_arithmetic(expression, result):
+    assert Calculator().evaluate(expression) == result
+
+
+@pytest.mark.parametrize('expression, message', [
+    ('__import__("os")', 'Invalid expression'),
+    ('(1).real', 'Invalid expression'),
+    ('[1, 2]', 'Invalid expression'),
+    ('True + 1', 'Invalid expression'),
+    ('1 +', 'Invalid expression'),
+    ('1 / 0', 'Division by zero'),
+    ('0 ** -1', 'Division by zero'),
+    ('9 ** 9 ** 9', 'Exponent too large'),
+    ('10 ** 101', 'Result too large'),
+    ('1e308 * 10', 'Result too large'),
+    ('(-8) ** 0.5', 'Result is not a real number'),
+    ('1+' * 100 + '1', 'Expression too complex'),
+    ('-' * 200 + '1', 'Expression too complex'),
+    ('1' * (MAX_EXPRESSION_LENGTH + 1), 'Expression too long'),
+])
+def test_rejected_expressions(expression, message):
+    with pytest.raises(CalculatorError, match=message):
+        Calculator().evaluate(expression)
+
+
+def test_outcomes_are_cached_including_errors():
+    calculator = Calculator()
+    for _ in range(2):
+        assert calculator.evaluate('2 + 2') == 4
+        with pytest.raises(CalculatorError):
+            calculator.evaluate('1 / 0')
+
+    assert calculator.stats()['hits'] == 2
+
+
+def test_endpoint(client):
+    assert client.post('/api/calculator', json={'expression': '2 × 21'}).get_json() == {'result': 42}
+    assert client.post('/api/calculator', json={'expression': ''}).get_json() == {'result': 0}
+    assert client.post('/api/calculator', json={'expression': 'open("x")'}).status_code == 400
+    assert client.post('/api/calculator', json={'expression': 42}).status_code == 400
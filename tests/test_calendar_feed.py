@@ -0,0 +1,76 @@
+"""
+Tests for the subscribable iCalendar feed.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+import web_app
+
+
+def _backdate_last_change(days):
+    with web_app.db_manager.engine.begin() as conn:
+        conn.execute(text(
+            "UPDATE table_versions SET changed_at = :changed_at WHERE name = 'events'"
+        ), {'changed_at': datetime.utcnow() - timedelta(days=days)})
+
+
+def test_feed_lists_events_and_revalidates_by_etag(client, create_event):
+    create_event('Dentist')
+
+    response = client.get('/calendar.ics')
+    assert response.status_code == 200
+    assert 'SUMMARY:Dentist' in response.get_data(as_text=True)
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    unchanged = client.get('/calendar.ics', headers={'If-None-Match': response.headers['ETag']})
+    assert unchanged.status_code == 304
+
+
+def test_delete_moves_last_modified(client, create_event):
+    event_id = create_event('Cancelled').get_json()['event']['id']
+    create_event('Kept')
+    # Leave the last change well before the client's copy
+    _backdate_last_change(days=1)
+    first = client.get('/calendar.ics')
+    since = first.headers['Last-Modified']
+    assert client.get('/calendar.ics', headers={'If-Modified-Since': since}).status_code == 304
+
+    client.delete(f'/api/events/{event_id}')
+    after = client.get('/calendar.ics', headers={'If-Modified-Since': since})
+
+    assert after.status_code == 200
+    assert 'Cancelled' not in after.get_data(as_text=True)
+    assert after.headers['ETag'] != first.headers['ETag']
+    assert after.headers['Last-Modified'] != since
+
+
+def test_migrated_database_gains_change_times(tmp_path):
+    from database.db_manager import DatabaseManager
+    from database.schema import set_schema_version
+    db_manager = DatabaseManager(str(tmp_path / 'old.db'))
+    db_manager.initialize_database()
+    # Recreate the version table and trigger as the previous schema had them
+    with db_manager.engine.begin() as conn:
+        for operation in ('insert', 'update', 'delete'):
+            conn.execute(text(f"DROP TRIGGER events_version_{operation}"))
+        conn.execute(text("DROP TABLE table_versions"))
+        conn.execute(text("CREATE TABLE table_versions (name VARCHAR(50) PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0)"))
+        conn.execute(text("INSERT INTO table_versions VALUES ('events', 7)"))
+        conn.execute(text(
+            "CREATE TRIGGER events_version_delete AFTER DELETE ON events BEGIN "
+            "UPDATE table_versions SET version = version + 1 WHERE name = 'events'; END"
+        ))
+    set_schema_version(db_manager.engine, 1)
+    db_manager.engine.dispose()
+
+    db_manager.initialize_database()
+    assert db_manager.get_events_version() == (7, None)
+    event = db_manager.create_event('After upgrade', datetime(2024, 6, 3, 9))
+    db_manager.delete_event(event.id)
+
+    version, changed_at = db_manager.get_events_version()
+    assert version == 9
+    assert abs(changed_at - datetime.utcnow()) < timedelta(minutes=1)
+    db_manager.engine.dispose()
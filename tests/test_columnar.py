@@ -0,0 +1,82 @@
+"""
+Tests for the columnar event list format and the gzipped month views.
+"""
+
+import gzip
+from datetime import datetime, timedelta
+
+import pytest
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _decode(columns):
+    """Decode a columnar event list the way static/calendar.js does."""
+    def iso(minutes):
+        offset = columns['offsets'][0][1] if columns['offsets'] else 0
+        for since, value in columns['offsets']:
+            if since > minutes:
+                break
+            offset = value
+        local = (_EPOCH + timedelta(minutes=minutes + offset)).isoformat()
+        return f"{local}{'-' if offset < 0 else '+'}{abs(offset) // 60:02d}:{abs(offset) % 60:02d}"
+
+    events = []
+    for i in range(columns['count']):
+        event = {
+            'id': columns['id'][i],
+            'title': columns['title'][i],
+            'description': columns['description'][i],
+            'start_date': iso(columns['start'][i]),
+            'end_date': iso(columns['end'][i]),
+            'category': columns['categories'][columns['category'][i]],
+            'recurrence': columns['recurrences'][columns['recurrence'][i]],
+            'timezone': columns['timezones'][columns['timezone'][i]],
+        }
+        if columns['series_start'][i] is not None:
+            event['series_start_date'] = iso(columns['series_start'][i])
+        events.append(event)
+    return events
+
+
+@pytest.fixture
+def month_events(client):
+    # March 2024 in Berlin spans the switch to summer time on the 31st
+    for event in (
+        {'title': 'Standup', 'start_date': '2024-02-26T09:00:00', 'end_date': '2024-02-26T09:15:00',
+         'recurrence': 'weekly', 'category': 'Work', 'timezone': 'Europe/Berlin'},
+        {'title': 'Flight', 'start_date': '2024-03-30T22:00:00Z', 'end_date': '2024-03-31T06:00:00Z',
+         'category': 'Travel', 'description': 'Overnight'},
+        {'title': 'Reminder', 'start_date': '2024-03-12T12:00:00Z', 'category': 'Work'},
+    ):
+        assert client.post('/api/events', json=event).status_code == 200
+
+
+def test_columnar_events_decode_to_the_json_list(client, month_events):
+    url = '/api/events?year=2024&month=3&tz=Europe/Berlin'
+    columns = client.get(url + '&format=columnar').get_json()
+
+    assert (columns['format'], columns['count']) == ('columnar', 6)
+    assert columns['categories'] == ['Work', 'Travel']
+    assert [offset for _, offset in columns['offsets']] == [60, 120]
+    assert _decode(columns) == client.get(url).get_json()
+
+
+def test_columnar_month_grid_decodes_to_the_json_grid(client, month_events):
+    url = '/api/month/2024/3?tz=America/New_York'
+    columnar = client.get(url + '&format=columnar').get_json()
+    plain = client.get(url).get_json()
+
+    assert _decode(columnar.pop('events')) == plain.pop('events')
+    assert columnar == plain
+
+
+@pytest.mark.parametrize('url', ['/api/events?year=2024&month=3', '/api/month/2024/3?format=columnar'])
+def test_gzip_round_trip(client, month_events, url):
+    identity = client.get(url)
+    compressed = client.get(url, headers={'Accept-Encoding': 'gzip, deflate'})
+
+    assert identity.content_encoding is None
+    assert compressed.content_encoding == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert gzip.decompress(compressed.get_data()) == identity.get_data()
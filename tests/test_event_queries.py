@@ -0,0 +1,88 @@
+"""
+Tests for date-range event and note lookups.
+"""
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+
+
+def _interval_ids(db_manager):
+    with db_manager.engine.connect() as conn:
+        return [row[0] for row in conn.execute(text("SELECT id FROM event_intervals ORDER BY id"))]
+
+
+def test_notes_for_date_use_the_whole_day(db_manager):
+    db_manager.create_new_note(datetime(2024, 6, 3, 0, 0), 'Midnight')
+    db_manager.create_new_note(datetime(2024, 6, 3, 23, 59), 'Late')
+    db_manager.create_new_note(datetime(2024, 6, 4, 0, 0), 'Next day')
+
+    notes = db_manager.get_notes_for_date(date(2024, 6, 3))
+
+    assert sorted(note.content for note in notes) == ['Late', 'Midnight']
+    assert db_manager.get_note('2024-06-04').content == 'Next day'
+
+
+def test_get_events_returns_events_overlapping_the_window(db_manager):
+    window_start, window_end = datetime(2024, 6, 1), datetime(2024, 7, 1)
+    db_manager.create_event('Spans the start', datetime(2024, 5, 30), end_time=datetime(2024, 6, 2))
+    db_manager.create_event('Inside', datetime(2024, 6, 10, 9), end_time=datetime(2024, 6, 10, 10))
+    db_manager.create_event('Instant at the start', window_start)
+    db_manager.create_event('Ends at the start', datetime(2024, 5, 31), end_time=window_start)
+    db_manager.create_event('Starts at the end', window_end, end_time=window_end + timedelta(hours=1))
+    db_manager.create_event('Long before', datetime(2020, 1, 1), end_time=datetime(2020, 1, 2))
+
+    events = db_manager.get_events(window_start, window_end)
+
+    assert db_manager.has_interval_index
+    assert [event.title for event in events] == ['Spans the start', 'Instant at the start', 'Inside']
+
+
+def test_interval_index_follows_event_writes(db_manager):
+    event = db_manager.create_event('Moved', datetime(2024, 1, 1, 9), end_time=datetime(2024, 1, 1, 10))
+    other = db_manager.create_event('Deleted', datetime(2024, 1, 2, 9))
+    assert _interval_ids(db_manager) == [event.id, other.id]
+
+    db_manager.update_event(event.id, start_time=datetime(2025, 3, 1, 9), end_time=datetime(2025, 3, 1, 10))
+    db_manager.delete_event(other.id)
+
+    assert _interval_ids(db_manager) == [event.id]
+    assert db_manager.get_events(datetime(2024, 1, 1), datetime(2024, 2, 1)) == []
+    assert [e.id for e in db_manager.get_events(datetime(2025, 3, 1), datetime(2025, 3, 2))] == [event.id]
+
+
+def test_events_past_the_index_range_are_found(db_manager):
+    late = db_manager.create_event('Late', datetime(8999, 12, 31, 9), end_time=datetime(9000, 1, 1, 9))
+    db_manager.create_event('Earlier', datetime(6500, 3, 1, 9))
+
+    assert [e.title for e in db_manager.get_events(datetime(8999, 12, 31), datetime(9000, 1, 2))] == ['Late']
+    assert [e.title for e in db_manager.get_events(datetime(6500, 3, 1), datetime(6500, 3, 2))] == ['Earlier']
+    assert db_manager.get_events(datetime(6000, 1, 1), datetime(6000, 2, 1)) == []
+
+    # Databases indexed by older versions, whose triggers let such times wrap around
+    with db_manager.engine.begin() as conn:
+        conn.execute(text("UPDATE event_intervals SET start_min = -1, end_min = -1 WHERE id = :id"), {'id': late.id})
+        conn.execute(text("PRAGMA user_version = 3"))
+    db_manager.engine.dispose()
+    db_manager.initialize_database()
+    assert [e.id for e in db_manager.get_events(datetime(8999, 12, 31), datetime(9000, 1, 1))] == [late.id]
+
+
+def test_month_views_show_events_at_the_year_bound(client):
+    client.post('/api/events', json={'title': 'Last', 'start_date': '9000-12-31T09:00:00Z'})
+
+    events = client.get('/api/events?year=9000&month=12').get_json()
+    assert [event['title'] for event in events] == ['Last']
+    day = client.get('/api/day/9000-12-31').get_json()
+    assert [event['title'] for event in day['events']] == ['Last']
+
+
+def test_interval_index_covers_bulk_inserts(db_manager):
+    db_manager.bulk_insert_events([
+        {'title': f'Bulk {i}', 'start_time': datetime(2024, 2, 1) + timedelta(days=i),
+         'end_time': datetime(2024, 2, 1, 1) + timedelta(days=i)}
+        for i in range(10)
+    ])
+
+    assert len(_interval_ids(db_manager)) == 10
+    assert len(db_manager.get_events(datetime(2024, 2, 3), datetime(2024, 2, 5))) == 2
@@ -0,0 +1,89 @@
+"""
+Tests for the cached month responses.
+"""
+
+from datetime import datetime
+
+import pytest
+
+import web_app
+from database.db_manager import DatabaseManager
+from utils.cache import MonthResponseCache
+
+
+@pytest.fixture
+def other_process(app):
+    """A second manager on the app's database, standing in for another worker."""
+    manager = DatabaseManager(web_app.db_manager.db_path)
+    manager.initialize_database()
+    yield manager
+    manager.engine.dispose()
+
+
+def _titles(client, url):
+    payload = client.get(url).get_json()
+    events = payload['events'] if isinstance(payload, dict) else payload
+    return [event['title'] for event in events]
+
+
+def _hits():
+    return web_app.events_cache.stats()['hits']
+
+
+@pytest.mark.parametrize('url', ['/api/events?year=2024&month=6', '/api/month/2024/6?countries=US'])
+def test_repeated_reads_are_served_from_the_cache(client, url):
+    client.post('/api/events', json={'title': 'Cached', 'start_date': '2024-06-03T09:00:00Z'})
+    assert _titles(client, url) == ['Cached']
+    hits = _hits()
+
+    assert _titles(client, url) == ['Cached']
+    assert _hits() == hits + 1
+
+
+@pytest.mark.parametrize('url', ['/api/events?year=2024&month=6', '/api/month/2024/6?countries=US'])
+def test_writes_by_another_process_expire_the_cache(client, other_process, url):
+    assert _titles(client, url) == []
+    assert _titles(client, url) == []
+
+    other_process.create_event('Elsewhere', datetime(2024, 6, 3, 9))
+    assert _titles(client, url) == ['Elsewhere']
+
+    event = other_process.get_events(datetime(2024, 6, 1), datetime(2024, 7, 1))[0]
+    other_process.delete_event(event.id)
+    assert _titles(client, url) == []
+
+
+def test_own_writes_expire_every_month_a_series_touches(client):
+    response = client.post('/api/events', json={
+        'title': 'Weekly', 'start_date': '2024-06-03T09:00:00Z', 'recurrence': 'weekly'
+    })
+    event_id = response.get_json()['event']['id']
+    assert _titles(client, '/api/events?year=2025&month=1')[0] == 'Weekly'
+
+    client.put(f'/api/events/{event_id}', json={'title': 'Renamed'})
+
+    assert _titles(client, '/api/events?year=2025&month=1')[0] == 'Renamed'
+
+
+def test_rejected_write_keeps_the_cache(client):
+    client.post('/api/events', json={
+        'title': 'Existing', 'start_date': '2024-06-03T09:00:00Z', 'end_date': '2024-06-03T10:00:00Z'
+    })
+    assert _titles(client, '/api/events?year=2024&month=6') == ['Existing']
+    client.post('/api/events', json={
+        'title': 'Clash', 'start_date': '2024-06-03T09:30:00Z', 'end_date': '2024-06-03T10:30:00Z',
+        'reject_conflicts': True
+    })
+    hits = _hits()
+
+    assert _titles(client, '/api/events?year=2024&month=6') == ['Existing']
+    assert _hits() == hits + 1
+
+
+def test_entries_are_only_served_at_their_version():
+    cache = MonthResponseCache()
+    cache.set((2024, 6, 'json'), b'[]', version=3)
+
+    assert cache.get((2024, 6, 'json'), version=3) == b'[]'
+    assert cache.get((2024, 6, 'json'), version=4) is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
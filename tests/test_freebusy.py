@@ -0,0 +1,43 @@
+"""
+Tests for free/busy queries and conflict checks.
+"""
+
+import pytest
+
+
+def test_busy_periods_are_merged_and_gaps_reported(client, create_event):
+    create_event('Standup', '2024-06-03T09:00:00Z', '2024-06-03T09:30:00Z', recurrence='daily')
+    create_event('Review', '2024-06-03T09:15:00Z', '2024-06-03T10:00:00Z')
+    create_event('Lunch', '2024-06-03T12:00:00Z', '2024-06-03T13:00:00Z')
+
+    result = client.get('/api/freebusy?start=2024-06-03T08:00Z&end=2024-06-03T18:00Z').get_json()
+
+    assert [(period['start'][11:16], period['end'][11:16]) for period in result['busy']] == [
+        ('09:00', '10:00'), ('12:00', '13:00')
+    ]
+    assert [(period['start'][11:16], period['end'][11:16]) for period in result['free']] == [
+        ('08:00', '09:00'), ('10:00', '12:00'), ('13:00', '18:00')
+    ]
+    assert len(result['conflicts']) == 1
+    assert {event['title'] for event in result['conflicts'][0]['events']} == {'Standup', 'Review'}
+
+
+def test_writes_report_or_reject_conflicts(create_event):
+    create_event('Standup', '2024-06-03T09:00:00Z', '2024-06-03T09:30:00Z', recurrence='weekly')
+
+    clash = create_event('Review', '2024-06-10T09:15:00Z', '2024-06-10T10:00:00Z').get_json()
+    assert [conflict['event']['title'] for conflict in clash['conflicts']] == ['Standup']
+    assert clash['conflicts'][0]['overlap_start'].startswith('2024-06-10T09:15')
+
+    rejected = create_event('Other', '2024-06-17T09:00:00Z', '2024-06-17T09:05:00Z',
+                            reject_conflicts=True)
+    assert rejected.status_code == 409
+
+
+@pytest.mark.parametrize('query', [
+    'start=9999-12-30T00:00&end=9999-12-31T23:00',
+    'start=0001-01-01&end=0001-01-02&tz=Asia/Tokyo',
+    'start=2024-06-03&end=2024-06-02',
+])
+def test_invalid_windows_are_rejected(client, query):
+    assert client.get(f'/api/freebusy?{query}').status_code == 400
@@ -0,0 +1,90 @@
+"""
+Tests for holiday lookups and the precomputed holiday store.
+"""
+
+from datetime import date
+
+import pytest
+
+from utils.holiday_manager import HolidayManager
+
+
+def _counting(manager):
+    """Record the (country, year) of every live computation of a manager."""
+    computed = []
+    compute = manager._compute_holidays
+    manager._compute_holidays = lambda country, subdivision, year: (
+        computed.append((country, year)) or compute(country, subdivision, year)
+    )
+    return computed
+
+
+def test_month_and_range_lookups_use_the_month_buckets():
+    manager = HolidayManager()
+
+    july = manager.get_holidays_for_month(2024, 7, ['US', 'DE'])
+    assert july == {date(2024, 7, 4): ['United States: Independence Day']}
+    assert manager.get_holidays_for_month(2024, 2, ['DE']) == {}
+
+    # Across a year boundary, with the end exclusive
+    new_year = manager.get_holidays_for_range(date(2024, 12, 24), date(2025, 1, 6), ['US', 'DE'])
+    assert sorted(new_year) == [date(2024, 12, 25), date(2024, 12, 26), date(2025, 1, 1)]
+    assert new_year[date(2025, 1, 1)] == ["United States: New Year's Day", 'Germany: Neujahr']
+    assert manager.is_holiday(date(2025, 1, 6), ['DE'])  # Epiphany in Baden-Württemberg
+    assert manager.get_holidays_for_month(2024, 7, ['XX']) == {}
+
+
+def test_country_years_are_evicted_least_recently_used_first():
+    manager = HolidayManager(cache_size=2)
+    computed = _counting(manager)
+
+    for year in (2023, 2024, 2023, 2025, 2023, 2024):
+        manager.get_holidays_for_year(year, ['US'])
+
+    # 2024 was the least recently used entry when 2025 was added
+    assert computed == [('US', 2023), ('US', 2024), ('US', 2025), ('US', 2024)]
+    assert manager.cache.stats()['size'] == 2
+
+
+def test_stored_years_are_read_instead_of_computed(db_manager):
+    db_manager.store_holidays('US', None, 2024, {date(2024, 7, 5): 'Stored Day'})
+    db_manager.store_holidays('US', None, 2025, {})
+    manager = HolidayManager(store=db_manager)
+    computed = _counting(manager)
+
+    assert manager.get_holidays_for_month(2024, 7, ['US']) == {date(2024, 7, 5): ['United States: Stored Day']}
+    # A year stored without holidays is not recomputed
+    assert manager.get_holidays_for_year(2025, ['US']) == {}
+    assert computed == []
+
+    assert date(2026, 7, 4) in manager.get_holidays_for_year(2026, ['US'])
+    assert computed == [('US', 2026)]
+
+
+def test_precomputed_holidays_are_read_from_the_store(db_manager):
+    live = HolidayManager().get_holidays_for_year(2024, ['US', 'DE'])
+
+    assert HolidayManager(store=db_manager).precompute(['US', 'DE', 'XX'], [2024]) == 2
+
+    manager = HolidayManager(store=db_manager)
+    computed = _counting(manager)
+    assert manager.get_holidays_for_year(2024, ['US', 'DE']) == live
+    assert computed == []
+    assert db_manager.get_stored_holidays('DE', 'BW', 2024)[date(2024, 1, 6)] == 'Heilige Drei Könige'
+
+
+def test_precompute_requires_a_store():
+    with pytest.raises(ValueError, match='No holiday store'):
+        HolidayManager().precompute(['US'], [2024])
+
+
+def test_precompute_command(app):
+    import web_app
+
+    result = app.test_cli_runner().invoke(args=[
+        'precompute-holidays', '--start-year', '2030', '--end-year', '2031', '--countries', 'US, GB'
+    ])
+
+    assert result.exit_code == 0, result.output
+    assert result.output.strip() == 'Stored holidays for 4 country/year combinations.'
+    assert date(2031, 12, 25) in web_app.db_manager.get_stored_holidays('GB', None, 2031)
@@ -0,0 +1,35 @@
+"""
+Tests for the keyset-paginated event and note lists.
+"""
+
+import pytest
+
+
+def _pages(client, url):
+    titles, cursor = [], None
+    while True:
+        page = client.get(url + (f'&cursor={cursor}' if cursor else '')).get_json()
+        titles.append([item['title'] for item in page['items']])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return titles
+
+
+def test_events_are_paged_in_start_order_within_the_range(client):
+    for day in (5, 3, 4, 3, 9):
+        client.post('/api/events', json={'title': f'Day {day}', 'start_date': f'2024-06-0{day}T09:00:00Z'})
+
+    assert _pages(client, '/api/events/list?limit=2&start=2024-06-03&end=2024-06-05') == [
+        ['Day 3', 'Day 3'], ['Day 4', 'Day 5']
+    ]
+
+
+@pytest.mark.parametrize('url', [
+    '/api/events/list?end=9999-12-31',
+    '/api/events/list?start=0001-01-01',
+    '/api/notes/list?end=9999-12-31',
+])
+def test_lists_reject_dates_out_of_range(client, url):
+    response = client.get(url)
+    assert response.status_code == 400
+    assert 'Year must be between' in response.get_json()['error']
@@ -0,0 +1,28 @@
+"""
+Tests for the request and SQL metrics.
+"""
+
+import logging
+
+from sqlalchemy import text
+
+from utils.metrics import Metrics
+
+
+def test_repeated_statements_are_counted_and_logged_once(db_manager, caplog):
+    metrics = Metrics(n_plus_one_threshold=3)
+    metrics.instrument_engine(db_manager.engine)
+
+    with caplog.at_level(logging.WARNING, logger='utils.metrics'):
+        for _ in range(2):
+            request_stats = metrics.start_request()
+            with db_manager.engine.connect() as conn:
+                for event_id in range(3):
+                    conn.execute(text("SELECT title FROM events WHERE id = :id"), {'id': event_id})
+            metrics.finish_request(request_stats, 'GET', '/api/events', 200)
+
+    assert metrics.n_plus_one['/api/events'] == 2
+    assert [record.getMessage() for record in caplog.records] == [
+        'Possible N+1 query on /api/events: 3 executions of SELECT title FROM events WHERE id = ?'
+    ]
+    assert 'calendar_db_queries_per_request_count{route="/api/events"} 2' in metrics.render()
@@ -0,0 +1,32 @@
+"""
+Tests for the batch month view.
+"""
+
+import pytest
+
+
+def test_month_view_covers_the_visible_grid(client, create_event):
+    # June 2024 starts on a Saturday, so the grid runs from Sunday May 26
+    create_event('Before the grid', '2024-05-25T10:00:00Z', '2024-05-25T11:00:00Z')
+    create_event('Leading day', '2024-05-26T10:00:00Z', '2024-05-26T11:00:00Z')
+    create_event('Trailing day', '2024-07-06T10:00:00Z', '2024-07-06T11:00:00Z')
+    client.post('/api/notes', json={'date': '2024-06-03', 'content': 'Note'})
+
+    view = client.get('/api/month/2024/6?countries=US').get_json()
+
+    assert (view['start'], view['end']) == ('2024-05-26', '2024-07-07')
+    assert [event['title'] for event in view['events']] == ['Leading day', 'Trailing day']
+    assert view['notes'] == {'2024-06-03': 1}
+    assert '2024-07-04' in view['holidays']
+
+
+@pytest.mark.parametrize('url', [
+    '/api/month/9999/12',
+    '/api/month/1/1',
+    '/api/events?year=9999&month=12',
+    '/api/events?year=1&month=1',
+])
+def test_month_views_reject_years_out_of_range(client, url):
+    response = client.get(url)
+    assert response.status_code == 400
+    assert 'Year must be between' in response.get_json()['error']
@@ -0,0 +1,99 @@
+"""
+Tests for the per-day occupancy index and the day, week and agenda views.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from database.occupancy import add_occupancy
+
+
+def _occupancy(db_manager):
+    return db_manager.get_occupancy(date(1900, 1, 1), date(2100, 1, 1))
+
+
+def _rebuilt(db_manager):
+    db_manager.rebuild_occupancy()
+    return _occupancy(db_manager)
+
+
+def test_events_are_split_across_the_days_they_cover():
+    days = add_occupancy({}, datetime(2024, 6, 3, 22), datetime(2024, 6, 4, 1, 30))
+    add_occupancy(days, datetime(2024, 6, 4, 9), None)
+
+    assert days[date(2024, 6, 3)]['busy_minutes'] == 120
+    assert days[date(2024, 6, 4)] == {
+        'event_count': 2,
+        'first_start': datetime(2024, 6, 4),
+        'last_end': datetime(2024, 6, 4, 9),
+        'busy_minutes': 90,
+    }
+
+
+def test_writes_keep_the_index_equal_to_a_full_rebuild(db_manager):
+    first = db_manager.create_event('First', datetime(2024, 6, 3, 9), end_time=datetime(2024, 6, 3, 11))
+    db_manager.create_event('Overnight', datetime(2024, 6, 3, 22), end_time=datetime(2024, 6, 4, 2))
+    db_manager.create_event('Series', datetime(2024, 6, 3, 12), recurrence='daily')
+    db_manager.bulk_insert_events([
+        {'title': 'Bulk', 'start_time': datetime(2024, 6, 4, 8), 'end_time': datetime(2024, 6, 4, 9)}
+    ])
+    db_manager.update_event(first.id, start_time=datetime(2024, 6, 5, 9), end_time=datetime(2024, 6, 5, 10))
+    expected = _occupancy(db_manager)
+
+    assert expected == _rebuilt(db_manager)
+    assert set(expected) == {date(2024, 6, 3), date(2024, 6, 4), date(2024, 6, 5)}
+    assert expected[date(2024, 6, 4)]['event_count'] == 2
+
+    db_manager.delete_event(first.id)
+    assert date(2024, 6, 5) not in _occupancy(db_manager)
+
+
+def test_moving_an_event_refreshes_only_its_own_days(db_manager):
+    event = db_manager.create_event('Moved', datetime(2005, 1, 1, 9), end_time=datetime(2005, 1, 1, 10))
+    db_manager.create_event('Between', datetime(2015, 6, 1, 9), end_time=datetime(2015, 6, 1, 10))
+    refreshed = []
+    rebuild_days = db_manager._rebuild_occupancy_days
+    db_manager._rebuild_occupancy_days = lambda conn, first_day, end_day: (
+        refreshed.append((first_day, end_day)), rebuild_days(conn, first_day, end_day)
+    )
+
+    db_manager.update_event(event.id, start_time=datetime(2025, 1, 1, 9), end_time=datetime(2025, 1, 1, 10))
+
+    assert refreshed == [(date(2005, 1, 1), date(2005, 1, 2)), (date(2025, 1, 1), date(2025, 1, 2))]
+    assert sorted(_occupancy(db_manager)) == [date(2015, 6, 1), date(2025, 1, 1)]
+
+
+def test_views_include_recurring_events_in_the_display_timezone(client):
+    client.post('/api/events', json={
+        'title': 'Late call', 'start_date': '2024-06-03T23:30:00Z', 'end_date': '2024-06-04T00:30:00Z'
+    })
+    client.post('/api/events', json={
+        'title': 'Daily', 'start_date': '2024-06-01T08:00:00Z', 'end_date': '2024-06-01T08:30:00Z',
+        'recurrence': 'daily'
+    })
+
+    utc = client.get('/api/day/2024-06-03').get_json()
+    assert [event['title'] for event in utc['events']] == ['Daily', 'Late call']
+    assert utc['occupancy']['busy_minutes'] == 60
+
+    tokyo = client.get('/api/day/2024-06-04?tz=Asia/Tokyo').get_json()
+    assert [event['title'] for event in tokyo['events']] == ['Late call', 'Daily']
+    assert tokyo['occupancy']['busy_minutes'] == 90
+
+    week = client.get('/api/week/2024-06-05').get_json()
+    assert (week['start'], week['end']) == ('2024-06-02', '2024-06-09')
+    heatmap = client.get('/api/occupancy?start=2024-06-03&end=2024-06-04').get_json()
+    assert heatmap['2024-06-04']['event_count'] == 2
+
+
+@pytest.mark.parametrize('url', [
+    '/api/day/9999-12-31',
+    '/api/week/0001-01-01',
+    '/api/agenda?start=9999-12-20',
+    '/api/occupancy?start=9999-12-01&end=9999-12-31',
+])
+def test_views_reject_dates_out_of_range(client, url):
+    response = client.get(url)
+    assert response.status_code == 400
+    assert 'Year must be between' in response.get_json()['error']
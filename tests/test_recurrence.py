@@ -0,0 +1,66 @@
+"""
+Tests for recurrence expansion.
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from utils.recurrence import RecurrenceEngine
+
+Series = namedtuple('Series', 'id start_time end_time recurrence timezone')
+
+
+def test_expansion_returns_only_occurrences_in_the_window():
+    engine = RecurrenceEngine()
+    event = Series(1, datetime(2020, 1, 6, 9), datetime(2020, 1, 6, 10), 'weekly', 'UTC')
+
+    occurrences = engine.expand(event, datetime(2024, 6, 1), datetime(2024, 6, 15))
+
+    assert occurrences == [
+        (datetime(2024, 6, 3, 9), datetime(2024, 6, 3, 10)),
+        (datetime(2024, 6, 10, 9), datetime(2024, 6, 10, 10)),
+    ]
+
+
+def test_expansion_includes_an_occurrence_running_into_the_window():
+    engine = RecurrenceEngine()
+    event = Series(1, datetime(2024, 1, 1, 22), datetime(2024, 1, 2, 2), 'daily', 'UTC')
+
+    occurrences = engine.expand(event, datetime(2024, 3, 1), datetime(2024, 3, 2))
+
+    assert occurrences[0] == (datetime(2024, 2, 29, 22), datetime(2024, 3, 1, 2))
+    assert len(occurrences) == 2
+
+
+def test_monthly_series_keep_their_day_of_month():
+    engine = RecurrenceEngine()
+    event = Series(1, datetime(2024, 1, 31, 12), None, 'monthly', 'UTC')
+
+    starts = [start for start, _ in engine.expand(event, datetime(2024, 1, 1), datetime(2024, 6, 1))]
+
+    # Months without a 31st are skipped rather than shifted
+    assert starts == [datetime(2024, 1, 31, 12), datetime(2024, 3, 31, 12), datetime(2024, 5, 31, 12)]
+
+
+def test_series_keep_their_local_time_across_dst():
+    engine = RecurrenceEngine()
+    # 09:00 in Berlin, stored as 08:00 UTC in winter
+    event = Series(1, datetime(2024, 3, 4, 8), datetime(2024, 3, 4, 9), 'weekly', 'Europe/Berlin')
+
+    starts = [start for start, _ in engine.expand(event, datetime(2024, 3, 20), datetime(2024, 4, 5))]
+
+    # Clocks go forward on March 31
+    assert starts == [datetime(2024, 3, 25, 8), datetime(2024, 4, 1, 7)]
+
+
+def test_cached_expansion_is_recomputed_when_the_series_changes():
+    engine = RecurrenceEngine()
+    window = (datetime(2024, 6, 1), datetime(2024, 6, 8))
+    event = Series(1, datetime(2024, 1, 1, 9), None, 'daily', 'UTC')
+    assert len(engine.expand(event, *window)) == 7
+
+    moved = event._replace(start_time=datetime(2024, 6, 5, 9))
+
+    assert [start for start, _ in engine.expand(moved, *window)] == [
+        datetime(2024, 6, 5, 9) + timedelta(days=day) for day in range(3)
+    ]
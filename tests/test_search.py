@@ -0,0 +1,69 @@
+"""
+Tests for full-text search.
+"""
+
+from datetime import datetime
+
+
+def _search(client, query):
+    response = client.get(f'/api/search?{query}')
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_results_are_ranked_and_filtered(client):
+    client.post('/api/events', json={
+        'title': 'Dentist appointment', 'start_date': '2024-06-03T09:00:00Z'
+    })
+    client.post('/api/events', json={
+        'title': 'Errands', 'description': 'Call the dentist', 'start_date': '2024-07-03T09:00:00Z'
+    })
+    client.post('/api/notes/new', json={'date': '2024-06-04', 'content': 'Dentists are expensive'})
+
+    results = _search(client, 'q=dent')['results']
+    titles = [result['title'] for result in results]
+    # Title matches rank above description matches
+    assert titles[0] == 'Dentist appointment'
+    assert titles.index('Errands') > 0
+    assert {result['type'] for result in results} == {'event', 'note'}
+
+    june = _search(client, 'q=dentist&type=event&start=2024-06-01&end=2024-06-30')['results']
+    assert [result['title'] for result in june] == ['Dentist appointment']
+
+
+def test_index_follows_updates_and_deletes(client):
+    event_id = client.post('/api/events', json={
+        'title': 'Piano lesson', 'start_date': '2024-06-03T09:00:00Z'
+    }).get_json()['event']['id']
+
+    client.put(f'/api/events/{event_id}', json={'title': 'Guitar lesson'})
+    assert _search(client, 'q=piano')['results'] == []
+    assert [result['id'] for result in _search(client, 'q=guitar')['results']] == [event_id]
+
+    client.delete(f'/api/events/{event_id}')
+    assert _search(client, 'q=guitar')['results'] == []
+
+
+def test_query_syntax_is_matched_literally(client):
+    client.post('/api/events', json={'title': 'Team sync', 'start_date': '2024-06-03T09:00:00Z'})
+
+    assert len(_search(client, 'q=team:"sync*')['results']) == 1
+
+
+def test_pages_are_bounded(client):
+    assert _search(client, 'q=anything&page=501&per_page=20')['results'] == []
+
+    response = client.get('/api/search?q=a&page=99999999999999999999')
+    assert response.status_code == 400
+
+
+def test_date_bounds_are_validated(client):
+    assert client.get('/api/search?q=a&end=9999-12-31').status_code == 400
+    assert client.get('/api/search?q=a&start=0001-01-01').status_code == 400
+    assert client.get('/api/search?q=a&start=June').get_json()['error'] == 'Dates must be YYYY-MM-DD'
+
+
+def test_bulk_imported_rows_are_indexed(db_manager):
+    db_manager.bulk_insert_notes([{'date': datetime(2024, 6, 3), 'content': 'Bulk imported remark'}])
+
+    assert [result['snippet'] for result in db_manager.search('remark')] == ['Bulk imported remark']
@@ -0,0 +1,62 @@
+"""
+Tests for the settings snapshot.
+"""
+
+from sqlalchemy.exc import SQLAlchemyError
+
+import web_app
+from database.db_manager import DatabaseManager, UnitOfWorkSession
+from utils.settings import SettingsManager
+
+
+def test_updates_are_returned_and_persist(client):
+    response = client.put('/api/settings', json={'timezone': 'Asia/Tokyo', 'theme': 'dark'})
+
+    assert response.get_json()['settings']['timezone'] == 'Asia/Tokyo'
+    settings = client.get('/api/settings').get_json()
+    assert (settings['timezone'], settings['theme']) == ('Asia/Tokyo', 'dark')
+    assert settings['week_start'] == 'monday'
+
+
+def test_unknown_settings_are_rejected(client):
+    assert client.put('/api/settings', json={'colour': 'blue'}).status_code == 400
+    assert client.put('/api/settings', json={'timezone': 'Mars/Olympus'}).status_code == 400
+
+
+def test_writes_by_another_process_are_seen(client):
+    assert client.get('/api/settings').get_json()['timezone'] == 'UTC'
+    other = SettingsManager(DatabaseManager(web_app.db_manager.db_path))
+    other.db_manager.initialize_database()
+
+    other.set_setting('timezone', 'Asia/Tokyo')
+
+    assert client.get('/api/settings').get_json()['timezone'] == 'Asia/Tokyo'
+    other.db_manager.engine.dispose()
+
+
+def test_snapshot_is_reused_until_the_settings_change(db_manager):
+    settings = SettingsManager(db_manager)
+    settings.get_setting('timezone')
+    calls = []
+    get_all_settings = db_manager.get_all_settings
+    db_manager.get_all_settings = lambda: calls.append(1) or get_all_settings()
+
+    settings.get_setting('theme')
+    assert calls == []
+    settings.set_setting('theme', 'dark')
+    assert settings.get_setting('theme') == 'dark'
+    assert calls == [1]
+
+
+def test_failed_commit_does_not_leave_uncommitted_values_cached(client, monkeypatch):
+    def fail(self):
+        raise SQLAlchemyError('disk I/O error')
+    monkeypatch.setattr(UnitOfWorkSession, 'commit_unit_of_work', fail)
+
+    response = client.put('/api/settings', json={'timezone': 'Asia/Tokyo'})
+    monkeypatch.undo()
+
+    assert response.status_code == 500
+    assert response.get_json() == {'error': 'Failed to save changes'}
+    assert 'method="PUT",route="/api/settings",status="500"' in web_app.metrics.render()
+    assert client.get('/api/settings').get_json()['timezone'] == 'UTC'
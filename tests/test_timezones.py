@@ -0,0 +1,113 @@
+"""
+Tests for the timezone conversions, checked against pytz, and the zone catalogue.
+"""
+
+import gzip
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+from utils.timezone_manager import CATALOGUE_MAX_AGE, TimezoneManager
+
+ZONES = ['Europe/Berlin', 'America/New_York', 'Australia/Sydney', 'Asia/Kolkata', 'UTC', 'Etc/GMT+5']
+
+# Around the local wall times skipped and repeated by DST changes, and far
+# outside the range of pytz's transition tables
+WALL_TIMES = [
+    datetime(2024, 3, 31, 1, 59), datetime(2024, 3, 31, 2, 30), datetime(2024, 3, 31, 3, 0),
+    datetime(2024, 10, 27, 1, 59), datetime(2024, 10, 27, 2, 30), datetime(2024, 10, 27, 3, 0),
+    datetime(2024, 3, 10, 2, 30), datetime(2024, 11, 3, 1, 30),
+    datetime(2024, 4, 7, 2, 30), datetime(2024, 10, 6, 2, 30),
+    datetime(1000, 1, 1), datetime(1850, 6, 1), datetime(8999, 7, 1, 12),
+]
+
+
+def _pytz_to_utc(value, timezone_name):
+    return pytz.timezone(timezone_name).localize(value, is_dst=False).astimezone(pytz.utc).replace(tzinfo=None)
+
+
+@pytest.mark.parametrize('timezone_name', ZONES)
+def test_local_to_utc_matches_pytz(timezone_name):
+    assert TimezoneManager().local_to_utc(WALL_TIMES, timezone_name) == [
+        _pytz_to_utc(value, timezone_name) for value in WALL_TIMES
+    ]
+
+
+@pytest.mark.parametrize('timezone_name', ZONES)
+def test_utc_to_local_matches_pytz(timezone_name):
+    # Every quarter hour across the DST changes, plus the far past and future
+    instants = [datetime(2024, month, day, 0) + timedelta(minutes=15 * i)
+                for month, day in ((3, 9), (3, 30), (4, 6), (10, 5), (10, 26), (11, 2)) for i in range(24 * 4 * 2)]
+    instants += [datetime(1000, 1, 1, 12), datetime(1850, 6, 1), datetime(8999, 7, 1, 12)]
+    tz = pytz.timezone(timezone_name)
+
+    converted = TimezoneManager().utc_to_local(instants, timezone_name)
+
+    expected = [pytz.utc.localize(value).astimezone(tz) for value in instants]
+    assert [(value.replace(tzinfo=None), value.utcoffset(), value.tzname()) for value in converted] == [
+        (value.replace(tzinfo=None), value.utcoffset(), value.tzname()) for value in expected
+    ]
+
+
+def test_gaps_and_overlaps_resolve_like_localize_without_dst():
+    manager = TimezoneManager()
+    skipped, repeated = datetime(2024, 3, 31, 2, 30), datetime(2024, 10, 27, 2, 30)
+
+    # A skipped time is read with the offset before the gap, a repeated one as standard time
+    assert manager.local_to_utc([skipped, repeated], 'Europe/Berlin') == [
+        datetime(2024, 3, 31, 1, 30), datetime(2024, 10, 27, 1, 30)
+    ]
+
+
+def test_aware_values_and_none_pass_through():
+    manager = TimezoneManager()
+    aware = pytz.timezone('Asia/Tokyo').localize(datetime(2024, 6, 3, 9))
+
+    assert manager.local_to_utc([aware, None], 'Europe/Berlin') == [datetime(2024, 6, 3, 0), None]
+    assert manager.utc_to_local([None], 'Europe/Berlin') == [None]
+    with pytest.raises(ValueError, match='Unknown timezone'):
+        manager.local_to_utc([datetime(2024, 6, 3)], 'Mars/Olympus')
+
+
+def test_catalogue_describes_each_zone_until_the_next_transition():
+    manager = TimezoneManager()
+
+    catalogue = manager.get_timezone_catalogue(now=datetime(2024, 3, 9))
+
+    berlin = catalogue.zones['Europe/Berlin']
+    assert berlin == {
+        'name': 'Europe/Berlin', 'common': True, 'utc_offset': '+01:00', 'offset_minutes': 60,
+        'dst_active': False, 'abbreviation': 'CET', 'next_transition': '2024-03-31T01:00:00Z',
+    }
+    assert catalogue.zones['Asia/Kolkata']['utc_offset'] == '+05:30'
+    assert catalogue.zones['America/St_Johns']['offset_minutes'] == -210
+    # Valid until the earliest upcoming transition of any zone, or for at most CATALOGUE_MAX_AGE
+    assert catalogue.expires_at == min(
+        [datetime(2024, 3, 9) + CATALOGUE_MAX_AGE] + [
+            datetime.fromisoformat(zone['next_transition'][:-1])
+            for zone in catalogue.zones.values() if zone['next_transition']
+        ]
+    )
+    assert manager.get_timezone_catalogue(now=catalogue.expires_at - timedelta(seconds=1)) is catalogue
+
+    summer = manager.get_timezone_catalogue(now=datetime(2024, 4, 1))
+    assert (summer.zones['Europe/Berlin']['abbreviation'], summer.etag != catalogue.etag) == ('CEST', True)
+
+
+def test_endpoint_is_cached_until_the_catalogue_expires(client):
+    import web_app
+    response = client.get('/api/timezones')
+    catalogue = web_app.timezone_manager.get_timezone_catalogue()
+
+    assert response.status_code == 200
+    assert response.get_json()['valid_until'] == catalogue.expires_at.isoformat() + 'Z'
+    max_age = int(response.headers['Cache-Control'].split('max-age=')[1])
+    assert abs(max_age - (catalogue.expires_at - datetime.utcnow()).total_seconds()) < 5
+
+    not_modified = client.get('/api/timezones', headers={'If-None-Match': response.headers['ETag']})
+    assert (not_modified.status_code, not_modified.get_data()) == (304, b'')
+
+    compressed = client.get('/api/timezones', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.content_encoding == 'gzip'
+    assert gzip.decompress(compressed.get_data()) == response.get_data()
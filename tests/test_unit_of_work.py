@@ -0,0 +1,66 @@
+"""
+Tests for the per-request unit of work.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+
+def test_calls_share_one_session_and_commit_once(db_manager):
+    committed = []
+    with db_manager.unit_of_work() as session:
+        assert db_manager.get_session() is session
+        db_manager.create_event('First', datetime(2024, 6, 3, 9))
+        db_manager.create_event('Second', datetime(2024, 6, 3, 10))
+        db_manager.on_commit(lambda: committed.append(True))
+        assert committed == []
+
+    assert committed == [True]
+    assert len(db_manager.get_events(datetime(2024, 6, 3), datetime(2024, 6, 4))) == 2
+
+
+def test_ending_without_commit_discards_writes_and_callbacks(db_manager):
+    committed = []
+    db_manager.begin_unit_of_work()
+    db_manager.create_event('Discarded', datetime(2024, 6, 3, 9))
+    db_manager.on_commit(lambda: committed.append(True))
+    db_manager.end_unit_of_work()
+
+    assert db_manager.get_events(datetime(2024, 6, 3), datetime(2024, 6, 4)) == []
+    assert committed == []
+
+
+def test_failed_block_rolls_back(db_manager):
+    with pytest.raises(RuntimeError):
+        with db_manager.unit_of_work():
+            db_manager.create_event('Discarded', datetime(2024, 6, 3, 9))
+            raise RuntimeError
+
+    assert db_manager.get_events(datetime(2024, 6, 3), datetime(2024, 6, 4)) == []
+
+
+def test_failed_commit_raises(db_manager, monkeypatch):
+    def fail():
+        raise SQLAlchemyError('disk full')
+
+    with pytest.raises(SQLAlchemyError):
+        with db_manager.unit_of_work() as session:
+            db_manager.create_event('Lost', datetime(2024, 6, 3, 9))
+            monkeypatch.setattr(session, 'commit_unit_of_work', fail)
+
+
+def test_rejected_request_saves_nothing(client):
+    client.post('/api/events', json={
+        'title': 'Existing', 'start_date': '2024-06-03T09:00:00Z', 'end_date': '2024-06-03T10:00:00Z'
+    })
+
+    response = client.post('/api/events', json={
+        'title': 'Clash', 'start_date': '2024-06-03T09:30:00Z', 'end_date': '2024-06-03T10:30:00Z',
+        'reject_conflicts': True
+    })
+
+    assert response.status_code == 409
+    titles = [event['title'] for event in client.get('/api/events?year=2024&month=6').get_json()]
+    assert titles == ['Existing']
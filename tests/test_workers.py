@@ -0,0 +1,33 @@
+"""
+Tests for workers forked from an initialized process.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import text
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs os.fork')
+def test_forked_child_opens_its_own_connections(db_manager):
+    with db_manager.engine.connect() as conn:
+        parent_connection = conn.connection.dbapi_connection
+    assert db_manager.engine.pool.checkedin() == 1
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            inherited = db_manager.engine.pool.checkedin()
+            with db_manager.engine.connect() as conn:
+                conn.execute(text("SELECT COUNT(*) FROM events"))
+                fresh = conn.connection.dbapi_connection is not parent_connection
+            os._exit(0 if inherited == 0 and fresh else 1)
+        except BaseException:
+            os._exit(2)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    # The parent's pooled connection was left open and is still usable
+    with db_manager.engine.connect() as conn:
+        assert conn.connection.dbapi_connection is parent_connection
+        conn.execute(text("SELECT COUNT(*) FROM events"))
@@ -0,0 +1,254 @@
+"""
+Streaming bulk import/export formats for the Calendar App.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from utils.ical import (
+    CALENDAR_HEADER, CALENDAR_FOOTER, format_vevent, format_vtimezone, iter_vevents, vevent_to_event
+)
+from utils.recurrence import RECURRENCE_FREQUENCIES
+from utils.timezone_manager import TimezoneManager, check_year
+
+FORMATS = ('ndjson', 'csv', 'ics')
+KINDS = ('events', 'notes')
+DEFAULT_CHUNK_SIZE = 5000
+
+# Columns of each record kind, in export order
+EVENT_FIELDS = ['id', 'title', 'description', 'start_date', 'end_date', 'category', 'recurrence', 'timezone']
+NOTE_FIELDS = ['id', 'date', 'content']
+
+MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'ics': 'text/calendar',
+}
+
+EXTENSIONS = {
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.csv': 'csv',
+    '.ics': 'ics',
+}
+
+
+_timezones = TimezoneManager()
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most `size` items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _parse_datetime(value: str) -> datetime:
+    """Parse an ISO date or date-time string, keeping any UTC offset."""
+    return datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+
+
+def _check_years(*values: Optional[datetime]):
+    """Raise ValueError unless every given time is in a year the calendar accepts."""
+    for value in values:
+        if value is not None:
+            check_year(value.year)
+
+
+def event_row(record: Dict, fmt: str) -> Dict:
+    """Convert an imported event record into an events table row.
+
+    Times with a UTC offset are exact; times without one are wall time in
+    the record's timezone, UTC by default. Rows store naive UTC.
+    """
+    if fmt == 'ics':
+        row = vevent_to_event(record)
+    else:
+        row = {
+            'title': record['title'],
+            'description': record.get('description') or '',
+            'start_time': _parse_datetime(record['start_date']),
+            'end_time': _parse_datetime(record['end_date']) if record.get('end_date') else None,
+            'category': record.get('category') or 'General',
+            'recurrence': record.get('recurrence') or None,
+            'timezone': record.get('timezone') or 'UTC',
+        }
+    _check_years(row['start_time'], row['end_time'])
+    row['start_time'], row['end_time'] = _timezones.local_to_utc([row['start_time'], row['end_time']], row['timezone'])
+    if not row['title']:
+        raise ValueError("Event title is required")
+    if row['recurrence'] is not None and row['recurrence'] not in RECURRENCE_FREQUENCIES:
+        raise ValueError(f"Unsupported recurrence: {row['recurrence']}")
+    return row
+
+
+def note_row(record: Dict, fmt: str) -> Dict:
+    """Convert an imported note record into a notes table row."""
+    note_date = _parse_datetime(record['date'])
+    _check_years(note_date)
+    return {
+        'date': datetime.combine(note_date.date(), datetime.min.time()),
+        'content': record.get('content') or '',
+    }
+
+
+def read_records(stream: TextIO, fmt: str, kind: str) -> Iterator[Dict]:
+    """Stream raw records of one kind ('events' or 'notes') from text input."""
+    if fmt == 'ndjson':
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    elif fmt == 'csv':
+        yield from csv.DictReader(stream)
+    elif fmt == 'ics':
+        if kind != 'events':
+            raise ValueError("iCalendar import is only supported for events")
+        yield from iter_vevents(stream)
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def read_rows(stream: TextIO, fmt: str, kind: str, errors: List[str]) -> Iterator[Dict]:
+    """Stream table rows from text input, collecting invalid records in `errors`."""
+    to_row = event_row if kind == 'events' else note_row
+    for number, record in enumerate(read_records(stream, fmt, kind), start=1):
+        try:
+            yield to_row(record, fmt)
+        except (KeyError, TypeError, ValueError, OverflowError) as e:
+            errors.append(f"Record {number}: {e!r}")
+
+
+def import_stream(db_manager, stream: TextIO, fmt: str, kind: str,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[int, List[str]]:
+    """Import records from a text stream, committing one transaction per chunk.
+
+    Returns the number of rows imported and the errors for skipped records.
+    """
+    insert_chunk = db_manager.bulk_insert_events if kind == 'events' else db_manager.bulk_insert_notes
+    errors = []
+    imported = 0
+    for chunk in chunked(read_rows(stream, fmt, kind, errors), chunk_size):
+        inserted = insert_chunk(chunk)
+        if inserted is None:
+            errors.append(f"Failed to insert a chunk of {len(chunk)} records")
+            break
+        imported += inserted
+    return imported, errors
+
+
+def export_stream(db_manager, fmt: str, kind: str) -> Iterator[str]:
+    """Stream every record of one kind from the database as formatted text."""
+    rows = db_manager.iter_events() if kind == 'events' else db_manager.iter_notes()
+    timezone_spans = db_manager.get_event_timezone_spans() if fmt == 'ics' else None
+    return write_records(rows, fmt, kind, timezone_spans)
+
+
+def _event_record(row) -> Dict:
+    """Convert an exported events row into a record."""
+    return {
+        'id': row.id,
+        'title': row.title,
+        'description': row.description or '',
+        'start_date': row.start_time.isoformat() + 'Z',
+        'end_date': row.end_time.isoformat() + 'Z' if row.end_time else '',
+        'category': row.category,
+        'recurrence': row.recurrence or '',
+        'timezone': row.timezone,
+    }
+
+
+def _note_record(row) -> Dict:
+    """Convert an exported notes row into a record."""
+    return {
+        'id': row.id,
+        'date': row.date.date().isoformat(),
+        'content': row.content or '',
+    }
+
+
+def write_records(rows: Iterable, fmt: str, kind: str,
+                  timezone_spans: Optional[Dict[str, Tuple]] = None) -> Iterator[str]:
+    """Stream exported rows as text chunks in the given format.
+
+    timezone_spans, from DatabaseManager.get_event_timezone_spans(), lets
+    an iCalendar export define its timezones before the events.
+    """
+    if fmt == 'ics':
+        if kind != 'events':
+            raise ValueError("iCalendar export is only supported for events")
+        return _write_ics(rows, timezone_spans or {})
+
+    to_record = _event_record if kind == 'events' else _note_record
+    if fmt == 'ndjson':
+        return (json.dumps(to_record(row)) + "\n" for row in rows)
+    if fmt == 'csv':
+        return _write_csv((to_record(row) for row in rows), EVENT_FIELDS if kind == 'events' else NOTE_FIELDS)
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+def _write_csv(records: Iterable[Dict], fields: List[str]) -> Iterator[str]:
+    """Stream records as CSV, one line per chunk."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _vtimezone(timezone_name: str, first_start: datetime, last_end: datetime, recurring: bool) -> str:
+    """Format the VTIMEZONE covering events of one zone from first_start to last_end (naive UTC).
+
+    Recurring events run on, so their zone is covered to the end of its
+    transition table.
+    """
+    return format_vtimezone(timezone_name, _timezones.get_observances(
+        timezone_name, first_start, datetime.max if recurring else last_end
+    ))
+
+
+def _write_ics(rows: Iterable, timezone_spans: Dict[str, Tuple]) -> Iterator[str]:
+    """Stream events rows as an iCalendar document.
+
+    Every timezone other than UTC gets a VTIMEZONE: those in
+    timezone_spans before the events, any other found while streaming
+    (e.g. written after the spans were read) at the end.
+    """
+    yield CALENDAR_HEADER
+    for timezone_name, span in timezone_spans.items():
+        if timezone_name != 'UTC':
+            yield _vtimezone(timezone_name, *span)
+    late_spans = {}
+    for row in rows:
+        if row.timezone != 'UTC' and row.timezone not in timezone_spans:
+            first_start, last_end, recurring = late_spans.get(row.timezone, (row.start_time, row.start_time, False))
+            late_spans[row.timezone] = (
+                min(first_start, row.start_time),
+                max(last_end, row.end_time or row.start_time),
+                recurring or bool(row.recurrence),
+            )
+        start_time, end_time = _timezones.utc_to_local([row.start_time, row.end_time], row.timezone)
+        yield format_vevent(
+            uid=f"event-{row.id}@calendar-app",
+            title=row.title,
+            start_time=start_time.replace(tzinfo=None),
+            end_time=end_time.replace(tzinfo=None) if end_time else None,
+            description=row.description,
+            category=row.category,
+            recurrence=row.recurrence,
+            last_modified=row.last_modified,
+            timezone_name=row.timezone,
+        )
+    for timezone_name, span in late_spans.items():
+        yield _vtimezone(timezone_name, *span)
+    yield CALENDAR_FOOTER
@@ -0,0 +1,132 @@
+"""
+Business-day arithmetic for the Calendar App.
+
+Working days are precomputed per year: the holiday bitsets of the
+requested countries are combined with the weekend, and a prefix array
+holds the number of working days before each day of the year. Counting
+working days in a range, or finding the date N working days away, then
+costs a lookup or a bisect per year spanned instead of a holiday check
+for every day.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import Iterable, Tuple
+
+from utils.cache import LRUCache
+
+# Weekday numbers (Monday = 0) that are never working days
+WEEKEND = (5, 6)
+# Years the holidays package can compute for every supported country
+# (the Chinese lunar calendar tables end in 2099)
+MIN_YEAR = 1901
+MAX_YEAR = 2099
+
+
+def _day_of_year(day: date) -> int:
+    """Get the 0-based index of a date within its year."""
+    return day.toordinal() - date(day.year, 1, 1).toordinal()
+
+
+class BusinessDayCalendar:
+    """Counts and offsets working days for a set of holiday countries."""
+    
+    def __init__(self, holiday_manager, weekend: Iterable[int] = WEEKEND, cache_size: int = 256):
+        """Initialize the calendar on top of a HolidayManager."""
+        self.holiday_manager = holiday_manager
+        self.weekend = frozenset(weekend)
+        # (countries, year) -> prefix array; entry i counts working days before day i
+        self.cache = LRUCache(cache_size)
+    
+    def _countries_key(self, countries: Iterable[str]) -> Tuple[str, ...]:
+        """Normalize a country list into a cache key."""
+        return tuple(sorted(set(countries)))
+    
+    def _year(self, countries: Tuple[str, ...], year: int) -> array:
+        """Get the working-day prefix array of a year, building it once.
+
+        Raises ValueError for an unsupported country or a year out of range.
+        """
+        if not MIN_YEAR <= year <= MAX_YEAR:
+            raise ValueError(f"Business days are only available from {MIN_YEAR} to {MAX_YEAR}")
+        key = (countries, year)
+        prefix = self.cache.get(key)
+        if prefix is not None:
+            return prefix
+        
+        closed = 0
+        for country_code in countries:
+            bitset = self.holiday_manager.get_holiday_bitset(country_code, year)
+            if bitset is None:
+                raise ValueError(f"Unsupported country: {country_code}")
+            closed |= bitset
+        
+        first_weekday = date(year, 1, 1).weekday()
+        days_in_year = date(year, 12, 31).toordinal() - date(year, 1, 1).toordinal() + 1
+        prefix = array('H', [0])
+        working = 0
+        for day in range(days_in_year):
+            if not (closed >> day) & 1 and (first_weekday + day) % 7 not in self.weekend:
+                working += 1
+            prefix.append(working)
+        self.cache.set(key, prefix)
+        return prefix
+    
+    def is_working_day(self, day: date, countries: Iterable[str]) -> bool:
+        """Check whether a date is neither a weekend day nor a holiday."""
+        prefix = self._year(self._countries_key(countries), day.year)
+        index = _day_of_year(day)
+        return prefix[index + 1] > prefix[index]
+    
+    def count_working_days(self, start: date, end: date, countries: Iterable[str]) -> int:
+        """Count the working days in [start, end); negative when end is before start.
+
+        Raises ValueError for an unsupported country or a date outside
+        MIN_YEAR..MAX_YEAR.
+        """
+        if end < start:
+            return -self.count_working_days(end, start, countries)
+        key = self._countries_key(countries)
+        
+        first = self._year(key, start.year)
+        if start.year == end.year:
+            return first[_day_of_year(end)] - first[_day_of_year(start)]
+        
+        total = first[-1] - first[_day_of_year(start)]
+        for year in range(start.year + 1, end.year):
+            total += self._year(key, year)[-1]
+        return total + self._year(key, end.year)[_day_of_year(end)]
+    
+    def add_working_days(self, start: date, days: int, countries: Iterable[str]) -> date:
+        """Get the date that is `days` working days after start (before it if negative).
+
+        The start date itself is not counted, so one working day after a
+        Friday is the next working Monday. Zero returns start unchanged.
+        Raises ValueError for an unsupported country or a date outside
+        MIN_YEAR..MAX_YEAR.
+        """
+        if days == 0:
+            return start
+        key = self._countries_key(countries)
+        year = start.year
+        prefix = self._year(key, year)
+        index = _day_of_year(start)
+        
+        if days > 0:
+            # Working days up to and including the target, counted from January 1st
+            target = prefix[index + 1] + days
+            while target > prefix[-1]:
+                target -= prefix[-1]
+                year += 1
+                prefix = self._year(key, year)
+            offset = bisect_left(prefix, target) - 1
+        else:
+            # Working days before the target, counted from January 1st
+            target = prefix[index] + days
+            while target < 0:
+                year -= 1
+                prefix = self._year(key, year)
+                target += prefix[-1]
+            offset = bisect_right(prefix, target) - 1
+        return date(year, 1, 1) + timedelta(days=offset)
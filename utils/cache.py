@@ -0,0 +1,110 @@
+"""
+In-process caching utilities for the Calendar App.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe, size-bounded least-recently-used cache with hit/miss counters."""
+    
+    def __init__(self, max_size: int = 1024):
+        """Initialize the cache."""
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, marking it as recently used."""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+    
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove and return a cached value."""
+        with self._lock:
+            return self._data.pop(key, default)
+    
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every entry whose key matches the predicate."""
+        with self._lock:
+            stale = [key for key in self._data if predicate(key)]
+            for key in stale:
+                del self._data[key]
+            return len(stale)
+    
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Get size and hit/miss counters."""
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class MonthResponseCache:
+    """Pre-serialized responses keyed by (year, month, variant).
+
+    Entries are stored under the events table version they were built
+    from (DatabaseManager.get_events_version()) and looked up under the
+    current one. The version lives in the database, so a write by any
+    process makes every older entry unreachable, and a response built
+    from a read that raced a write is never served once the write has
+    committed. Unreachable entries age out of the LRU.
+
+    Any event write therefore expires every month, not only the months it
+    touches. That is deliberate: per-month invalidation across processes
+    would need per-month counters in the database, and a recurring series
+    touches every month after its start, so those writes would still
+    expire an unbounded range. Reading workloads, where the cache pays
+    off, rarely write.
+    """
+    
+    def __init__(self, max_entries: int = 256):
+        """Initialize the response cache."""
+        self.cache = LRUCache(max_entries)
+    
+    def get(self, key: Hashable, version: int) -> Any:
+        """Get a response body built at `version`, or None."""
+        return self.cache.get((key, version))
+    
+    def set(self, key: Hashable, body: Any, version: int):
+        """Store a response body built from the database at `version`."""
+        self.cache.set((key, version), body)
+    
+    def clear(self):
+        """Drop every cached response."""
+        self.cache.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Get size and hit/miss counters."""
+        return self.cache.stats()
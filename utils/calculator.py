@@ -0,0 +1,174 @@
+"""
+Safe arithmetic evaluation for the Calendar App calculator.
+
+Expressions are parsed with the ast module, checked against a whitelist
+of operators and compiled into a short postfix program. The length,
+operation count, exponent and magnitude limits bound the work of any
+request, so no input can stall a worker.
+"""
+
+import ast
+import math
+import operator
+from typing import List, Tuple, Union
+
+from .cache import LRUCache
+
+Number = Union[int, float]
+
+MAX_EXPRESSION_LENGTH = 256
+# Operators and literals in one expression; bounds the evaluation steps
+MAX_OPERATIONS = 128
+# Largest absolute value of any literal, intermediate or result
+MAX_MAGNITUDE = 10 ** 100
+MAX_EXPONENT = 1000
+
+# Display symbols accepted in place of the Python operators
+_SYMBOLS = str.maketrans({'×': '*', '÷': '/', '−': '-'})
+
+
+class CalculatorError(ValueError):
+    """Raised for an expression that is invalid or exceeds the limits."""
+
+
+def _check(value: Number) -> Number:
+    """Reject values outside the allowed magnitude."""
+    if isinstance(value, float) and not math.isfinite(value):
+        raise CalculatorError("Result too large")
+    if abs(value) > MAX_MAGNITUDE:
+        raise CalculatorError("Result too large")
+    return value
+
+
+def _power(base: Number, exponent: Number) -> Number:
+    """Raise base to exponent, refusing results that would exceed the limits."""
+    if abs(exponent) > MAX_EXPONENT:
+        raise CalculatorError("Exponent too large")
+    # Estimate the size of an integer power before computing it
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and abs(base) > 1:
+        if (abs(base).bit_length() - 1) * exponent > MAX_MAGNITUDE.bit_length():
+            raise CalculatorError("Result too large")
+    if base == 0 and exponent < 0:
+        raise ZeroDivisionError
+    try:
+        result = base ** exponent
+    except OverflowError as e:
+        raise CalculatorError("Result too large") from e
+    if isinstance(result, complex):
+        raise CalculatorError("Result is not a real number")
+    return result
+
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _power,
+}
+
+_UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+def compile_expression(expression: str) -> Tuple[tuple, ...]:
+    """Compile an expression into a postfix program.
+
+    Each instruction is ('push', number), ('unary', function) or
+    ('binary', function). Raises CalculatorError for anything but numbers,
+    parentheses and the whitelisted arithmetic operators.
+    """
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise CalculatorError("Expression too long")
+    try:
+        tree = ast.parse(expression.translate(_SYMBOLS).strip(), mode='eval')
+    except (SyntaxError, ValueError, RecursionError, MemoryError) as e:
+        raise CalculatorError("Invalid expression") from e
+    
+    program: List[tuple] = []
+    # Iterative post-order walk, so deep nesting cannot hit the recursion limit
+    stack = [(tree.body, False)]
+    while stack:
+        node, visited = stack.pop()
+        if len(program) + len(stack) > MAX_OPERATIONS:
+            raise CalculatorError("Expression too complex")
+        if isinstance(node, ast.Constant):
+            value = node.value
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise CalculatorError("Invalid expression")
+            program.append(('push', _check(value)))
+        elif isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            if visited:
+                program.append(('binary', _BINARY_OPERATORS[type(node.op)]))
+            else:
+                stack.extend([(node, True), (node.right, False), (node.left, False)])
+        elif isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+            if visited:
+                program.append(('unary', _UNARY_OPERATORS[type(node.op)]))
+            else:
+                stack.extend([(node, True), (node.operand, False)])
+        else:
+            raise CalculatorError("Invalid expression")
+    return tuple(program)
+
+
+def run_program(program: Tuple[tuple, ...]) -> Number:
+    """Evaluate a program from compile_expression().
+
+    Raises CalculatorError on division by zero or a result out of range.
+    """
+    values: List[Number] = []
+    try:
+        for kind, argument in program:
+            if kind == 'push':
+                values.append(argument)
+            elif kind == 'unary':
+                values.append(_check(argument(values.pop())))
+            else:
+                right = values.pop()
+                values.append(_check(argument(values.pop(), right)))
+    except ZeroDivisionError as e:
+        raise CalculatorError("Division by zero") from e
+    except OverflowError as e:
+        raise CalculatorError("Result too large") from e
+    return values[0]
+
+
+class Calculator:
+    """Evaluates expressions, caching the outcome of recent ones.
+
+    Expressions have no variables, so a compiled program always has the
+    same value; the cache stores that value (or the error message) directly.
+    """
+    
+    def __init__(self, cache_size: int = 1024):
+        """Initialize the calculator."""
+        self._cache = LRUCache(max_size=cache_size)
+    
+    def evaluate(self, expression: str) -> Number:
+        """Evaluate an arithmetic expression.
+
+        Raises CalculatorError for an invalid expression, division by zero
+        or a value beyond the limits.
+        """
+        if len(expression) > MAX_EXPRESSION_LENGTH:
+            raise CalculatorError("Expression too long")
+        outcome = self._cache.get(expression)
+        if outcome is None:
+            try:
+                outcome = (run_program(compile_expression(expression)), None)
+            except CalculatorError as e:
+                outcome = (None, str(e))
+            self._cache.set(expression, outcome)
+        result, error = outcome
+        if error is not None:
+            raise CalculatorError(error)
+        return result
+    
+    def stats(self):
+        """Get cache hit/miss counters."""
+        return self._cache.stats()
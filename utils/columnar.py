@@ -0,0 +1,103 @@
+"""
+Columnar encoding of event occurrences for the month views.
+
+The JSON format repeats every key and a full ISO timestamp per event. The
+columnar format sends one array per field instead:
+
+- times are integer minutes since the Unix epoch (UTC), rounded down;
+- category, recurrence and timezone are dictionary-encoded, as indexes
+  into a short list of distinct values;
+- `offsets` lists the display timezone's UTC offsets over the span the
+  times cover, as [epoch minute from which it applies, offset in
+  minutes] pairs, so clients can render local times exactly without a
+  timezone database.
+
+static/calendar.js decodes it back into the JSON format's event objects.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+COLUMNAR_FORMAT = 'columnar'
+_EPOCH = datetime(1970, 1, 1)
+_MINUTE = timedelta(minutes=1)
+
+
+def epoch_minutes(value: datetime) -> int:
+    """Get the epoch minute of a naive UTC datetime, rounded down."""
+    return (value - _EPOCH) // _MINUTE
+
+
+class _Dictionary:
+    """Dictionary encoder: maps each distinct value to its first-seen index."""
+    
+    def __init__(self):
+        """Initialize an empty dictionary."""
+        self.indexes = {}
+        self.values = []
+    
+    def encode(self, value: Hashable) -> int:
+        """Get the index of a value, adding it on first sight."""
+        index = self.indexes.get(value)
+        if index is None:
+            index = self.indexes[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+def encode_occurrences(occurrences: List[Tuple], offsets_between) -> Dict:
+    """Encode (event, start, end) occurrences with naive UTC times as columns.
+
+    offsets_between(start, end) must return the display timezone's
+    (naive UTC instant, utcoffset) pairs in effect from start to end; see
+    TimezoneManager.get_offsets().
+    """
+    ids, titles, descriptions, starts, ends, series_starts = [], [], [], [], [], []
+    categories, recurrences, timezones = _Dictionary(), _Dictionary(), _Dictionary()
+    category, recurrence, timezone = [], [], []
+    for event, start_time, end_time in occurrences:
+        ids.append(event.id)
+        titles.append(event.title)
+        descriptions.append(event.description or '')
+        start = epoch_minutes(start_time)
+        starts.append(start)
+        ends.append(epoch_minutes(end_time) if end_time else start)
+        series_starts.append(epoch_minutes(event.start_time) if event.recurrence else None)
+        category.append(categories.encode(event.category))
+        recurrence.append(recurrences.encode(event.recurrence))
+        timezone.append(timezones.encode(event.timezone))
+    
+    return {
+        'format': COLUMNAR_FORMAT,
+        'count': len(ids),
+        'offsets': _encode_offsets(occurrences, offsets_between),
+        'id': ids,
+        'title': titles,
+        'description': descriptions,
+        'start': starts,
+        'end': ends,
+        'series_start': series_starts,
+        'category': category,
+        'categories': categories.values,
+        'recurrence': recurrence,
+        'recurrences': recurrences.values,
+        'timezone': timezone,
+        'timezones': timezones.values,
+    }
+
+
+def _encode_offsets(occurrences: Iterable[Tuple], offsets_between) -> List[List[int]]:
+    """Get [epoch minute, offset minutes] pairs covering every time of the occurrences."""
+    instants = []
+    for event, start_time, end_time in occurrences:
+        instants.append(start_time)
+        if end_time:
+            instants.append(end_time)
+        if event.recurrence:
+            instants.append(event.start_time)
+    if not instants:
+        return []
+    return [
+        [epoch_minutes(since), int(utcoffset.total_seconds()) // 60]
+        for since, utcoffset in offsets_between(min(instants), max(instants))
+    ]
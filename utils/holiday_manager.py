@@ -1,29 +1,48 @@
 """
 Holiday management utilities for the Calendar App.
+
+The holidays package is imported on first use: loading any country
+imports all of its country modules, which dominates startup, and
+precomputed holidays are read from the store without it.
 """
 
-import holidays
 from datetime import datetime, date
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional
+
+from utils.cache import LRUCache
 
 
 class HolidayManager:
     """Manages holiday data for multiple countries."""
     
-    def __init__(self):
-        """Initialize holiday manager."""
-        # We'll create holiday objects dynamically with years to ensure they work properly
+    def __init__(self, store=None, cache_size: int = 64):
+        """Initialize holiday manager.
+
+        `store` is an optional DatabaseManager holding precomputed holidays;
+        it is read before falling back to the holidays package.
+        """
+        self.store = store
+        # Names of the holidays package classes, resolved on first use;
+        # we'll create holiday objects dynamically with years to ensure they work properly
         self.supported_countries = {
-            'US': holidays.US,
-            'DE': holidays.Germany,  # Use full name for better compatibility
-            'CN': holidays.CN,
-            'GB': holidays.GB,
-            'CA': holidays.CA,
-            'FR': holidays.FR,
-            'JP': holidays.JP,
-            'AU': holidays.AU,
-            'IN': holidays.IN,
+            'US': 'US',
+            'DE': 'Germany',  # Use full name for better compatibility
+            'CN': 'CN',
+            'GB': 'GB',
+            'CA': 'CA',
+            'FR': 'FR',
+            'JP': 'JP',
+            'AU': 'AU',
+            'IN': 'IN',
         }
+        
+        # Subdivision used for countries whose holidays differ by state
+        self.default_subdivisions = {
+            'DE': 'BW',  # Baden-Württemberg
+        }
+        
+        # (country, subdivision, year) -> date-indexed and month-bucketed holiday maps
+        self.cache = LRUCache(cache_size)
     
     def get_supported_countries(self) -> List[str]:
         """Get list of supported countries."""
@@ -44,62 +63,143 @@ class HolidayManager:
         }
         return country_names.get(country_code, country_code)
     
+    def _get_country_year(self, country_code: str, year: int) -> Optional[Dict]:
+        """Get the cached holiday maps for one country and year."""
+        if country_code not in self.supported_countries:
+            return None
+        
+        subdivision = self.default_subdivisions.get(country_code)
+        key = (country_code, subdivision, year)
+        country_year = self.cache.get(key)
+        if country_year is None:
+            by_date = None
+            if self.store is not None:
+                by_date = self.store.get_stored_holidays(country_code, subdivision, year)
+            if by_date is None:
+                by_date = self._compute_holidays(country_code, subdivision, year)
+            country_year = self._build_country_year(by_date)
+            self.cache.set(key, country_year)
+        return country_year
+    
+    def _compute_holidays(self, country_code: str, subdivision: Optional[str], year: int) -> Dict[date, str]:
+        """Compute one country's holidays for a year with the holidays package."""
+        import holidays
+        country_class = getattr(holidays, self.supported_countries[country_code])
+        if subdivision:
+            country_holidays = country_class(subdiv=subdivision, years=year)
+        else:
+            country_holidays = country_class(years=year)
+        
+        return {
+            holiday_date: holiday_name
+            for holiday_date, holiday_name in sorted(country_holidays.items())
+            if holiday_date.year == year
+        }
+    
+    def _build_country_year(self, by_date: Dict[date, str]) -> Dict:
+        """Build the date-indexed and month-bucketed maps for one country and year.
+
+        'bitset' has bit i set when day i of the year (0 = January 1st) is a
+        holiday.
+        """
+        by_month = {}
+        bitset = 0
+        for holiday_date, holiday_name in by_date.items():
+            by_month.setdefault(holiday_date.month, {})[holiday_date] = holiday_name
+            bitset |= 1 << (holiday_date.timetuple().tm_yday - 1)
+        
+        return {'dates': by_date, 'months': by_month, 'bitset': bitset}
+    
+    def precompute(self, countries: Iterable[str], years: Iterable[int]) -> int:
+        """Materialize holidays into the store so workers skip live computation.
+
+        Returns the number of country/year combinations written.
+        """
+        if self.store is None:
+            raise ValueError("No holiday store configured")
+        
+        written = 0
+        for year in years:
+            for country_code in countries:
+                if country_code not in self.supported_countries:
+                    continue
+                subdivision = self.default_subdivisions.get(country_code)
+                holidays_by_date = self._compute_holidays(country_code, subdivision, year)
+                if self.store.store_holidays(country_code, subdivision, year, holidays_by_date):
+                    self.cache.pop((country_code, subdivision, year))
+                    written += 1
+        return written
+    
+    def prewarm(self, countries: Iterable[str], years: Iterable[int]):
+        """Load holidays for the given countries and years into the cache."""
+        for year in years:
+            for country_code in countries:
+                self._get_country_year(country_code, year)
+    
+    def _label_holidays(self, country_holidays: Dict[date, str], country_code: str,
+                        all_holidays: Dict[date, List[str]]):
+        """Add "Country: Holiday" labels for one country to a combined map."""
+        country_name = self.get_country_name(country_code)
+        for holiday_date, holiday_name in country_holidays.items():
+            all_holidays.setdefault(holiday_date, []).append(f"{country_name}: {holiday_name}")
+    
     def get_holidays_for_year(self, year: int, countries: List[str]) -> Dict[date, List[str]]:
         """Get holidays for a specific year and countries."""
         all_holidays = {}
         
         for country_code in countries:
-            if country_code in self.supported_countries:
-                # Create holiday object with the specific year
-                if country_code == 'DE':
-                    # For Germany, use a default state (BW - Baden-Württemberg) for now
-                    country_holidays = self.supported_countries[country_code](state='BW', years=year)
-                else:
-                    country_holidays = self.supported_countries[country_code](years=year)
-                
-                # Iterate through all holidays in the year
-                for holiday_date, holiday_name in country_holidays.items():
-                    if holiday_date.year == year:
-                        if holiday_date not in all_holidays:
-                            all_holidays[holiday_date] = []
-                        all_holidays[holiday_date].append(f"{self.get_country_name(country_code)}: {holiday_name}")
+            country_year = self._get_country_year(country_code, year)
+            if country_year:
+                self._label_holidays(country_year['dates'], country_code, all_holidays)
         
         return all_holidays
     
     def get_holidays_for_month(self, year: int, month: int, countries: List[str]) -> Dict[date, List[str]]:
         """Get holidays for a specific month and countries."""
-        year_holidays = self.get_holidays_for_year(year, countries)
         month_holidays = {}
         
-        for holiday_date, holiday_names in year_holidays.items():
-            if holiday_date.month == month:
-                month_holidays[holiday_date] = holiday_names
+        for country_code in countries:
+            country_year = self._get_country_year(country_code, year)
+            if country_year:
+                self._label_holidays(country_year['months'].get(month, {}), country_code, month_holidays)
         
         return month_holidays
     
+    def get_holidays_for_range(self, start_date: date, end_date: date, countries: List[str]) -> Dict[date, List[str]]:
+        """Get holidays between start_date (inclusive) and end_date (exclusive)."""
+        range_holidays = {}
+        
+        year, month = start_date.year, start_date.month
+        while date(year, month, 1) < end_date:
+            for holiday_date, holiday_names in self.get_holidays_for_month(year, month, countries).items():
+                if start_date <= holiday_date < end_date:
+                    range_holidays[holiday_date] = holiday_names
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        
+        return range_holidays
+    
     def is_holiday(self, check_date: date, countries: List[str]) -> bool:
         """Check if a date is a holiday in any of the specified countries."""
         for country_code in countries:
-            if country_code in self.supported_countries:
-                # Create holiday object with the specific year
-                if country_code == 'DE':
-                    country_holidays = self.supported_countries[country_code](state='BW', years=check_date.year)
-                else:
-                    country_holidays = self.supported_countries[country_code](years=check_date.year)
-                
-                if check_date in country_holidays:
-                    return True
+            country_year = self._get_country_year(country_code, check_date.year)
+            if country_year and check_date in country_year['dates']:
+                return True
         return False
     
+    def get_holiday_bitset(self, country_code: str, year: int) -> Optional[int]:
+        """Get a country's holidays in a year as a day-of-year bitset.
+
+        Bit i is set when day i of the year (0 = January 1st) is a holiday.
+        Returns None for an unsupported country.
+        """
+        country_year = self._get_country_year(country_code, year)
+        if country_year:
+            return country_year['bitset']
+        return None
+    
     def get_holiday_name(self, check_date: date, country_code: str) -> Optional[str]:
         """Get holiday name for a specific date and country."""
-        if country_code in self.supported_countries:
-            # Create holiday object with the specific year
-            if country_code == 'DE':
-                country_holidays = self.supported_countries[country_code](state='BW', years=check_date.year)
-            else:
-                country_holidays = self.supported_countries[country_code](years=check_date.year)
-            
-            return country_holidays.get(check_date)
+        country_year = self._get_country_year(country_code, check_date.year)
+        if country_year:
+            return country_year['dates'].get(check_date)
         return None
-
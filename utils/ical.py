@@ -0,0 +1,258 @@
+"""
+iCalendar (RFC 5545) reading and writing for the Calendar App.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+CALENDAR_HEADER = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//Calendar Web App//EN\r\n"
+    "CALSCALE:GREGORIAN\r\n"
+)
+CALENDAR_FOOTER = "END:VCALENDAR\r\n"
+
+# Onset given to a zone's first observance, which has none
+FIRST_ONSET = datetime(1601, 1, 1)
+
+# Event.recurrence values and their RRULE frequencies
+RRULE_FREQUENCIES = {
+    'daily': 'DAILY',
+    'weekly': 'WEEKLY',
+    'monthly': 'MONTHLY',
+    'yearly': 'YEARLY',
+}
+
+
+def escape_text(value: str) -> str:
+    """Escape a TEXT property value."""
+    return (
+        value.replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def unescape_text(value: str) -> str:
+    """Unescape a TEXT property value."""
+    result = []
+    chars = iter(value)
+    for char in chars:
+        if char == '\\':
+            escaped = next(chars, '')
+            result.append('\n' if escaped in ('n', 'N') else escaped)
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+def fold_line(line: str) -> str:
+    """Fold a content line to 75 octets as required by RFC 5545."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Never split a multi-byte UTF-8 sequence
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+        limit = 74  # Continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_datetime(value: datetime) -> str:
+    """Format a naive datetime as an iCalendar floating DATE-TIME."""
+    return value.strftime('%Y%m%dT%H%M%S')
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parse an iCalendar DATE or DATE-TIME value into a naive datetime.
+
+    UTC values ("Z" suffix) are returned as naive UTC; others are wall
+    time in the property's TZID, or floating.
+    """
+    value = value.strip()
+    if len(value) == 8:
+        return datetime.strptime(value, '%Y%m%d')
+    if value.endswith('Z'):
+        return datetime.strptime(value[:-1], '%Y%m%dT%H%M%S')
+    return datetime.strptime(value, '%Y%m%dT%H%M%S')
+
+
+def format_utc_offset(offset: timedelta) -> str:
+    """Format a UTC offset as an iCalendar UTC-OFFSET (+HHMM, or +HHMMSS)."""
+    seconds = int(offset.total_seconds())
+    sign = '+' if seconds >= 0 else '-'
+    hours, seconds = divmod(abs(seconds), 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{sign}{hours:02d}{minutes:02d}" + (f"{seconds:02d}" if seconds else '')
+
+
+def format_vtimezone(timezone_name: str,
+                     observances: List[Tuple[datetime, timedelta, timedelta, bool, str]]) -> str:
+    """Format a VTIMEZONE block for the TZID of DATE-TIME properties.
+
+    observances are TimezoneManager.get_observances() tuples. Each becomes
+    a STANDARD or DAYLIGHT sub-component without RRULE, starting at the
+    wall time just before its change, as RFC 5545 requires.
+    """
+    lines = ["BEGIN:VTIMEZONE", f"TZID:{timezone_name}"]
+    for transition, offset_from, offset_to, is_dst, abbreviation in observances:
+        kind = 'DAYLIGHT' if is_dst else 'STANDARD'
+        onset = FIRST_ONSET if transition <= FIRST_ONSET else transition + offset_from
+        lines += [
+            f"BEGIN:{kind}",
+            f"DTSTART:{format_datetime(onset)}",
+            f"TZOFFSETFROM:{format_utc_offset(offset_from)}",
+            f"TZOFFSETTO:{format_utc_offset(offset_to)}",
+        ]
+        if abbreviation:
+            lines.append(f"TZNAME:{escape_text(abbreviation)}")
+        lines.append(f"END:{kind}")
+    lines.append("END:VTIMEZONE")
+    return ''.join(fold_line(line) for line in lines)
+
+
+def _format_time_property(name: str, value: datetime, timezone_name: str) -> str:
+    """Format a DATE-TIME property: UTC with a "Z" suffix, otherwise with a TZID.
+
+    Every TZID needs a matching format_vtimezone() block in the calendar.
+    """
+    if timezone_name == 'UTC':
+        return f"{name}:{format_datetime(value)}Z"
+    return f"{name};TZID={timezone_name}:{format_datetime(value)}"
+
+
+def format_vevent(uid: str, title: str, start_time: datetime, end_time: Optional[datetime] = None,
+                  description: Optional[str] = None, category: Optional[str] = None,
+                  recurrence: Optional[str] = None, last_modified: Optional[datetime] = None,
+                  timezone_name: str = 'UTC') -> str:
+    """Format one event as a VEVENT block.
+
+    start_time and end_time are wall time in timezone_name, so recurrences
+    keep their local time across DST changes.
+    """
+    stamp = last_modified or datetime.now(timezone.utc).replace(tzinfo=None)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{format_datetime(stamp)}Z",
+        _format_time_property('DTSTART', start_time, timezone_name),
+    ]
+    if end_time:
+        lines.append(_format_time_property('DTEND', end_time, timezone_name))
+    lines.append(f"SUMMARY:{escape_text(title or '')}")
+    if description:
+        lines.append(f"DESCRIPTION:{escape_text(description)}")
+    if category:
+        lines.append(f"CATEGORIES:{escape_text(category)}")
+    if recurrence in RRULE_FREQUENCIES:
+        lines.append(f"RRULE:FREQ={RRULE_FREQUENCIES[recurrence]}")
+    lines.append("END:VEVENT")
+    return ''.join(fold_line(line) for line in lines)
+
+
+def _unfold(lines: Iterable[str]) -> Iterator[str]:
+    """Join folded continuation lines back into logical content lines."""
+    current = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def iter_vevents(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """Stream the raw properties of each VEVENT in iCalendar text.
+
+    Only one VEVENT is held in memory at a time; convert each with
+    vevent_to_event(). A TZID parameter is kept under "<NAME>;TZID".
+    """
+    properties = None
+    for line in _unfold(lines):
+        if line == 'BEGIN:VEVENT':
+            properties = {}
+            continue
+        if line == 'END:VEVENT':
+            if properties is not None:
+                yield properties
+            properties = None
+            continue
+        if properties is None or ':' not in line:
+            continue
+
+        name_and_params, value = line.split(':', 1)
+        name, *params = name_and_params.split(';')
+        name = name.upper()
+        properties.setdefault(name, value)
+        for param in params:
+            if param.upper().startswith('TZID='):
+                properties.setdefault(f"{name};TZID", param[5:].strip('"'))
+
+
+def parse_rrule(rrule: str) -> Optional[str]:
+    """Get the Event.recurrence value of an RRULE, or None for an empty rule.
+
+    Only a plain FREQ series can be stored. Raises ValueError for any
+    other rule (COUNT, UNTIL, INTERVAL, BYDAY, ...), so importers report
+    it instead of storing an endless series in its place.
+    """
+    if not rrule:
+        return None
+    rule_parts = {}
+    for part in rrule.upper().split(';'):
+        name, _, value = part.partition('=')
+        rule_parts[name.strip()] = value.strip()
+    # WKST only matters together with BY* parts; INTERVAL=1 is the default
+    if rule_parts.get('INTERVAL') == '1':
+        del rule_parts['INTERVAL']
+    rule_parts.pop('WKST', None)
+
+    freq = rule_parts.pop('FREQ', None)
+    unsupported = sorted(rule_parts)
+    if unsupported:
+        raise ValueError(f"Unsupported RRULE parts: {', '.join(unsupported)}")
+    for name, rule_freq in RRULE_FREQUENCIES.items():
+        if freq == rule_freq:
+            return name
+    raise ValueError(f"Unsupported RRULE frequency: {freq}")
+
+
+def vevent_to_event(properties: Dict[str, str]) -> Dict:
+    """Convert raw VEVENT properties into an events table row.
+
+    Times are naive wall time in the row's timezone: the DTSTART TZID,
+    or UTC for UTC and floating values.
+    Raises KeyError or ValueError for a VEVENT without a valid DTSTART,
+    or with a recurrence the events table cannot represent.
+    """
+    recurrence = parse_rrule(properties.get('RRULE', ''))
+    for name in ('RDATE', 'EXDATE'):
+        if name in properties:
+            raise ValueError(f"Unsupported recurrence property: {name}")
+
+    start_time = parse_datetime(properties['DTSTART'])
+    end_time = parse_datetime(properties['DTEND']) if 'DTEND' in properties else None
+    category = unescape_text(properties['CATEGORIES']).split(',')[0] if 'CATEGORIES' in properties else None
+    return {
+        'title': unescape_text(properties.get('SUMMARY', '')) or 'Untitled',
+        'description': unescape_text(properties.get('DESCRIPTION', '')),
+        'start_time': start_time,
+        'end_time': end_time,
+        'category': category or 'General',
+        'recurrence': recurrence,
+        'timezone': properties.get('DTSTART;TZID') or 'UTC',
+    }
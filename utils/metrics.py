@@ -0,0 +1,277 @@
+"""
+Request, database and cache instrumentation for the Calendar App.
+
+Metrics are kept in process memory and rendered in the Prometheus text
+exposition format. SQL statements are attributed to the request running
+them through a context variable, which follows both request threads and
+asyncio tasks.
+"""
+
+import io
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event as sa_event
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the request and SQL time histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds of the queries-per-request histogram buckets
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+# The same statement run this many times in one request is reported as N+1
+N_PLUS_ONE_THRESHOLD = 10
+# Profiles kept for /debug/profiles
+MAX_PROFILES = 20
+
+# Collapses the placeholders of an expanded IN list, so "IN (?, ?)" and "IN (?)" match
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+
+
+def _normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to its shape, for counting repeats."""
+    return _IN_LIST.sub('(?)', ' '.join(statement.split()))
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    """Format a Prometheus label set."""
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observations, one series per label set."""
+    
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: Iterable[float]):
+        """Initialize the histogram."""
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self.series = {}
+    
+    def observe(self, labels: Tuple, value: float):
+        """Record one observation; callers hold the registry lock."""
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+    
+    def render(self) -> List[str]:
+        """Render the histogram in the Prometheus text format."""
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, (counts, total, count) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{bound!r}"'
+                lines.append(f'{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.label_names, labels)} {total}')
+            lines.append(f'{self.name}_count{_labels(self.label_names, labels)} {count}')
+        return lines
+
+
+class RequestStats:
+    """SQL activity and timing of one request."""
+    
+    __slots__ = ('started', 'queries', 'query_time', 'statements', 'profiler', 'token')
+    
+    def __init__(self):
+        """Start timing a request."""
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.query_time = 0.0
+        self.statements = Counter()
+        self.profiler = None
+        self.token = None
+    
+    def elapsed(self) -> float:
+        """Get the seconds since the request started."""
+        return time.perf_counter() - self.started
+    
+    def server_timing(self) -> str:
+        """Get a Server-Timing header value for the request so far."""
+        return (f'app;dur={self.elapsed() * 1000:.1f}, '
+                f'db;dur={self.query_time * 1000:.1f};desc="{self.queries} queries"')
+
+
+class Metrics:
+    """Registry of request, SQL and cache metrics."""
+    
+    def __init__(self, n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD, profiling: bool = False):
+        """Initialize the registry.
+
+        `profiling` allows clients to request a cProfile of a request with
+        the X-Profile header; leave it off where clients are untrusted.
+        """
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.profiling = profiling
+        self.request_duration = Histogram(
+            'calendar_http_request_duration_seconds', 'Time spent serving HTTP requests.',
+            ('method', 'route', 'status'), LATENCY_BUCKETS
+        )
+        self.request_queries = Histogram(
+            'calendar_db_queries_per_request', 'SQL statements executed per HTTP request.',
+            ('route',), QUERY_COUNT_BUCKETS
+        )
+        self.request_query_time = Histogram(
+            'calendar_db_query_seconds_per_request', 'Time spent in SQL per HTTP request.',
+            ('route',), LATENCY_BUCKETS
+        )
+        self.n_plus_one = Counter()  # route -> requests with a repeated statement
+        self.db_errors = 0
+        self.caches = {}  # name -> callable returning hits/misses/size stats
+        self.profiles = OrderedDict()  # id -> (route, pstats text)
+        self._reported_statements = set()
+        self._next_profile_id = 1
+        self._current = ContextVar(f"request_metrics_{id(self)}", default=None)
+        self._lock = threading.Lock()
+    
+    # Sources
+    def instrument_engine(self, engine):
+        """Attribute the SQL run on a (sync) engine to the current request."""
+        @sa_event.listens_for(engine, 'before_cursor_execute')
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('metrics_query_started', []).append(time.perf_counter())
+        
+        @sa_event.listens_for(engine, 'after_cursor_execute')
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info['metrics_query_started'].pop()
+            request_stats = self._current.get()
+            if request_stats is not None:
+                request_stats.queries += 1
+                request_stats.query_time += time.perf_counter() - started
+                request_stats.statements[statement] += 1
+        
+        @sa_event.listens_for(engine, 'handle_error')
+        def _handle_error(exception_context):
+            connection = exception_context.connection
+            if connection is not None and connection.info.get('metrics_query_started'):
+                connection.info['metrics_query_started'].pop()
+            with self._lock:
+                self.db_errors += 1
+    
+    def register_cache(self, name: str, stats: Callable[[], Dict[str, int]]):
+        """Report a cache whose stats() returns hits, misses and size."""
+        self.caches[name] = stats
+    
+    # Requests
+    def start_request(self, profile: bool = False) -> RequestStats:
+        """Start collecting metrics for the request running in this context.
+
+        With `profile` (and profiling enabled) the request is run under cProfile.
+        """
+        request_stats = RequestStats()
+        request_stats.token = self._current.set(request_stats)
+        if profile and self.profiling:
+            import cProfile  # Loaded only once a request is profiled
+            request_stats.profiler = cProfile.Profile()
+            request_stats.profiler.enable()
+        return request_stats
+    
+    def finish_request(self, request_stats: RequestStats, method: str, route: str, status: int) -> Optional[int]:
+        """Record a finished request.
+
+        Returns the id of its profile when it was profiled, else None.
+        """
+        elapsed = request_stats.elapsed()
+        profile_id = None
+        if request_stats.profiler is not None:
+            request_stats.profiler.disable()
+            profile_id = self._store_profile(route, request_stats.profiler)
+        try:
+            self._current.reset(request_stats.token)
+        except ValueError:
+            # Finished in a different context than it started; nothing to restore
+            self._current.set(None)
+        
+        repeated = self._repeated_statements(request_stats)
+        with self._lock:
+            self.request_duration.observe((method, route, str(status)), elapsed)
+            self.request_queries.observe((route,), request_stats.queries)
+            self.request_query_time.observe((route,), request_stats.query_time)
+            if repeated:
+                self.n_plus_one[route] += 1
+                new = [(statement, count) for statement, count in repeated
+                       if (route, statement) not in self._reported_statements]
+                self._reported_statements.update((route, statement) for statement, _ in new)
+            else:
+                new = []
+        for statement, count in new:
+            logger.warning("Possible N+1 query on %s: %d executions of %s", route, count, statement[:200])
+        return profile_id
+    
+    def _repeated_statements(self, request_stats: RequestStats) -> List[Tuple[str, int]]:
+        """Get the statement shapes a request ran at least n_plus_one_threshold times."""
+        if request_stats.queries < self.n_plus_one_threshold:
+            return []
+        shapes = Counter()
+        for statement, count in request_stats.statements.items():
+            shapes[_normalize_statement(statement)] += count
+        return [(statement, count) for statement, count in shapes.items() if count >= self.n_plus_one_threshold]
+    
+    # Profiles
+    def _store_profile(self, route: str, profiler) -> int:
+        """Keep the text report of a cProfile.Profile, dropping the oldest beyond MAX_PROFILES."""
+        import pstats
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(50)
+        with self._lock:
+            profile_id = self._next_profile_id
+            self._next_profile_id += 1
+            self.profiles[profile_id] = (route, output.getvalue())
+            while len(self.profiles) > MAX_PROFILES:
+                self.profiles.popitem(last=False)
+        return profile_id
+    
+    def get_profile(self, profile_id: int) -> Optional[str]:
+        """Get the text report of a stored profile."""
+        profile = self.profiles.get(profile_id)
+        return f"Route: {profile[0]}\n\n{profile[1]}" if profile else None
+    
+    # Exposition
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            lines = self.request_duration.render()
+            lines += self.request_queries.render()
+            lines += self.request_query_time.render()
+            lines += ['# HELP calendar_db_n_plus_one_requests_total Requests that repeated one SQL statement '
+                      f'at least {self.n_plus_one_threshold} times.',
+                      '# TYPE calendar_db_n_plus_one_requests_total counter']
+            lines += [f'calendar_db_n_plus_one_requests_total{_labels(("route",), (route,))} {count}'
+                      for route, count in sorted(self.n_plus_one.items())]
+            lines += ['# HELP calendar_db_errors_total SQL statements that raised an error.',
+                      '# TYPE calendar_db_errors_total counter',
+                      f'calendar_db_errors_total {self.db_errors}']
+        
+        caches = sorted((name, stats()) for name, stats in self.caches.items())
+        for metric, metric_type, help_text, value in (
+            ('calendar_cache_hits_total', 'counter', 'Cache lookups that found an entry.',
+             lambda stats: stats['hits']),
+            ('calendar_cache_misses_total', 'counter', 'Cache lookups that found no entry.',
+             lambda stats: stats['misses']),
+            ('calendar_cache_hit_ratio', 'gauge', 'Share of cache lookups that found an entry.',
+             lambda stats: stats['hits'] / (stats['hits'] + stats['misses']) if stats['hits'] + stats['misses'] else 0.0),
+            ('calendar_cache_entries', 'gauge', 'Entries held by a cache.',
+             lambda stats: stats['size']),
+        ):
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} {metric_type}']
+            lines += [f'{metric}{_labels(("cache",), (name,))} {value(stats)}' for name, stats in caches]
+        return '\n'.join(lines) + '\n'
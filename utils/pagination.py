@@ -0,0 +1,33 @@
+"""
+Opaque cursors for keyset-paginated list endpoints.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Encode the (sort value, id) key of a page's last row as a URL-safe token."""
+    payload = json.dumps([sort_value.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor from encode_cursor().
+
+    Raises ValueError for a malformed or tampered cursor.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(row_id, int):
+            raise ValueError("Cursor id must be an integer")
+        return datetime.fromisoformat(sort_value), row_id
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
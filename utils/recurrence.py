@@ -0,0 +1,130 @@
+"""
+Recurrence expansion for the Calendar App.
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from utils.cache import LRUCache
+from utils.timezone_manager import TimezoneManager
+
+# Supported recurrences; each names the dateutil.rrule frequency of its rule
+RECURRENCE_FREQUENCIES = ('daily', 'weekly', 'monthly', 'yearly')
+
+Occurrence = Tuple[datetime, Optional[datetime]]
+
+# An event's series in its own wall-clock time
+_LocalSeries = namedtuple('_LocalSeries', 'start_time end_time recurrence')
+
+
+class RecurrenceEngine:
+    """Expands recurring events into the occurrences that fall in a window.
+
+    Event times are naive UTC. A series scheduled in another timezone is
+    expanded in that zone's wall-clock time, so a weekly 9:00 meeting stays
+    at 9:00 across DST changes, and its occurrences are converted back to UTC.
+    """
+    
+    def __init__(self, max_windows: int = 4096, timezone_manager: Optional[TimezoneManager] = None):
+        """Initialize recurrence engine."""
+        # (event id, window start, window end) -> (series fingerprint, occurrences)
+        self.cache = LRUCache(max_windows)
+        self.timezone_manager = timezone_manager or TimezoneManager()
+    
+    def get_rule(self, event, dtstart: Optional[datetime] = None):
+        """Get the RFC 5545 rule for an event's recurrence, or None if it does not recur.
+
+        The day of month (and month, for yearly rules) is pinned to the
+        series start so the rule keeps its pattern when dtstart is moved
+        forward.
+        """
+        if event.recurrence not in RECURRENCE_FREQUENCIES:
+            return None
+        from dateutil import rrule  # Loaded only once a series is expanded
+        
+        series_start = event.start_time
+        kwargs = {}
+        if event.recurrence in ('monthly', 'yearly'):
+            kwargs['bymonthday'] = series_start.day
+        if event.recurrence == 'yearly':
+            kwargs['bymonth'] = series_start.month
+        freq = getattr(rrule, event.recurrence.upper())
+        return rrule.rrule(freq, dtstart=dtstart or series_start, **kwargs)
+    
+    def expand(self, event, window_start: datetime, window_end: datetime) -> List[Occurrence]:
+        """Get the (start, end) occurrences of an event overlapping [window_start, window_end)."""
+        key = (event.id, window_start, window_end)
+        fingerprint = (event.start_time, event.end_time, event.recurrence, getattr(event, 'timezone', 'UTC'))
+        cached = self.cache.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        
+        occurrences = self._expand(event, window_start, window_end)
+        self.cache.set(key, (fingerprint, occurrences))
+        return occurrences
+    
+    def invalidate(self, event_id: int) -> int:
+        """Drop every cached expansion of an event."""
+        return self.cache.invalidate(lambda key: key[0] == event_id)
+    
+    def _expand(self, event, window_start: datetime, window_end: datetime) -> List[Occurrence]:
+        """Expand an event without consulting the cache."""
+        timezone_name = getattr(event, 'timezone', None) or 'UTC'
+        if timezone_name == 'UTC' or not event.recurrence:
+            return self._expand_series(event, window_start, window_end)
+        
+        to_local = self.timezone_manager.utc_to_local
+        start_time, end_time, local_start, local_end = [
+            value.replace(tzinfo=None) if value is not None else None
+            for value in to_local([event.start_time, event.end_time, window_start, window_end], timezone_name)
+        ]
+        # Widen the wall-clock window by a day to cover any offset change
+        local_occurrences = self._expand_series(
+            _LocalSeries(start_time, end_time, event.recurrence),
+            local_start - timedelta(days=1), local_end + timedelta(days=1)
+        )
+        starts = self.timezone_manager.local_to_utc([start for start, _ in local_occurrences], timezone_name)
+        ends = self.timezone_manager.local_to_utc([end for _, end in local_occurrences], timezone_name)
+        return [
+            (start, end) for start, end in zip(starts, ends)
+            if start < window_end and (start >= window_start or (end is not None and end > window_start))
+        ]
+    
+    def _expand_series(self, event, window_start: datetime, window_end: datetime) -> List[Occurrence]:
+        """Expand a series whose times are all in one fixed-offset clock."""
+        duration = event.end_time - event.start_time if event.end_time else timedelta(0)
+        rule = self.get_rule(event, self._fast_forward(event, window_start - duration))
+        if rule is None:
+            return []
+        
+        occurrences = []
+        for start in rule:
+            if start >= window_end:
+                break
+            end = start + duration
+            if start >= window_start or end > window_start:
+                occurrences.append((start, end if event.end_time else None))
+        return occurrences
+    
+    def _fast_forward(self, event, target: datetime) -> datetime:
+        """Get a rule start at most one period before `target`.
+
+        Jumping straight to the window keeps expansion proportional to the
+        occurrences returned instead of the whole history of the series.
+        """
+        series_start = event.start_time
+        if target <= series_start:
+            return series_start
+        
+        if event.recurrence == 'daily':
+            return series_start + timedelta(days=(target - series_start).days)
+        if event.recurrence == 'weekly':
+            return series_start + timedelta(weeks=(target - series_start).days // 7)
+        from dateutil.relativedelta import relativedelta
+        if event.recurrence == 'monthly':
+            months = (target.year - series_start.year) * 12 + target.month - series_start.month - 1
+            return series_start + relativedelta(months=max(months, 0))
+        if event.recurrence == 'yearly':
+            return series_start + relativedelta(years=max(target.year - series_start.year - 1, 0))
+        return series_start
@@ -0,0 +1,89 @@
+"""
+Free/busy and conflict detection for the Calendar App.
+
+Everything here is a single sweep over intervals sorted by start time,
+so a window with n occurrences costs O(n log n) plus the size of the
+answer, instead of comparing every pair.
+"""
+
+import heapq
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+Interval = Tuple[datetime, datetime]
+# (start, end, payload); the payload is passed through untouched
+TaggedInterval = Tuple[datetime, datetime, Any]
+
+
+def _timed(intervals: Iterable[TaggedInterval]) -> List[TaggedInterval]:
+    """Sort intervals by start, dropping instants, which occupy no time."""
+    return sorted(
+        (interval for interval in intervals if interval[1] is not None and interval[1] > interval[0]),
+        key=lambda interval: (interval[0], interval[1])
+    )
+
+
+def merge_busy(intervals: Iterable[TaggedInterval], window_start: Optional[datetime] = None,
+               window_end: Optional[datetime] = None) -> List[Interval]:
+    """Merge intervals into disjoint, sorted busy periods, clipped to the window.
+
+    Touching intervals (one ending as the next starts) are merged.
+    """
+    busy = []
+    for start, end, _ in _timed(intervals):
+        if window_start is not None:
+            start = max(start, window_start)
+        if window_end is not None:
+            end = min(end, window_end)
+        if end <= start:
+            continue
+        if busy and start <= busy[-1][1]:
+            if end > busy[-1][1]:
+                busy[-1] = (busy[-1][0], end)
+        else:
+            busy.append((start, end))
+    return busy
+
+
+def free_periods(busy: List[Interval], window_start: datetime, window_end: datetime) -> List[Interval]:
+    """Get the gaps between merged busy periods within [window_start, window_end)."""
+    free = []
+    cursor = window_start
+    for start, end in busy:
+        if start > cursor:
+            free.append((cursor, min(start, window_end)))
+        cursor = max(cursor, end)
+        if cursor >= window_end:
+            break
+    if cursor < window_end:
+        free.append((cursor, window_end))
+    return free
+
+
+def overlapping_pairs(intervals: Iterable[TaggedInterval],
+                      involving: Optional[Callable[[Any], bool]] = None
+                      ) -> Iterator[Tuple[TaggedInterval, TaggedInterval]]:
+    """Yield every pair of overlapping intervals, earlier-starting one first.
+
+    A min-heap holds the intervals still open at the sweep position, so
+    each interval is only compared with those it actually overlaps. When
+    involving is given, only pairs where it holds for at least one
+    payload are yielded.
+    """
+    active = []  # (end, sequence, interval) of every open interval
+    active_matching = []  # The open intervals whose payload satisfies involving
+    for sequence, interval in enumerate(_timed(intervals)):
+        start = interval[0]
+        for heap in (active, active_matching):
+            while heap and heap[0][0] <= start:
+                heapq.heappop(heap)
+        
+        matches = involving is None or involving(interval[2])
+        # An interval that does not match can only pair with ones that do
+        for _, _, other in (active if matches else active_matching):
+            yield other, interval
+        
+        entry = (interval[1], sequence, interval)
+        heapq.heappush(active, entry)
+        if involving is not None and matches:
+            heapq.heappush(active_matching, entry)
@@ -2,6 +2,7 @@
 Settings management for the Calendar App.
 """
 
+import threading
 from typing import Any, Dict, Optional
 from database.db_manager import DatabaseManager
 
@@ -26,10 +27,37 @@ class SettingsManager:
             'show_weekends': True,
             'show_holidays': True,
         }
+        
+        # In-memory snapshot of all stored settings, reloaded when the
+        # settings table version in the database moves past the one it was
+        # loaded at, so writes by any process are seen
+        self._snapshot = None
+        self._snapshot_version = None
+        self._lock = threading.Lock()
+    
+    def _get_snapshot(self) -> Dict[str, str]:
+        """Get the stored settings, reloading them in one query if stale.
+
+        The version is read before the settings, so a write committing in
+        between can only leave the snapshot stale. Settings read next to
+        uncommitted writes are returned but never kept, as they may still
+        be rolled back.
+        """
+        version, _ = self.db_manager.get_table_version('settings')
+        with self._lock:
+            snapshot, snapshot_version = self._snapshot, self._snapshot_version
+        if version is not None and snapshot is not None and snapshot_version == version:
+            return snapshot
+        
+        snapshot = self.db_manager.get_all_settings()
+        if version is not None and not self.db_manager.has_pending_writes():
+            with self._lock:
+                self._snapshot, self._snapshot_version = snapshot, version
+        return snapshot
     
     def get_setting(self, key: str, default: Any = None) -> Any:
         """Get a setting value."""
-        value = self.db_manager.get_setting(key)
+        value = self._get_snapshot().get(key)
         if value is None:
             return self.defaults.get(key, default)
         return value
@@ -40,17 +68,19 @@ class SettingsManager:
     
     def get_all_settings(self) -> Dict[str, Any]:
         """Get all settings as a dictionary."""
+        snapshot = self._get_snapshot()
         settings = {}
-        for key in self.defaults.keys():
-            settings[key] = self.get_setting(key)
+        for key, default in self.defaults.items():
+            value = snapshot.get(key)
+            settings[key] = default if value is None else value
         return settings
     
     def reset_to_defaults(self) -> bool:
         """Reset all settings to default values."""
         try:
-            for key, value in self.defaults.items():
-                self.set_setting(key, value)
-            return True
+            return self.db_manager.set_settings(
+                {key: str(value) for key, value in self.defaults.items()}
+            )
         except Exception as e:
             print(f"Error resetting settings: {e}")
             return False
@@ -64,4 +94,3 @@ class SettingsManager:
         """Set holiday countries."""
         countries_str = ','.join(countries)
         return self.set_setting('holiday_countries', countries_str)
-
@@ -2,13 +2,52 @@
 Timezone management utilities for the Calendar App.
 """
 
-import pytz
-from datetime import datetime
-from typing import List
+import gzip
+import hashlib
+import json
+import threading
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+# Serialized zone catalogue, valid until expires_at (naive UTC)
+TimezoneCatalogue = namedtuple('TimezoneCatalogue', 'zones body gzipped etag expires_at')
+
+# Rebuild the catalogue at least this often, even without a DST change
+CATALOGUE_MAX_AGE = timedelta(days=7)
+
+# Years the calendar accepts; the margins keep grid padding, timezone
+# offsets and year-long windows inside the range of datetime
+MIN_YEAR = 1000
+MAX_YEAR = 9000
+
+
+def check_year(year: int):
+    """Raise ValueError unless a year is within MIN_YEAR..MAX_YEAR."""
+    if not MIN_YEAR <= year <= MAX_YEAR:
+        raise ValueError(f"Year must be between {MIN_YEAR} and {MAX_YEAR}")
+
+
+def _format_offset(minutes: int) -> str:
+    """Format a UTC offset in minutes as +HH:MM."""
+    sign = '+' if minutes >= 0 else '-'
+    return f"{sign}{abs(minutes) // 60:02d}:{abs(minutes) % 60:02d}"
+
+
+def _abbreviation(tzinfo) -> str:
+    """Get the abbreviation (e.g. CEST) of a pytz tzinfo."""
+    return getattr(tzinfo, '_tzname', None) or tzinfo.tzname(None)
 
 
 class TimezoneManager:
-    """Manages timezone operations for the calendar app."""
+    """Manages timezone operations for the calendar app.
+
+    Event times are stored as naive UTC. Conversions go through a per-zone
+    table of UTC transition instants and offsets, built once from pytz, so
+    converting a batch costs one bisect per value instead of a pytz
+    localize/astimezone round trip.
+    """
     
     def __init__(self):
         """Initialize timezone manager."""
@@ -26,51 +65,233 @@ class TimezoneManager:
             'Asia/Kolkata',
             'Australia/Sydney',
         ]
+        # name -> (pytz zone, UTC transition instants, [(utcoffset, is_dst)], [tzinfo])
+        self._zones = {}
+        self._catalogue = None
+        self._lock = threading.Lock()
+        self._catalogue_lock = threading.Lock()
     
     def get_available_timezones(self) -> List[str]:
         """Get list of available timezones."""
         return self.common_timezones
     
+    def get_zone(self, timezone_name: str):
+        """Get the cached pytz zone for a name.
+
+        Raises ValueError for an unknown timezone.
+        """
+        return self._get_transitions(timezone_name)[0]
+    
+    def is_valid_timezone(self, timezone_name: str) -> bool:
+        """Check whether a name is a known IANA timezone."""
+        try:
+            self._get_transitions(timezone_name)
+            return True
+        except ValueError:
+            return False
+    
+    def _get_transitions(self, timezone_name: str):
+        """Get the transition table of a timezone, building it once.
+
+        Entry i of the offsets and tzinfos applies from transition instant i
+        until the next one.
+        """
+        zone = self._zones.get(timezone_name)
+        if zone is not None:
+            return zone
+        import pytz  # Loaded only once a zone is used
+        try:
+            tz = pytz.timezone(timezone_name)
+        except (pytz.UnknownTimeZoneError, AttributeError) as e:
+            raise ValueError(f"Unknown timezone: {timezone_name}") from e
+        
+        transition_times = getattr(tz, '_utc_transition_times', None)
+        if transition_times:
+            offsets = [(utcoffset, dst != timedelta(0)) for utcoffset, dst, _ in tz._transition_info]
+            # pytz zones carry their offset in a tzinfo instance per transition
+            tzinfos = [tz._tzinfos[info] for info in tz._transition_info]
+            zone = (tz, transition_times, offsets, tzinfos)
+        else:
+            # Fixed-offset zone such as UTC
+            zone = (tz, [datetime.min], [(tz.utcoffset(datetime(2000, 1, 1)), False)], [tz])
+        with self._lock:
+            self._zones[timezone_name] = zone
+        return zone
+    
+    def _offset_at_utc(self, transitions, offsets, value: datetime) -> Tuple[timedelta, bool]:
+        """Get the (utcoffset, is_dst) in effect at a naive UTC instant."""
+        return offsets[max(bisect_right(transitions, value) - 1, 0)]
+    
+    def get_offsets(self, timezone_name: str, start: datetime, end: datetime) -> List[Tuple[datetime, timedelta]]:
+        """Get the UTC offsets of a timezone from naive UTC start to end.
+
+        Returns (since, utcoffset) pairs: the offset in effect at start,
+        then one per transition up to end.
+        """
+        _, transitions, offsets, _ = self._get_transitions(timezone_name)
+        first = max(bisect_right(transitions, start) - 1, 0)
+        last = max(bisect_right(transitions, end) - 1, 0)
+        return [(start, offsets[first][0])] + [
+            (transitions[index], offsets[index][0]) for index in range(first + 1, last + 1)
+        ]
+    
+    def get_observances(self, timezone_name: str, start: datetime,
+                        end: datetime) -> List[Tuple[datetime, timedelta, timedelta, bool, str]]:
+        """Get the offset changes of a timezone that apply from naive UTC start to end.
+
+        Returns (transition, offset_before, offset_after, is_dst,
+        abbreviation) tuples with transition in naive UTC: the change that
+        set the offset in effect at start, then every change up to end. A
+        zone's first offset has datetime.min as its transition.
+        """
+        _, transitions, offsets, tzinfos = self._get_transitions(timezone_name)
+        first = max(bisect_right(transitions, start) - 1, 0)
+        last = max(bisect_right(transitions, end) - 1, 0)
+        return [(
+            transitions[index],
+            offsets[max(index - 1, 0)][0],
+            offsets[index][0],
+            offsets[index][1],
+            _abbreviation(tzinfos[index]),
+        ) for index in range(first, last + 1)]
+    
+    def utc_to_local(self, values: Iterable[Optional[datetime]], timezone_name: str) -> List[Optional[datetime]]:
+        """Convert naive UTC datetimes into aware datetimes in a timezone.
+
+        None values are passed through, so start/end columns can be
+        converted in one call.
+        """
+        _, transitions, offsets, tzinfos = self._get_transitions(timezone_name)
+        converted = []
+        for value in values:
+            if value is None:
+                converted.append(None)
+                continue
+            index = max(bisect_right(transitions, value) - 1, 0)
+            converted.append((value + offsets[index][0]).replace(tzinfo=tzinfos[index]))
+        return converted
+    
+    def local_to_utc(self, values: Iterable[Optional[datetime]], timezone_name: str) -> List[Optional[datetime]]:
+        """Convert naive wall-clock datetimes in a timezone into naive UTC.
+
+        Like pytz's localize() with is_dst=False: an ambiguous time (when
+        clocks go back) resolves to standard time, and a time skipped when
+        clocks go forward keeps the offset in effect before the change.
+        """
+        _, transitions, offsets, _ = self._get_transitions(timezone_name)
+        converted = []
+        for value in values:
+            if value is None:
+                converted.append(None)
+                continue
+            if value.tzinfo is not None:
+                converted.append(value.astimezone(timezone.utc).replace(tzinfo=None))
+                continue
+            converted.append(value - self._local_offset(transitions, offsets, value))
+        return converted
+    
+    def _local_offset(self, transitions, offsets, value: datetime) -> timedelta:
+        """Get the UTC offset that applies to a naive wall-clock time."""
+        if len(transitions) == 1:
+            return offsets[0][0]
+        
+        # Offsets of the transitions around the wall time; any valid offset is among them
+        index = max(bisect_right(transitions, value) - 1, 0)
+        candidates = offsets[max(index - 1, 0):index + 2]
+        valid = [
+            (utcoffset, is_dst) for utcoffset, is_dst in candidates
+            if self._offset_at_utc(transitions, offsets, value - utcoffset)[0] == utcoffset
+        ]
+        if valid:
+            standard = [utcoffset for utcoffset, is_dst in valid if not is_dst]
+            return standard[0] if standard else valid[0][0]
+        # Skipped wall time: use the offset from before the change
+        later_utc = value - max(utcoffset for utcoffset, _ in candidates)
+        return self._offset_at_utc(transitions, offsets, later_utc - timedelta(hours=1))[0]
+    
+    def to_utc(self, value: datetime, timezone_name: str) -> datetime:
+        """Convert one datetime into naive UTC; naive values are wall time in timezone_name."""
+        return self.local_to_utc([value], timezone_name)[0]
+    
+    def get_timezone_catalogue(self, now: Optional[datetime] = None) -> TimezoneCatalogue:
+        """Get every IANA timezone with its current offset and DST state.
+
+        Built once per process and rebuilt once the earliest upcoming
+        transition of any zone has passed, so it is always current. The
+        JSON body and its gzip encoding are kept ready to serve.
+        """
+        now = now or datetime.utcnow()
+        catalogue = self._catalogue
+        if catalogue is not None and now < catalogue.expires_at:
+            return catalogue
+        
+        # One thread rebuilds; the others wait and reuse its result
+        with self._catalogue_lock:
+            catalogue = self._catalogue
+            if catalogue is None or now >= catalogue.expires_at:
+                catalogue = self._catalogue = self._build_catalogue(now)
+            return catalogue
+    
+    def _build_catalogue(self, now: datetime) -> TimezoneCatalogue:
+        """Build the zone catalogue as of a naive UTC instant."""
+        import pytz
+        zones = []
+        expires_at = now + CATALOGUE_MAX_AGE
+        common = set(pytz.common_timezones)
+        for name in pytz.all_timezones:
+            _, transitions, offsets, tzinfos = self._get_transitions(name)
+            index = max(bisect_right(transitions, now) - 1, 0)
+            utcoffset, is_dst = offsets[index]
+            next_transition = transitions[index + 1] if index + 1 < len(transitions) else None
+            if next_transition is not None:
+                expires_at = min(expires_at, next_transition)
+            
+            offset_minutes = int(utcoffset.total_seconds() // 60)
+            zones.append({
+                'name': name,
+                'common': name in common,
+                'utc_offset': _format_offset(offset_minutes),
+                'offset_minutes': offset_minutes,
+                'dst_active': is_dst,
+                'abbreviation': _abbreviation(tzinfos[index]),
+                'next_transition': next_transition.isoformat() + 'Z' if next_transition else None,
+            })
+        
+        body = json.dumps({'timezones': zones, 'valid_until': expires_at.isoformat() + 'Z'},
+                          separators=(',', ':')).encode('utf-8')
+        return TimezoneCatalogue(
+            zones={zone['name']: zone for zone in zones},
+            body=body,
+            gzipped=gzip.compress(body, compresslevel=9),
+            etag=hashlib.sha1(body).hexdigest(),
+            expires_at=expires_at,
+        )
+    
     def get_current_time(self, timezone_name: str) -> str:
         """Get current time in specified timezone."""
         try:
-            tz = pytz.timezone(timezone_name)
+            tz = self.get_zone(timezone_name)
             current_time = datetime.now(tz)
             return current_time.strftime("%Y-%m-%d %H:%M:%S %Z")
-        except Exception as e:
+        except ValueError as e:
             print(f"Error getting time for timezone {timezone_name}: {e}")
             return "Error"
     
     def convert_time(self, dt: datetime, from_tz: str, to_tz: str) -> datetime:
-        """Convert datetime from one timezone to another."""
-        try:
-            from_timezone = pytz.timezone(from_tz)
-            to_timezone = pytz.timezone(to_tz)
-            
-            # Localize the datetime to the source timezone
-            localized_dt = from_timezone.localize(dt)
-            
-            # Convert to target timezone
-            converted_dt = localized_dt.astimezone(to_timezone)
-            
-            return converted_dt
-        except Exception as e:
-            print(f"Error converting time: {e}")
-            return dt
+        """Convert datetime from one timezone to another.
+
+        Naive datetimes are wall time in from_tz. Returns an aware datetime
+        in to_tz. Raises ValueError for an unknown timezone.
+        """
+        utc_value = self.to_utc(dt, from_tz)
+        return self.utc_to_local([utc_value], to_tz)[0]
     
     def get_timezone_info(self, timezone_name: str) -> dict:
-        """Get information about a timezone."""
-        try:
-            tz = pytz.timezone(timezone_name)
-            now = datetime.now(tz)
-            
-            return {
-                'name': timezone_name,
-                'utc_offset': now.strftime('%z'),
-                'dst_active': now.dst().total_seconds() != 0,
-                'current_time': now.strftime('%Y-%m-%d %H:%M:%S %Z')
-            }
-        except Exception as e:
-            print(f"Error getting timezone info: {e}")
+        """Get information about a timezone from the precomputed catalogue."""
+        zone = self.get_timezone_catalogue().zones.get(timezone_name)
+        if zone is None:
+            print(f"Error getting timezone info: Unknown timezone: {timezone_name}")
             return {}
-
+        
+        now = self.utc_to_local([datetime.utcnow()], timezone_name)[0]
+        return dict(zone, current_time=now.strftime('%Y-%m-%d %H:%M:%S %Z'))
@@ -5,27 +5,497 @@ Web-based calendar with event tracking, holiday support, timezone selection,
 daily notes, and built-in calculators.
 """
 
+import gzip
 import os
 import sys
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+import threading
+from flask import Flask, Response, g, render_template, request, jsonify, redirect, url_for
 from datetime import datetime, date, timedelta
+from werkzeug.http import is_resource_modified
+import io
 import json
+import click
 
 # Add project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from database.db_manager import DatabaseManager
+from database.occupancy import add_occupancy, day_segments
 from utils.holiday_manager import HolidayManager
-from utils.timezone_manager import TimezoneManager
+from utils.business_days import BusinessDayCalendar
+from utils.timezone_manager import TimezoneManager, check_year
+from utils.settings import SettingsManager
+from utils.recurrence import RecurrenceEngine, RECURRENCE_FREQUENCIES
+from utils import bulk_io
+from utils.cache import MonthResponseCache
+from utils.columnar import COLUMNAR_FORMAT, encode_occurrences
+from utils.calculator import Calculator, CalculatorError
+from utils.scheduling import merge_busy, free_periods, overlapping_pairs
+from utils.pagination import encode_cursor, decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.metrics import Metrics
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'
 
-# Initialize managers
+# Create managers; none touches the database until create_app() initializes it
 db_manager = DatabaseManager()
-db_manager.initialize_database()
-holiday_manager = HolidayManager()
+settings_manager = SettingsManager(db_manager)
+holiday_manager = HolidayManager(store=db_manager)
 timezone_manager = TimezoneManager()
+recurrence_engine = RecurrenceEngine(timezone_manager=timezone_manager)
+# Serialized /api/events responses and /api/month event lists; entries are
+# tagged with the events table version, so writes by any process expire them
+events_cache = MonthResponseCache()
+calculator = Calculator()
+business_days = BusinessDayCalendar(holiday_manager)
+
+# Request, SQL and cache metrics for /metrics; profiling with X-Profile is opt-in
+metrics = Metrics(profiling=os.environ.get('CALENDAR_PROFILING') == '1')
+for cache_name, cache in (
+    ('events', events_cache),
+    ('recurrence', recurrence_engine.cache),
+    ('holidays', holiday_manager.cache),
+    ('business_days', business_days.cache),
+    ('calculator', calculator),
+):
+    metrics.register_cache(cache_name, cache.stats)
+
+# Formats of the event lists in /api/events and /api/month (?format=)
+EVENT_FORMATS = ('json', COLUMNAR_FORMAT)
+# Compression level of the month views; fast enough to run per response
+GZIP_LEVEL = 6
+
+_initialized = False
+_initialize_lock = threading.Lock()
+
+def create_app(db_path=None, prewarm_holidays=False):
+    """Initialize the database once per process and return the app.
+
+    Importing this module opens nothing, so forked workers start fast. A
+    server that never calls this is initialized by its first request.
+    `db_path` replaces calendar_app.db in the working directory and must
+    not change once initialized. `prewarm_holidays` loads the configured
+    countries' holidays around the current year, which pays off only in
+    long-lived processes.
+    """
+    global _initialized
+    if not _initialized:
+        with _initialize_lock:
+            if not _initialized:
+                if db_path:
+                    db_manager.db_path = db_path
+                db_manager.initialize_database()
+                metrics.instrument_engine(db_manager.engine)
+                _initialized = True
+    if db_path and db_path != db_manager.db_path:
+        raise ValueError(f"App already initialized with {db_manager.db_path}")
+    
+    if prewarm_holidays:
+        holiday_manager.prewarm(
+            settings_manager.get_holiday_countries(),
+            range(date.today().year - 1, date.today().year + 2)
+        )
+    return app
+
+def _display_timezone():
+    """Get the timezone to render times in: ?tz= if given, else the timezone setting.
+
+    Raises ValueError for an unknown timezone.
+    """
+    return _resolve_timezone(request.args.get('tz'))
+
+def _resolve_timezone(requested):
+    """Get the requested timezone, else the timezone setting; raises ValueError if unknown."""
+    timezone_name = requested or settings_manager.get_setting('timezone') or 'UTC'
+    timezone_manager.get_zone(timezone_name)
+    return timezone_name
+
+def _parse_day(value):
+    """Parse a YYYY-MM-DD date from a request; raises ValueError if invalid or out of range."""
+    day = datetime.strptime(value, '%Y-%m-%d').date()
+    check_year(day.year)
+    return day
+
+def _resolve_events_format(requested):
+    """Get the requested event list format, 'json' by default; raises ValueError if unknown."""
+    events_format = requested or 'json'
+    if events_format not in EVENT_FORMATS:
+        raise ValueError(f"Unsupported format: {events_format}")
+    return events_format
+
+def _json_body(payload, gzipped=False):
+    """Serialize a payload as the JSON routes do, gzip-compressed if asked."""
+    body = app.json.dumps(payload).encode('utf-8')
+    return gzip.compress(body, compresslevel=GZIP_LEVEL) if gzipped else body
+
+def _month_view_response(body, gzipped):
+    """Wrap a serialized month view body, which varies by Accept-Encoding."""
+    response = Response(body, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    if gzipped:
+        response.content_encoding = 'gzip'
+    return response
+
+def _parse_datetime(value, timezone_name):
+    """Parse an ISO date or datetime from a request into naive UTC.
+
+    A value with a UTC offset (or "Z") is exact; one without is wall time
+    in timezone_name. Raises ValueError if invalid or out of range.
+    """
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    check_year(parsed.year)
+    return timezone_manager.to_utc(parsed, timezone_name)
+
+def _local_day_bounds(start_day, end_day, timezone_name):
+    """Get the naive UTC instants of local midnight on start_day and end_day."""
+    start_date, end_date = timezone_manager.local_to_utc([
+        datetime.combine(start_day, datetime.min.time()),
+        datetime.combine(end_day, datetime.min.time())
+    ], timezone_name)
+    return start_date, end_date
+
+def _event_to_dict(event, start_time, end_time, series_start):
+    """Convert one occurrence of an Event row into its JSON representation.
+
+    The times are already converted to the display timezone.
+    """
+    event_data = {
+        'id': event.id,
+        'title': event.title,
+        'description': event.description or '',
+        'start_date': start_time.isoformat(),
+        'end_date': end_time.isoformat() if end_time else start_time.isoformat(),
+        'category': event.category,
+        'recurrence': event.recurrence,
+        'timezone': event.timezone
+    }
+    if event.recurrence:
+        event_data['series_start_date'] = series_start.isoformat()
+    return event_data
+
+def _localize_occurrences(occurrences, timezone_name):
+    """Convert (event, start, end) occurrences to (event, start, end, series start) in a timezone.
+
+    Every time is converted in one batch through the zone's transition
+    table rather than one pytz call per value.
+    """
+    values = []
+    for event, start_time, end_time in occurrences:
+        values.extend((start_time, end_time, event.start_time))
+    local = iter(timezone_manager.utc_to_local(values, timezone_name))
+    return [(event, next(local), next(local), next(local)) for event, _, _ in occurrences]
+
+def _events_to_dicts(occurrences, timezone_name):
+    """Convert (event, start, end) occurrences into JSON rendered in a timezone."""
+    return [_event_to_dict(*occurrence) for occurrence in _localize_occurrences(occurrences, timezone_name)]
+
+def _events_payload(occurrences, timezone_name, events_format='json'):
+    """Convert (event, start, end) occurrences into an event list of the given format."""
+    if events_format == COLUMNAR_FORMAT:
+        return encode_occurrences(
+            occurrences, lambda start, end: timezone_manager.get_offsets(timezone_name, start, end)
+        )
+    return _events_to_dicts(occurrences, timezone_name)
+
+def _periods_to_dicts(periods, timezone_name):
+    """Render (start, end) UTC periods as JSON in a timezone, in one batch."""
+    local = iter(timezone_manager.utc_to_local([bound for period in periods for bound in period], timezone_name))
+    return [{'start': next(local).isoformat(), 'end': next(local).isoformat()} for _ in periods]
+
+def _single_event_dict(event, timezone_name):
+    """Convert one Event row into its JSON representation."""
+    return _events_to_dicts([(event, event.start_time, event.end_time)], timezone_name)[0]
+
+def _events_in_range(start_date, end_date):
+    """Get (event, start, end) occurrences overlapping [start_date, end_date)."""
+    return _combine_occurrences(
+        db_manager.get_events(start_date, end_date),
+        db_manager.get_recurring_events(end_date),
+        start_date, end_date
+    )
+
+def _combine_occurrences(events, recurring_events, start_date, end_date):
+    """Merge window events and recurring series into sorted (event, start, end) occurrences.
+
+    One-off events come straight from the interval query; recurring series
+    are expanded into just the occurrences that fall in the window.
+    """
+    occurrences = [
+        (event, event.start_time, event.end_time)
+        for event in events
+        if not event.recurrence
+    ]
+    for event in recurring_events:
+        for occurrence_start, occurrence_end in recurrence_engine.expand(event, start_date, end_date):
+            occurrences.append((event, occurrence_start, occurrence_end))
+    occurrences.sort(key=lambda occurrence: occurrence[1])
+    return occurrences
+
+def _parse_recurrence(data):
+    """Get the recurrence from request data, raising ValueError if unsupported."""
+    recurrence = data.get('recurrence') or None
+    if recurrence is not None and recurrence not in RECURRENCE_FREQUENCIES:
+        raise ValueError(f"Unsupported recurrence: {recurrence}")
+    return recurrence
+
+def _visible_grid(year, month):
+    """Get the (start, end) dates of the 6-week grid shown for a month.
+
+    The grid starts on the Sunday on or before the 1st, matching the
+    layout built by updateCalendar() in static/calendar.js.
+    """
+    first_day = date(year, month, 1)
+    grid_start = first_day - timedelta(days=(first_day.weekday() + 1) % 7)
+    return grid_start, grid_start + timedelta(days=42)
+
+def _month_bounds(year, month, timezone_name):
+    """Get the naive UTC instants bounding a month in a timezone."""
+    month_start = date(year, month, 1)
+    month_end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return _local_day_bounds(month_start, month_end, timezone_name)
+
+def _grid_note_bounds(grid_start, grid_end):
+    """Get the datetime range for note counts; notes are stored by calendar date, not instant."""
+    return datetime.combine(grid_start, datetime.min.time()), datetime.combine(grid_end, datetime.min.time())
+
+def _month_view(grid_start, grid_end, events, note_counts, holidays):
+    """Build the /api/month response for a visible grid from its _events_payload() event list."""
+    return {
+        'start': grid_start.isoformat(),
+        'end': grid_end.isoformat(),
+        'events': events,
+        'notes': note_counts,
+        'holidays': {holiday_date.isoformat(): names for holiday_date, names in holidays.items()}
+    }
+
+def _cached_month_value(key, build):
+    """Get a month view value from events_cache, calling build() on a miss.
+
+    The events version is read before build() reads events, so a write
+    committing in between can only leave the entry stale, never wrong
+    under the newer version. Nothing is cached if the version is unknown.
+    """
+    version, _ = db_manager.get_events_version()
+    if version is None:
+        return build()
+    value = events_cache.get(key, version)
+    if value is None:
+        value = build()
+        events_cache.set(key, value, version)
+    return value
+
+def _local_occurrences(start_day, end_day, timezone_name):
+    """Get the localized occurrences on local days [start_day, end_day)."""
+    start_date, end_date = _local_day_bounds(start_day, end_day, timezone_name)
+    return _localize_occurrences(_events_in_range(start_date, end_date), timezone_name)
+
+def _wall_time(value):
+    """Strip the timezone from an aware local datetime, keeping None."""
+    return value.replace(tzinfo=None) if value is not None else None
+
+def _occupancy_in_range(start_day, end_day, timezone_name='UTC'):
+    """Get {day: occupancy} for local days in [start_day, end_day).
+
+    The occupancy table is bucketed by UTC day, so for UTC one-off events
+    come from it in one range read, and recurring series are expanded over
+    the window and added on top. A UTC day's totals cannot be split across
+    the local days it straddles, so other timezones bucket the window's
+    occurrences by local day instead, from one interval-index read.
+    """
+    if timezone_name != 'UTC':
+        days = {}
+        for _, start_time, end_time, _ in _local_occurrences(start_day, end_day, timezone_name):
+            add_occupancy(days, _wall_time(start_time), _wall_time(end_time), start_day, end_day)
+        return days
+    
+    days = db_manager.get_occupancy(start_day, end_day)
+    start_date = datetime.combine(start_day, datetime.min.time())
+    end_date = datetime.combine(end_day, datetime.min.time())
+    for event in db_manager.get_recurring_events(end_date):
+        for occurrence_start, occurrence_end in recurrence_engine.expand(event, start_date, end_date):
+            add_occupancy(days, occurrence_start, occurrence_end, start_day, end_day)
+    return days
+
+def _occupancy_to_dict(entry):
+    """Convert an occupancy entry into its JSON representation."""
+    if entry is None:
+        return None
+    return {
+        'event_count': entry['event_count'],
+        'first_start': entry['first_start'].isoformat(),
+        'last_end': entry['last_end'].isoformat(),
+        'busy_minutes': entry['busy_minutes']
+    }
+
+def _day_views(start_day, end_day, timezone_name, include_empty=True):
+    """Get each local day in [start_day, end_day) with its events and occupancy.
+
+    Events spanning several days are listed under every day they cover.
+    """
+    events_by_day = {}
+    for occurrence in _local_occurrences(start_day, end_day, timezone_name):
+        event_data = _event_to_dict(*occurrence)
+        _, start_time, end_time, _ = occurrence
+        for day, _, _ in day_segments(_wall_time(start_time), _wall_time(end_time), start_day, end_day):
+            events_by_day.setdefault(day, []).append(event_data)
+    occupancy = _occupancy_in_range(start_day, end_day, timezone_name)
+    
+    views = []
+    day = start_day
+    while day < end_day:
+        if include_empty or day in events_by_day:
+            views.append({
+                'date': day.isoformat(),
+                'occupancy': _occupancy_to_dict(occupancy.get(day)),
+                'events': events_by_day.get(day, [])
+            })
+        day += timedelta(days=1)
+    return views
+
+# How far ahead a recurring event is checked for conflicts
+CONFLICT_HORIZON = timedelta(days=366)
+
+def _event_conflicts(event, timezone_name):
+    """Get the other events whose occurrences overlap an event's occurrences.
+
+    A recurring event is checked over CONFLICT_HORIZON from its series start.
+    Times are rendered in timezone_name.
+    """
+    window_start = event.start_time
+    if event.recurrence:
+        window_end = window_start + CONFLICT_HORIZON
+    else:
+        window_end = event.end_time or window_start
+    if window_end <= window_start:
+        return []
+    
+    intervals = [
+        (start, end, (occurrence_event, start, end))
+        for occurrence_event, start, end in _events_in_range(window_start, window_end)
+    ]
+    is_own = lambda occurrence: occurrence[0].id == event.id
+    others, overlaps = [], []
+    for first, second in overlapping_pairs(intervals, involving=is_own):
+        if is_own(first[2]) and is_own(second[2]):
+            continue
+        others.append(second[2] if is_own(first[2]) else first[2])
+        overlaps.append((max(first[0], second[0]), min(first[1], second[1])))
+    
+    return [{
+        'event': event_data,
+        'overlap_start': overlap['start'],
+        'overlap_end': overlap['end']
+    } for event_data, overlap in zip(
+        _events_to_dicts(others, timezone_name), _periods_to_dicts(overlaps, timezone_name)
+    )]
+
+def _saved_event_response(event, data, timezone_name):
+    """Build the response for a created or updated event, checking conflicts.
+
+    Conflicts are reported alongside the event. With reject_conflicts set,
+    a 409 is returned instead, so the unit of work is rolled back.
+    """
+    conflicts = _event_conflicts(event, timezone_name)
+    if conflicts and data.get('reject_conflicts'):
+        return jsonify({'error': 'Event conflicts with existing events', 'conflicts': conflicts}), 409
+    return jsonify({
+        'success': True,
+        'event': _single_event_dict(event, timezone_name),
+        'conflicts': conflicts
+    })
+
+def _list_page(list_rows, sort_field, rows_to_dicts, local_days=False):
+    """Serve one keyset page from a DatabaseManager list_* method.
+
+    Reads cursor, limit and optional inclusive start/end dates from the
+    query string; with local_days the dates are days in the display
+    timezone. rows_to_dicts(rows, timezone_name) renders the page. The
+    response carries next_cursor, or null on the last page.
+    """
+    try:
+        timezone_name = _display_timezone()
+        cursor = request.args.get('cursor')
+        after = decode_cursor(cursor) if cursor else None
+        start = request.args.get('start')
+        end = request.args.get('end')
+        start_date = datetime.combine(_parse_day(start), datetime.min.time()) if start else None
+        end_date = datetime.combine(_parse_day(end) + timedelta(days=1), datetime.min.time()) if end else None
+        if local_days:
+            start_date, end_date = timezone_manager.local_to_utc([start_date, end_date], timezone_name)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    limit = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+    # Fetch one extra row to tell whether another page follows
+    rows = list_rows(after, limit + 1, start_date, end_date)
+    if rows is None:
+        return jsonify({'error': 'Could not list records'}), 500
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_field), last.id)
+    return jsonify({
+        'items': rows_to_dicts(rows, timezone_name),
+        'next_cursor': next_cursor
+    })
+
+def _note_to_dict(note):
+    """Convert a Note row into its JSON representation."""
+    return {
+        'id': note.id,
+        'date': note.date.date().isoformat(),
+        'content': note.content,
+        'created_at': note.created_at.isoformat(),
+        'updated_at': note.updated_at.isoformat()
+    }
+
+# Registered first, so every other hook sees an initialized database
+@app.before_request
+def initialize_app():
+    """Initialize the database on the first request if create_app() was not called."""
+    if not _initialized:
+        create_app()
+
+# Registered before the unit-of-work hooks, so the after_request hook runs
+# last and sees the final response
+@app.before_request
+def start_request_metrics():
+    """Start timing the request and counting its SQL."""
+    g.request_metrics = metrics.start_request(profile=request.headers.get('X-Profile') == '1')
+
+@app.after_request
+def finish_request_metrics(response):
+    """Record the request's latency and SQL activity."""
+    request_stats = g.pop('request_metrics', None)
+    if request_stats is not None:
+        response.headers['Server-Timing'] = request_stats.server_timing()
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        profile_id = metrics.finish_request(request_stats, request.method, route, response.status_code)
+        if profile_id is not None:
+            response.headers['X-Profile-Id'] = str(profile_id)
+    return response
+
+@app.before_request
+def begin_unit_of_work():
+    """Give each request one database session that every manager call joins."""
+    db_manager.begin_unit_of_work()
+
+@app.after_request
+def commit_unit_of_work(response):
+    """Commit the request's writes once, unless the request failed."""
+    if response.status_code < 400:
+        if not db_manager.commit_unit_of_work():
+            # after_request hooks must return a Response, not a (body, status) tuple
+            response = jsonify({'error': 'Failed to save changes'})
+            response.status_code = 500
+    return response
+
+@app.teardown_request
+def end_unit_of_work(exc):
+    """Release the request's session, rolling back anything uncommitted."""
+    db_manager.end_unit_of_work()
 
 @app.route('/')
 def index():
@@ -34,37 +504,211 @@ def index():
 
 @app.route('/api/events')
 def get_events():
-    """Get events for a specific month."""
+    """Get events for a specific month.
+
+    `?format=columnar` returns them in the compact columnar layout of
+    utils/columnar.py instead of one object per event.
+    """
     year = request.args.get('year', type=int)
     month = request.args.get('month', type=int)
     
     if not year or not month:
         return jsonify({'error': 'Year and month required'}), 400
+    if not 1 <= month <= 12:
+        return jsonify({'error': 'Invalid month'}), 400
+    try:
+        check_year(year)
+        timezone_name = _display_timezone()
+        events_format = _resolve_events_format(request.args.get('format'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Create date range for the month
-    from datetime import datetime
-    start_date = datetime(year, month, 1)
-    if month == 12:
-        end_date = datetime(year + 1, 1, 1)
-    else:
-        end_date = datetime(year, month + 1, 1)
+    gzipped = 'gzip' in request.accept_encodings
     
-    events = db_manager.get_events(start_date, end_date)
+    def build():
+        start_date, end_date = _month_bounds(year, month, timezone_name)
+        occurrences = _events_in_range(start_date, end_date)
+        # Convert to JSON serializable format
+        return _json_body(_events_payload(occurrences, timezone_name, events_format), gzipped)
     
-    # Convert to JSON serializable format
-    events_json = []
-    for event in events:
-        events_json.append({
-            'id': event.id,
-            'title': event.title,
-            'description': event.description or '',
-            'start_date': event.start_time.isoformat(),
-            'end_date': event.end_time.isoformat() if event.end_time else event.start_time.isoformat(),
-            'category': event.category,
-            'recurrence': event.recurrence
-        })
-    
-    return jsonify(events_json)
+    body = _cached_month_value(
+        (year, month, f"{events_format}:{timezone_name}:{'gzip' if gzipped else 'identity'}"), build
+    )
+    return _month_view_response(body, gzipped)
+
+@app.route('/api/cache/stats')
+def get_cache_stats():
+    """Get hit/miss counters and sizes of the in-process caches."""
+    return jsonify({cache_name: stats() for cache_name, stats in metrics.caches.items()})
+
+@app.route('/metrics')
+def get_metrics():
+    """Expose request, SQL and cache metrics in the Prometheus text format."""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/debug/profiles/<int:profile_id>')
+def get_profile(profile_id):
+    """Get the cProfile report of a request sent with X-Profile: 1."""
+    if not metrics.profiling:
+        return jsonify({'error': 'Profiling is disabled'}), 404
+    report = metrics.get_profile(profile_id)
+    if report is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    return Response(report, mimetype='text/plain')
+
+@app.route('/api/month/<int:year>/<int:month>')
+def get_month(year, month):
+    """Get events, note counts and holidays for the whole visible month grid.
+
+    `?format=columnar` returns the events as in /api/events.
+    """
+    if not 1 <= month <= 12:
+        return jsonify({'error': 'Invalid month'}), 400
+    try:
+        check_year(year)
+        timezone_name = _display_timezone()
+        events_format = _resolve_events_format(request.args.get('format'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    countries = request.args.getlist('countries')
+    if not countries:
+        countries = ['US', 'DE']  # Default to US and Germany
+    
+    grid_start, grid_end = _visible_grid(year, month)
+    start_date, end_date = _local_day_bounds(grid_start, grid_end, timezone_name)
+    
+    # Notes and holidays are cheap indexed or cached reads; only the event
+    # list, with its recurrence expansion and timezone conversion, is cached
+    events = _cached_month_value(
+        (year, month, f"grid:{events_format}:{timezone_name}"),
+        lambda: _events_payload(_events_in_range(start_date, end_date), timezone_name, events_format)
+    )
+    note_counts = db_manager.get_note_counts(*_grid_note_bounds(grid_start, grid_end))
+    holidays = holiday_manager.get_holidays_for_range(grid_start, grid_end, countries)
+    
+    gzipped = 'gzip' in request.accept_encodings
+    return _month_view_response(_json_body(
+        _month_view(grid_start, grid_end, events, note_counts, holidays), gzipped
+    ), gzipped)
+
+@app.route('/api/day/<day>')
+def get_day(day):
+    """Get the events and occupancy of one day."""
+    try:
+        timezone_name = _display_timezone()
+        view_day = _parse_day(day)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify(_day_views(view_day, view_day + timedelta(days=1), timezone_name)[0])
+
+@app.route('/api/week/<day>')
+def get_week(day):
+    """Get the events and occupancy of each day in the week containing a date.
+
+    Weeks start on Sunday, like the month grid.
+    """
+    try:
+        timezone_name = _display_timezone()
+        view_day = _parse_day(day)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    week_start = view_day - timedelta(days=(view_day.weekday() + 1) % 7)
+    week_end = week_start + timedelta(days=7)
+    return jsonify({
+        'start': week_start.isoformat(),
+        'end': week_end.isoformat(),
+        'days': _day_views(week_start, week_end, timezone_name)
+    })
+
+@app.route('/api/agenda')
+def get_agenda():
+    """Get the days with events in the next `days` days from `start`, today by default."""
+    try:
+        timezone_name = _display_timezone()
+        start = request.args.get('start')
+        start_day = _parse_day(start) if start else (
+            timezone_manager.utc_to_local([datetime.utcnow()], timezone_name)[0].date()
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    days = min(max(request.args.get('days', 30, type=int), 1), 366)
+    end_day = start_day + timedelta(days=days)
+    return jsonify({
+        'start': start_day.isoformat(),
+        'end': end_day.isoformat(),
+        'days': _day_views(start_day, end_day, timezone_name, include_empty=False)
+    })
+
+@app.route('/api/occupancy')
+def get_occupancy():
+    """Get per-day event counts, first/last times and busy minutes for a date range.
+
+    Both bounds are inclusive dates in the display timezone; days without
+    events are omitted.
+    """
+    try:
+        timezone_name = _display_timezone()
+        start_day = _parse_day(request.args['start'])
+        end_day = _parse_day(request.args['end']) + timedelta(days=1)
+    except KeyError:
+        return jsonify({'error': 'Start and end required'}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not timedelta(0) < end_day - start_day <= timedelta(days=3660):
+        return jsonify({'error': 'Range must cover 1 to 3660 days'}), 400
+    
+    occupancy = _occupancy_in_range(start_day, end_day, timezone_name)
+    return jsonify({
+        day.isoformat(): _occupancy_to_dict(entry) for day, entry in sorted(occupancy.items())
+    })
+
+@app.route('/api/freebusy')
+def get_freebusy():
+    """Get merged busy periods, free gaps and overlapping events in a time window.
+
+    start and end are ISO datetimes (or dates), in the display timezone
+    unless they carry an offset; recurring events are expanded within the
+    window. Events without an end occupy no time.
+    """
+    try:
+        timezone_name = _display_timezone()
+        window_start = _parse_datetime(request.args['start'], timezone_name)
+        window_end = _parse_datetime(request.args['end'], timezone_name)
+    except KeyError:
+        return jsonify({'error': 'Start and end required'}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not timedelta(0) < window_end - window_start <= timedelta(days=366):
+        return jsonify({'error': 'Window must be positive and at most 366 days'}), 400
+    
+    intervals = [
+        (start, end, (event, start, end))
+        for event, start, end in _events_in_range(window_start, window_end)
+    ]
+    busy = merge_busy(intervals, window_start, window_end)
+    free = free_periods(busy, window_start, window_end)
+    pairs = list(overlapping_pairs(intervals))
+    overlaps = _periods_to_dicts(
+        [(max(first[0], second[0]), min(first[1], second[1])) for first, second in pairs], timezone_name
+    )
+    pair_events = _events_to_dicts([occurrence[2] for pair in pairs for occurrence in pair], timezone_name)
+    window = _periods_to_dicts([(window_start, window_end)], timezone_name)[0]
+    
+    return jsonify({
+        'start': window['start'],
+        'end': window['end'],
+        'busy': _periods_to_dicts(busy, timezone_name),
+        'free': _periods_to_dicts(free, timezone_name),
+        'conflicts': [{
+            'events': pair_events[2 * index:2 * index + 2],
+            'overlap_start': overlap['start'],
+            'overlap_end': overlap['end']
+        } for index, overlap in enumerate(overlaps)]
+    })
 
 @app.route('/api/events', methods=['POST'])
 def create_event():
@@ -72,46 +716,28 @@ def create_event():
     data = request.get_json()
     
     try:
-        from datetime import datetime
-        
-        # Parse dates - handle different formats
-        start_date_str = data['start_date']
-        if 'T' in start_date_str:
-            start_time = datetime.fromisoformat(start_date_str.replace('Z', ''))
-        else:
-            start_time = datetime.fromisoformat(start_date_str + 'T00:00:00')
+        display_timezone = _display_timezone()
+        # Times without an offset are wall time in the event's timezone
+        event_timezone = data.get('timezone') or display_timezone
         
+        # Parse dates into UTC - handle different formats
+        start_time = _parse_datetime(data['start_date'], event_timezone)
         end_time = None
         if data.get('end_date'):
-            end_date_str = data['end_date']
-            if 'T' in end_date_str:
-                end_time = datetime.fromisoformat(end_date_str.replace('Z', ''))
-            else:
-                end_time = datetime.fromisoformat(end_date_str + 'T00:00:00')
+            end_time = _parse_datetime(data['end_date'], event_timezone)
         
         event = db_manager.create_event(
             title=data['title'],
             description=data.get('description', ''),
             start_time=start_time,
             end_time=end_time,
-            category=data.get('category', 'General')
+            category=data.get('category', 'General'),
+            recurrence=_parse_recurrence(data),
+            timezone=event_timezone
         )
         
         if event:
-            # Create event data using the input data to avoid session binding issues
-            event_data = {
-                'id': event.id,
-                'title': data['title'],
-                'description': data.get('description', ''),
-                'start_date': start_time.isoformat(),
-                'end_date': end_time.isoformat() if end_time else start_time.isoformat(),
-                'category': data.get('category', 'General'),
-                'recurrence': None  # Default value since we're not using recurrence yet
-            }
-            return jsonify({
-                'success': True, 
-                'event': event_data
-            })
+            return _saved_event_response(event, data, display_timezone)
         else:
             return jsonify({'error': 'Failed to create event'}), 400
     except Exception as e:
@@ -123,35 +749,33 @@ def update_event(event_id):
     data = request.get_json()
     
     try:
-        # Parse the data and convert to proper format
-        from datetime import datetime
+        display_timezone = _display_timezone()
+        # Times without an offset are wall time in the given or display timezone
+        input_timezone = data.get('timezone') or display_timezone
+        timezone_manager.get_zone(input_timezone)
         
+        # Parse the data and convert to proper format
         update_data = {}
         if 'title' in data:
             update_data['title'] = data['title']
         if 'description' in data:
             update_data['description'] = data['description']
+        if 'timezone' in data:
+            update_data['timezone'] = input_timezone
         if 'start_date' in data:
-            # Convert ISO string to datetime
-            start_date_str = data['start_date']
-            if 'T' in start_date_str:
-                update_data['start_time'] = datetime.fromisoformat(start_date_str.replace('Z', ''))
-            else:
-                update_data['start_time'] = datetime.strptime(start_date_str, '%Y-%m-%d')
+            update_data['start_time'] = _parse_datetime(data['start_date'], input_timezone)
+        if 'end_date' in data:
+            end_date_str = data['end_date']
+            update_data['end_time'] = _parse_datetime(end_date_str, input_timezone) if end_date_str else None
         if 'category' in data:
             update_data['category'] = data['category']
+        if 'recurrence' in data:
+            update_data['recurrence'] = _parse_recurrence(data)
         
         event = db_manager.update_event(event_id, **update_data)
+        recurrence_engine.invalidate(event_id)
         if event:
-            # Create event data using the input data to avoid session binding issues
-            event_data = {
-                'id': event_id,
-                'title': update_data.get('title', data.get('title', '')),
-                'description': update_data.get('description', data.get('description', '')),
-                'start_date': update_data.get('start_time', data.get('start_date', '')).isoformat() if 'start_time' in update_data else data.get('start_date', ''),
-                'category': update_data.get('category', data.get('category', 'General'))
-            }
-            return jsonify({'success': True, 'event': event_data})
+            return _saved_event_response(event, data, display_timezone)
         else:
             return jsonify({'error': 'Event not found'}), 404
     except Exception as e:
@@ -162,10 +786,22 @@ def delete_event(event_id):
     """Delete an event."""
     try:
         db_manager.delete_event(event_id)
+        recurrence_engine.invalidate(event_id)
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+@app.route('/api/events/list')
+def list_events():
+    """List all events page by page, ordered by start time."""
+    return _list_page(
+        db_manager.list_events, 'start_time',
+        lambda rows, timezone_name: _events_to_dicts(
+            [(row, row.start_time, row.end_time) for row in rows], timezone_name
+        ),
+        local_days=True
+    )
+
 @app.route('/api/holidays')
 def get_holidays():
     """Get holidays for a specific month."""
@@ -214,6 +850,14 @@ def get_notes():
     except ValueError:
         return jsonify({'error': 'Invalid date format'}), 400
 
+@app.route('/api/notes/list')
+def list_notes():
+    """List all notes page by page, ordered by date."""
+    return _list_page(
+        db_manager.list_notes, 'date',
+        lambda rows, timezone_name: [_note_to_dict(row) for row in rows]
+    )
+
 @app.route('/api/notes', methods=['POST'])
 def save_note():
     """Save a note for a specific date."""
@@ -313,42 +957,320 @@ def delete_note():
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+@app.route('/api/import/<kind>', methods=['POST'])
+def import_records(kind):
+    """Bulk import events or notes from an NDJSON, CSV or iCalendar request body."""
+    if kind not in bulk_io.KINDS:
+        return jsonify({'error': 'Unknown record type'}), 404
+    
+    fmt = request.args.get('format') or {
+        mimetype: fmt for fmt, mimetype in bulk_io.MIMETYPES.items()
+    }.get(request.mimetype)
+    if fmt not in bulk_io.FORMATS:
+        return jsonify({'error': 'Format must be one of: ' + ', '.join(bulk_io.FORMATS)}), 400
+    
+    chunk_size = request.args.get('chunk_size', bulk_io.DEFAULT_CHUNK_SIZE, type=int)
+    stream = io.TextIOWrapper(request.stream, encoding='utf-8', newline='')
+    try:
+        imported, errors = bulk_io.import_stream(db_manager, stream, fmt, kind, max(chunk_size, 1))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'success': True,
+        'imported': imported,
+        'skipped': len(errors),
+        'errors': errors[:100]
+    })
+
+@app.route('/api/export/<kind>')
+def export_records(kind):
+    """Stream all events or notes as NDJSON, CSV or iCalendar."""
+    if kind not in bulk_io.KINDS:
+        return jsonify({'error': 'Unknown record type'}), 404
+    
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in bulk_io.FORMATS or (fmt == 'ics' and kind != 'events'):
+        return jsonify({'error': 'Unsupported export format'}), 400
+    
+    response = Response(bulk_io.export_stream(db_manager, fmt, kind), mimetype=bulk_io.MIMETYPES[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename={kind}.{fmt}'
+    return response
+
+# Deepest search result a page may start at; ranked OFFSET pages cost the rows they skip
+MAX_SEARCH_OFFSET = 10000
+
+@app.route('/api/search')
+def search():
+    """Full-text search over events and notes, ranked best match first."""
+    terms = request.args.get('q', '').strip()
+    if not terms:
+        return jsonify({'error': 'Search query required'}), 400
+    
+    kinds = request.args.getlist('type') or ['event', 'note']
+    if any(kind not in ('event', 'note') for kind in kinds):
+        return jsonify({'error': 'Type must be event or note'}), 400
+    
+    try:
+        timezone_name = _display_timezone()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        start = request.args.get('start')
+        end = request.args.get('end')
+        # Both bounds are inclusive dates
+        start_date = datetime.strptime(start, '%Y-%m-%d') if start else None
+        end_date = datetime.strptime(end, '%Y-%m-%d') if end else None
+    except ValueError:
+        return jsonify({'error': 'Dates must be YYYY-MM-DD'}), 400
+    try:
+        for bound in (start_date, end_date):
+            if bound:
+                check_year(bound.year)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if end_date:
+        end_date += timedelta(days=1)
+    
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+    if (page - 1) * per_page > MAX_SEARCH_OFFSET:
+        return jsonify({'error': f'Results beyond the first {MAX_SEARCH_OFFSET} are not available'}), 400
+    
+    # Fetch one extra row to tell whether another page follows
+    results = db_manager.search(
+        terms, start_date, end_date, kinds, limit=per_page + 1, offset=(page - 1) * per_page
+    )
+    if results is None:
+        return jsonify({'error': 'Search is unavailable'}), 503
+    
+    has_more = len(results) > per_page
+    results = results[:per_page]
+    # Event times are UTC instants; note dates are calendar dates
+    event_times = iter(timezone_manager.utc_to_local([
+        value for result in results if result['type'] == 'event'
+        for value in (result['start_time'], result['end_time'])
+    ], timezone_name))
+    for result in results:
+        if result['type'] == 'event':
+            result['start_time'], result['end_time'] = next(event_times), next(event_times)
+    
+    return jsonify({
+        'query': terms,
+        'page': page,
+        'per_page': per_page,
+        'has_more': has_more,
+        'results': [{
+            'type': result['type'],
+            'id': result['id'],
+            'title': result['title'],
+            'snippet': result['snippet'],
+            'start_time': result['start_time'].isoformat(),
+            'end_time': result['end_time'].isoformat() if result['end_time'] else None,
+        } for result in results]
+    })
+
+@app.route('/calendar.ics')
+def calendar_feed():
+    """Subscribable iCalendar feed of all events, with conditional GET support."""
+    # Both move on every write, deletes included
+    version, last_modified = db_manager.get_events_version()
+    if version is None:
+        return jsonify({'error': 'Calendar unavailable'}), 503
+    
+    etag = f"events-{version}"
+    response = Response(mimetype='text/calendar')
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    # Clients may keep the feed but must revalidate every poll
+    response.headers['Cache-Control'] = 'no-cache'
+    
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response.status_code = 304
+        return response
+    
+    response.response = bulk_io.export_stream(db_manager, 'ics', 'events')
+    return response
+
+@app.route('/api/settings')
+def get_settings():
+    """Get all application settings."""
+    return jsonify(settings_manager.get_all_settings())
+
+@app.route('/api/settings', methods=['PUT'])
+def update_settings():
+    """Update one or more application settings."""
+    data = request.get_json() or {}
+    
+    unknown = [key for key in data if key not in settings_manager.defaults]
+    if unknown:
+        return jsonify({'error': f"Unknown settings: {', '.join(unknown)}"}), 400
+    
+    if 'timezone' in data and not timezone_manager.is_valid_timezone(data['timezone']):
+        return jsonify({'error': f"Unknown timezone: {data['timezone']}"}), 400
+    
+    for key, value in data.items():
+        if not settings_manager.set_setting(key, value):
+            return jsonify({'error': f'Failed to save setting {key}'}), 400
+    return jsonify({'success': True, 'settings': settings_manager.get_all_settings()})
+
+@app.route('/api/settings/reset', methods=['POST'])
+def reset_settings():
+    """Reset all settings to their defaults."""
+    if settings_manager.reset_to_defaults():
+        return jsonify({'success': True, 'settings': settings_manager.get_all_settings()})
+    return jsonify({'error': 'Failed to reset settings'}), 400
+
+def _request_countries():
+    """Get holiday countries from ?countries= (repeated or comma-separated), else the settings."""
+    countries = [
+        country_code.strip().upper()
+        for value in request.args.getlist('countries')
+        for country_code in value.split(',') if country_code.strip()
+    ]
+    return countries or settings_manager.get_holiday_countries()
+
+@app.route('/api/business-days/add')
+def add_business_days():
+    """Get the date a number of working days after (or before) a date."""
+    try:
+        start = datetime.strptime(request.args['date'], '%Y-%m-%d').date()
+        days = int(request.args['days'])
+        countries = _request_countries()
+        result = business_days.add_working_days(start, days, countries)
+    except KeyError as e:
+        return jsonify({'error': f'Missing parameter: {e.args[0]}'}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'date': start.isoformat(),
+        'days': days,
+        'countries': countries,
+        'result': result.isoformat()
+    })
+
+@app.route('/api/business-days/count')
+def count_business_days():
+    """Count working days from start (inclusive) to end (exclusive)."""
+    try:
+        start = datetime.strptime(request.args['start'], '%Y-%m-%d').date()
+        end = datetime.strptime(request.args['end'], '%Y-%m-%d').date()
+        countries = _request_countries()
+        working_days = business_days.count_working_days(start, end, countries)
+    except KeyError as e:
+        return jsonify({'error': f'Missing parameter: {e.args[0]}'}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'countries': countries,
+        'calendar_days': (end - start).days,
+        'working_days': working_days
+    })
+
 @app.route('/api/calculator', methods=['POST'])
 def calculate():
-    """Perform calculations."""
-    data = request.get_json()
+    """Evaluate an arithmetic expression."""
+    data = request.get_json(silent=True) or {}
     expression = data.get('expression', '')
+    if not isinstance(expression, str):
+        return jsonify({'error': 'Invalid expression'}), 400
+    if not expression.strip():
+        return jsonify({'result': 0})
     
     try:
-        # Simple calculator - only allow safe operations
-        allowed_chars = set('0123456789+-*/.() ')
-        if not all(c in allowed_chars for c in expression):
-            return jsonify({'error': 'Invalid characters in expression'}), 400
-        
-        # Replace * with * for multiplication
-        expression = expression.replace('×', '*')
-        
-        # Basic validation
-        if not expression.strip():
-            return jsonify({'result': 0})
-        
-        # Evaluate the expression
-        result = eval(expression)
-        
-        # Handle division by zero
-        if isinstance(result, float) and (result == float('inf') or result == float('-inf')):
-            return jsonify({'error': 'Division by zero'}), 400
-        
-        return jsonify({'result': result})
-    except ZeroDivisionError:
-        return jsonify({'error': 'Division by zero'}), 400
-    except Exception as e:
-        return jsonify({'error': 'Invalid expression'}), 400
+        return jsonify({'result': calculator.evaluate(expression)})
+    except CalculatorError as e:
+        return jsonify({'error': str(e)}), 400
 
 @app.route('/api/timezones')
 def get_timezones():
-    """Get available timezones."""
-    return jsonify(timezone_manager.get_timezones())
+    """Get every IANA timezone with its current offset and DST state.
+
+    The catalogue is precomputed and only changes at the next DST
+    transition, so clients may cache it until then.
+    """
+    catalogue = timezone_manager.get_timezone_catalogue()
+    response = Response(mimetype='application/json')
+    response.set_etag(catalogue.etag)
+    max_age = int((catalogue.expires_at - datetime.utcnow()).total_seconds())
+    response.headers['Cache-Control'] = f'public, max-age={max(max_age, 0)}'
+    response.vary.add('Accept-Encoding')
+    
+    if not is_resource_modified(request.environ, etag=catalogue.etag):
+        response.status_code = 304
+        return response
+    
+    if 'gzip' in request.accept_encodings:
+        response.set_data(catalogue.gzipped)
+        response.content_encoding = 'gzip'
+    else:
+        response.set_data(catalogue.body)
+    return response
+
+@app.cli.command('precompute-holidays')
+# Defaults are callables, resolved when the command runs rather than on import
+@click.option('--start-year', type=int, default=lambda: date.today().year - 5,
+              show_default='5 years ago')
+@click.option('--end-year', type=int, default=lambda: date.today().year + 10,
+              show_default='in 10 years')
+@click.option('--countries', default=lambda: ','.join(holiday_manager.get_supported_countries()),
+              show_default='every supported country', help='Comma-separated country codes.')
+def precompute_holidays(start_year, end_year, countries):
+    """Materialize holidays into the database for a range of years."""
+    create_app()
+    country_codes = [country.strip() for country in countries.split(',') if country.strip()]
+    written = holiday_manager.precompute(country_codes, range(start_year, end_year + 1))
+    click.echo(f"Stored holidays for {written} country/year combinations.")
+
+def _file_format(path, fmt):
+    """Get the bulk format for a file from --format or its extension."""
+    fmt = fmt or bulk_io.EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if fmt not in bulk_io.FORMATS:
+        raise click.BadParameter('cannot infer the format, pass --format', param_hint='--format')
+    return fmt
+
+@app.cli.command('import-data')
+@click.argument('kind', type=click.Choice(bulk_io.KINDS))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(bulk_io.FORMATS), help='Defaults to the file extension.')
+@click.option('--chunk-size', type=int, default=bulk_io.DEFAULT_CHUNK_SIZE, show_default=True)
+def import_data(kind, path, fmt, chunk_size):
+    """Bulk import events or notes from an NDJSON, CSV or iCalendar file."""
+    create_app()
+    fmt = _file_format(path, fmt)
+    with open(path, encoding='utf-8', newline='') as stream:
+        imported, errors = bulk_io.import_stream(db_manager, stream, fmt, kind, chunk_size)
+    for error in errors:
+        click.echo(error, err=True)
+    click.echo(f"Imported {imported} {kind}, skipped {len(errors)}.")
+
+@app.cli.command('export-data')
+@click.argument('kind', type=click.Choice(bulk_io.KINDS))
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+@click.option('--format', 'fmt', type=click.Choice(bulk_io.FORMATS), help='Defaults to the file extension.')
+def export_data(kind, path, fmt):
+    """Stream all events or notes to an NDJSON, CSV or iCalendar file."""
+    create_app()
+    fmt = _file_format(path, fmt)
+    with open(path, 'w', encoding='utf-8', newline='') as stream:
+        for chunk in bulk_io.export_stream(db_manager, fmt, kind):
+            stream.write(chunk)
+    click.echo(f"Exported {kind} to {path}.")
+
+@app.cli.command('optimize-search-index')
+@click.option('--full', is_flag=True, help='Rebuild the index from the events and notes tables.')
+def optimize_search_index(full):
+    """Merge the full-text search index, or rebuild it with --full."""
+    create_app()
+    if db_manager.optimize_search_index(full=full):
+        click.echo("Search index rebuilt." if full else "Search index merged.")
+    else:
+        click.echo("Search index is unavailable.", err=True)
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    create_app(prewarm_holidays=True).run(debug=True, host='0.0.0.0', port=5000)